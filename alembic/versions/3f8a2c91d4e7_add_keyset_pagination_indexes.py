@@ -0,0 +1,40 @@
+"""Add keyset pagination indexes to grade tables
+
+Revision ID: 3f8a2c91d4e7
+Revises: 627c17e201b3
+Create Date: 2026-10-19 09:12:41.208311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a2c91d4e7'
+down_revision: Union[str, Sequence[str], None] = '627c17e201b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_response_grades_student_id_id', 'response_grades', ['student_id', 'id'], unique=False)
+    op.create_index('ix_response_grades_assignment_id_student_id_id', 'response_grades', ['assignment_id', 'student_id', 'id'], unique=False)
+    op.create_index('ix_assignment_grades_student_id_id', 'assignment_grades', ['student_id', 'id'], unique=False)
+    op.create_index('ix_assignment_grades_module_id_student_id_id', 'assignment_grades', ['module_id', 'student_id', 'id'], unique=False)
+    op.create_index('ix_module_grades_student_id_id', 'module_grades', ['student_id', 'id'], unique=False)
+    op.create_index('ix_module_grades_subject_id_student_id_id', 'module_grades', ['subject_id', 'student_id', 'id'], unique=False)
+    op.create_index('ix_subject_grades_student_id_id', 'subject_grades', ['student_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_subject_grades_student_id_id', table_name='subject_grades')
+    op.drop_index('ix_module_grades_subject_id_student_id_id', table_name='module_grades')
+    op.drop_index('ix_module_grades_student_id_id', table_name='module_grades')
+    op.drop_index('ix_assignment_grades_module_id_student_id_id', table_name='assignment_grades')
+    op.drop_index('ix_assignment_grades_student_id_id', table_name='assignment_grades')
+    op.drop_index('ix_response_grades_assignment_id_student_id_id', table_name='response_grades')
+    op.drop_index('ix_response_grades_student_id_id', table_name='response_grades')
@@ -0,0 +1,42 @@
+"""Add covering indexes for grade recalculation lookups
+
+Revision ID: 5c2e9a7b3d14
+Revises: 8b1d6e4f2a90
+Create Date: 2026-10-19 14:03:27.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9a7b3d14'
+down_revision: Union[str, Sequence[str], None] = '8b1d6e4f2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COVERING_INDEXES = (
+    ('ix_response_grades_student_assignment_response_covering', 'response_grades', ['student_id', 'assignment_id', 'response_id']),
+    ('ix_assignment_grades_student_module_assignment_covering', 'assignment_grades', ['student_id', 'module_id', 'assignment_id']),
+    ('ix_assignment_grades_student_assignment_covering', 'assignment_grades', ['student_id', 'assignment_id']),
+    ('ix_module_grades_student_subject_module_covering', 'module_grades', ['student_id', 'subject_id', 'module_id']),
+    ('ix_module_grades_student_module_covering', 'module_grades', ['student_id', 'module_id']),
+    ('ix_subject_grades_student_subject_covering', 'subject_grades', ['student_id', 'subject_id']),
+    ('ix_overall_grades_student_covering', 'overall_grades', ['student_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in COVERING_INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_include=['grade'], postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(COVERING_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
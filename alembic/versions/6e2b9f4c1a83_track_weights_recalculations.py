@@ -0,0 +1,32 @@
+"""Track weights recalculations
+
+Revision ID: 6e2b9f4c1a83
+Revises: f2a6d8b3c917
+Create Date: 2026-10-19 23:41:09.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2b9f4c1a83'
+down_revision: Union[str, Sequence[str], None] = 'f2a6d8b3c917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'weights_versions',
+        sa.Column('recalculated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute("UPDATE weights_versions SET recalculated_at = created_at")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('weights_versions', 'recalculated_at')
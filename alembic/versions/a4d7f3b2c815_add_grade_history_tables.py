@@ -0,0 +1,81 @@
+"""Add grade history tables
+
+Revision ID: a4d7f3b2c815
+Revises: 5c2e9a7b3d14
+Create Date: 2026-10-19 14:22:41.308517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d7f3b2c815'
+down_revision: Union[str, Sequence[str], None] = '5c2e9a7b3d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GRADE_TABLES = (
+    ('response', 'response_grades', 'response_id'),
+    ('assignment', 'assignment_grades', 'assignment_id'),
+    ('module', 'module_grades', 'module_id'),
+    ('subject', 'subject_grades', 'subject_id'),
+    ('overall', 'overall_grades', None),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'grade_changes',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('level', sa.String(length=16), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=True),
+        sa.Column('grade', sa.Float(), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_grade_changes_student_id_id',
+        'grade_changes',
+        ['student_id', 'id'],
+        postgresql_include=['level', 'item_id', 'grade', 'changed_at'],
+    )
+    op.create_table(
+        'grade_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('change_id', sa.BigInteger(), nullable=False),
+        sa.Column('taken_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('grades', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_grade_snapshots_student_id_taken_at',
+        'grade_snapshots',
+        ['student_id', 'taken_at'],
+        postgresql_include=['change_id'],
+    )
+
+    for level, table, item_column in GRADE_TABLES:
+        op.execute(
+            f"""
+            INSERT INTO grade_changes (level, student_id, item_id, grade, changed_at)
+            SELECT '{level}', student_id, {item_column or 'NULL'}, grade,
+                   coalesce(updated_at, created_at, now())
+            FROM {table}
+            ORDER BY coalesce(updated_at, created_at, now())
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_grade_snapshots_student_id_taken_at', table_name='grade_snapshots')
+    op.drop_table('grade_snapshots')
+    op.drop_index('ix_grade_changes_student_id_id', table_name='grade_changes')
+    op.drop_table('grade_changes')
@@ -0,0 +1,66 @@
+"""Add incremental assignment totals
+
+Revision ID: b7e3d95c2a61
+Revises: e19b6c4a7f02
+Create Date: 2026-10-19 16:52:33.781046
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d95c2a61'
+down_revision: Union[str, Sequence[str], None] = 'e19b6c4a7f02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MINIMUM_SCORE = 2.0
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('response_grades', sa.Column('ordinal', sa.Integer(), nullable=True))
+    op.add_column('assignment_grades', sa.Column('penalized_sum', sa.Float(), nullable=True))
+    op.add_column('assignment_grades', sa.Column('response_count', sa.Integer(), nullable=True))
+
+    op.execute(
+        """
+        UPDATE response_grades
+        SET ordinal = numbered.ordinal
+        FROM (
+            SELECT id, student_id,
+                   row_number() OVER (
+                       PARTITION BY student_id, assignment_id ORDER BY response_id
+                   ) - 1 AS ordinal
+            FROM response_grades
+        ) AS numbered
+        WHERE response_grades.id = numbered.id
+          AND response_grades.student_id = numbered.student_id
+        """
+    )
+    op.execute(
+        f"""
+        UPDATE assignment_grades
+        SET penalized_sum = totals.penalized_sum,
+            response_count = totals.response_count
+        FROM (
+            SELECT student_id, assignment_id,
+                   sum(greatest(grade - ln(ordinal + 2), {MINIMUM_SCORE})) AS penalized_sum,
+                   count(*) AS response_count
+            FROM response_grades
+            GROUP BY student_id, assignment_id
+        ) AS totals
+        WHERE assignment_grades.student_id = totals.student_id
+          AND assignment_grades.assignment_id = totals.assignment_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('assignment_grades', 'response_count')
+    op.drop_column('assignment_grades', 'penalized_sum')
+    op.drop_column('response_grades', 'ordinal')
@@ -0,0 +1,93 @@
+"""Add grade aggregates
+
+Revision ID: c5a8e1f3d692
+Revises: b7e3d95c2a61
+Create Date: 2026-10-19 18:07:14.529830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a8e1f3d692'
+down_revision: Union[str, Sequence[str], None] = 'b7e3d95c2a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GRADE_TABLES = (
+    ('response', 'response_grades', 'response_id'),
+    ('assignment', 'assignment_grades', 'assignment_id'),
+    ('module', 'module_grades', 'module_id'),
+    ('subject', 'subject_grades', 'subject_id'),
+    ('overall', 'overall_grades', None),
+)
+SHARDS = 16
+HISTOGRAM_BUCKETS = 20
+BUCKET_WIDTH = 0.5
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'grade_aggregates',
+        sa.Column('level', sa.String(length=16), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('shard', sa.Integer(), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('total_squares', sa.Float(), nullable=False),
+        sa.Column('histogram', postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('level', 'item_id', 'shard'),
+    )
+
+    for level, table, item_column in GRADE_TABLES:
+        columns = [item_column, 'grade', 'student_id'] if item_column else ['grade', 'student_id']
+        name = f"ix_{table}_{item_column[:-3]}_grade_student" if item_column else f"ix_{table}_grade_student"
+        op.create_index(name, table, columns, unique=False)
+        op.execute(
+            f"""
+            INSERT INTO grade_aggregates
+                (level, item_id, shard, count, total, total_squares, histogram, updated_at)
+            SELECT '{level}', item_id, shard, count, total, total_squares,
+                   ARRAY(
+                       SELECT coalesce((buckets ->> bucket::text)::int, 0)
+                       FROM generate_series(0, {HISTOGRAM_BUCKETS - 1}) AS bucket
+                       ORDER BY bucket
+                   ),
+                   now()
+            FROM (
+                SELECT item_id, shard,
+                       sum(count) AS count,
+                       sum(total) AS total,
+                       sum(total_squares) AS total_squares,
+                       jsonb_object_agg(bucket, count) AS buckets
+                FROM (
+                    SELECT {item_column or 0} AS item_id,
+                           student_id % {SHARDS} AS shard,
+                           least(
+                               greatest(floor(grade / {BUCKET_WIDTH})::int, 0),
+                               {HISTOGRAM_BUCKETS - 1}
+                           ) AS bucket,
+                           count(*) AS count,
+                           sum(grade) AS total,
+                           sum(grade * grade) AS total_squares
+                    FROM {table}
+                    GROUP BY 1, 2, 3
+                ) AS bucketed
+                GROUP BY item_id, shard
+            ) AS cells
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for level, table, item_column in GRADE_TABLES:
+        name = f"ix_{table}_{item_column[:-3]}_grade_student" if item_column else f"ix_{table}_grade_student"
+        op.drop_index(name, table_name=table)
+    op.drop_table('grade_aggregates')
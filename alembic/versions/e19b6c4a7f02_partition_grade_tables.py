@@ -0,0 +1,107 @@
+"""Partition grade tables by student and grade history by month
+
+Revision ID: e19b6c4a7f02
+Revises: a4d7f3b2c815
+Create Date: 2026-10-19 15:41:09.274113
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e19b6c4a7f02'
+down_revision: Union[str, Sequence[str], None] = 'a4d7f3b2c815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HASH_PARTITIONS = 8
+MONTHS_AHEAD = 3
+GRADE_TABLES = (
+    'response_grades',
+    'assignment_grades',
+    'module_grades',
+    'subject_grades',
+    'overall_grades',
+)
+
+
+def _month_start(day: date, offset: int = 0) -> date:
+    month = day.year * 12 + day.month - 1 + offset
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def _rebuild_table(table: str, partition_by: str, primary_key: Sequence[str], create_partitions) -> None:
+    connection = op.get_bind()
+    indexes = connection.execute(
+        sa.text(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = :table AND indexname NOT IN "
+            "(SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass))"
+        ),
+        {'table': table},
+    ).scalars().all()
+    unique_constraints = connection.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype = 'u'"
+        ),
+        {'table': table},
+    ).all()
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {table}_rebuild')
+    op.execute(f'CREATE TABLE {table} (LIKE {table}_rebuild INCLUDING DEFAULTS) {partition_by}')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    create_partitions(connection, table)
+    op.execute(f'INSERT INTO {table} SELECT * FROM {table}_rebuild')
+    op.execute(f'DROP TABLE {table}_rebuild')
+
+    op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY ({", ".join(primary_key)})')
+    for name, definition in unique_constraints:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+    for definition in indexes:
+        op.execute(definition)
+
+
+def _create_hash_partitions(connection, table: str) -> None:
+    for remainder in range(HASH_PARTITIONS):
+        op.execute(
+            f'CREATE TABLE {table}_p{remainder} PARTITION OF {table} '
+            f'FOR VALUES WITH (MODULUS {HASH_PARTITIONS}, REMAINDER {remainder})'
+        )
+
+
+def _create_monthly_partitions(connection, table: str) -> None:
+    first_change = connection.execute(
+        sa.text(f'SELECT min(changed_at) FROM {table}_rebuild')
+    ).scalar_one_or_none()
+    month = _month_start(first_change.date() if first_change else date.today())
+    last_month = _month_start(date.today(), MONTHS_AHEAD)
+    while month <= last_month:
+        next_month = _month_start(month, 1)
+        op.execute(
+            f'CREATE TABLE {table}_y{month.year}m{month.month:02d} PARTITION OF {table} '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+
+def _create_no_partitions(connection, table: str) -> None:
+    pass
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in GRADE_TABLES:
+        _rebuild_table(table, 'PARTITION BY HASH (student_id)', ['id', 'student_id'], _create_hash_partitions)
+    _rebuild_table('grade_changes', 'PARTITION BY RANGE (changed_at)', ['id', 'changed_at'], _create_monthly_partitions)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild_table('grade_changes', '', ['id'], _create_no_partitions)
+    for table in GRADE_TABLES:
+        _rebuild_table(table, '', ['id'], _create_no_partitions)
@@ -0,0 +1,40 @@
+"""Add assignment sync states
+
+Revision ID: e4b9c7d21a58
+Revises: c5a8e1f3d692
+Create Date: 2026-10-19 19:42:51.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9c7d21a58'
+down_revision: Union[str, Sequence[str], None] = 'c5a8e1f3d692'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'assignment_sync_states',
+        sa.Column('assignment_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('check_count', sa.Integer(), nullable=False),
+        sa.Column('redo_count', sa.Integer(), nullable=False),
+        sa.Column('done_count', sa.Integer(), nullable=False),
+        sa.Column('last_response_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('synced_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('assignment_id'),
+    )
+    op.create_index(op.f('ix_assignment_sync_states_student_id'), 'assignment_sync_states', ['student_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_assignment_sync_states_student_id'), table_name='assignment_sync_states')
+    op.drop_table('assignment_sync_states')
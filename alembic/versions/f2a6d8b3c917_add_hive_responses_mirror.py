@@ -0,0 +1,48 @@
+"""Add hive responses mirror
+
+Revision ID: f2a6d8b3c917
+Revises: e4b9c7d21a58
+Create Date: 2026-10-19 21:16:37.604582
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6d8b3c917'
+down_revision: Union[str, Sequence[str], None] = 'e4b9c7d21a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING_REDO = sa.text("response_type = 'Redo' AND graded_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'hive_responses',
+        sa.Column('response_id', sa.Integer(), nullable=False),
+        sa.Column('assignment_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('module_id', sa.Integer(), nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=False),
+        sa.Column('response_type', sa.String(length=32), nullable=False),
+        sa.Column('submitted_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('graded_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('mirrored_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('response_id'),
+    )
+    op.create_index('ix_hive_responses_pending_submitted', 'hive_responses', ['submitted_at', 'response_id'], unique=False, postgresql_where=PENDING_REDO)
+    op.create_index('ix_hive_responses_pending_module_submitted', 'hive_responses', ['module_id', 'submitted_at', 'response_id'], unique=False, postgresql_where=PENDING_REDO)
+    op.create_index('ix_hive_responses_pending_subject_submitted', 'hive_responses', ['subject_id', 'submitted_at', 'response_id'], unique=False, postgresql_where=PENDING_REDO)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hive_responses_pending_subject_submitted', table_name='hive_responses', postgresql_where=PENDING_REDO)
+    op.drop_index('ix_hive_responses_pending_module_submitted', table_name='hive_responses', postgresql_where=PENDING_REDO)
+    op.drop_index('ix_hive_responses_pending_submitted', table_name='hive_responses', postgresql_where=PENDING_REDO)
+    op.drop_table('hive_responses')
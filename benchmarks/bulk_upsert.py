@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import delete
+
+from evaluer.common.database.models import Base, ResponseGrade
+from evaluer.common.database.partitions import ensure_partitions
+from evaluer.common.database.session import AsyncSessionLocal, engine
+from evaluer.common.repositories.grading import ResponseGradeRepository
+from evaluer.common.settings import get_settings
+
+
+def generate_rows(row_count: int):
+    return [
+        {
+            "student_id": index % 5000,
+            "response_id": index,
+            "assignment_id": index % 700,
+            "grade": round(random.uniform(1, 10), 2),
+        }
+        for index in range(row_count)
+    ]
+
+
+async def measure(label: str, row_count: int, upsert) -> None:
+    started_at = time.perf_counter()
+    await upsert()
+    elapsed = time.perf_counter() - started_at
+    print(
+        f"{label:<28}{row_count:>10} rows {elapsed:>9.2f}s "
+        f"{row_count / elapsed:>12.0f} rows/s"
+    )
+
+
+async def run(sizes, single_row_limit: int) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await ensure_partitions(
+            connection,
+            hash_partitions=get_settings().database.grade_hash_partitions,
+            months_ahead=get_settings().database.history_months_ahead,
+        )
+
+    for row_count in sizes:
+        rows = generate_rows(row_count)
+        async with AsyncSessionLocal() as db:
+            repository = ResponseGradeRepository(db)
+            await db.execute(delete(ResponseGrade))
+            await db.commit()
+
+            if row_count <= single_row_limit:
+
+                async def single_row_upserts():
+                    for row in rows:
+                        await repository.upsert(**row)
+
+                await measure("upsert (one per commit)", row_count, single_row_upserts)
+                await db.execute(delete(ResponseGrade))
+                await db.commit()
+
+            repository.copy_threshold = row_count + 1
+            await measure(
+                "bulk_upsert (INSERT)", row_count, lambda: repository.bulk_upsert(rows)
+            )
+            await measure(
+                "bulk_upsert (INSERT, update)",
+                row_count,
+                lambda: repository.bulk_upsert(rows),
+            )
+            await db.execute(delete(ResponseGrade))
+            await db.commit()
+
+            repository.copy_threshold = 0
+            await measure(
+                "bulk_upsert (COPY)", row_count, lambda: repository.bulk_upsert(rows)
+            )
+            await measure(
+                "bulk_upsert (COPY, update)",
+                row_count,
+                lambda: repository.bulk_upsert(rows),
+            )
+            await db.execute(delete(ResponseGrade))
+            await db.commit()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure response grade upsert throughput."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--single-row-limit", type=int, default=1_000)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.sizes, arguments.single_row_limit))
@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import AsyncIterator, Dict, List, Tuple
+
+from sqlalchemy import select, text
+
+from evaluer.common.database.models import Base, OverallGrade, ResponseGrade
+from evaluer.common.database.partitions import ensure_partitions
+from evaluer.common.database.session import AsyncSessionLocal, engine
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.grades import GradeService
+from evaluer.common.services.weights import (
+    ExerciseWeightConfig,
+    ModuleWeightConfig,
+    SubjectWeightConfig,
+    WeightProvider,
+    WeightsConfiguration,
+)
+from evaluer.common.settings import get_settings
+
+GRADE_TABLES = (
+    "response_grades",
+    "assignment_grades",
+    "module_grades",
+    "subject_grades",
+    "overall_grades",
+)
+
+
+class UnlockedGradeService(GradeService):
+    @asynccontextmanager
+    async def _student_transaction(self, student_id: int) -> AsyncIterator[None]:
+        yield
+        await self._commit()
+        self._flush_invalidations()
+
+
+def build_weight_provider(
+    subjects: int, modules: int, assignments: int
+) -> WeightProvider:
+    return WeightProvider(
+        WeightsConfiguration(
+            subjects={
+                subject_id: SubjectWeightConfig(
+                    name=f"Subject {subject_id}",
+                    weight=subject_id,
+                    modules={
+                        module_id: ModuleWeightConfig(
+                            name=f"Module {module_id}",
+                            weight=module_id % 3 + 1,
+                            exercises={
+                                assignment_id: ExerciseWeightConfig(
+                                    name=f"Exercise {assignment_id}",
+                                    weight=assignment_id % 2 + 1,
+                                )
+                                for assignment_id in range(
+                                    module_id * assignments,
+                                    (module_id + 1) * assignments,
+                                )
+                            },
+                        )
+                        for module_id in range(
+                            subject_id * modules, (subject_id + 1) * modules
+                        )
+                    },
+                )
+                for subject_id in range(1, subjects + 1)
+            }
+        )
+    )
+
+
+async def reset() -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await ensure_partitions(
+            connection,
+            hash_partitions=get_settings().database.grade_hash_partitions,
+            months_ahead=get_settings().database.history_months_ahead,
+        )
+        await connection.execute(text(f"TRUNCATE {', '.join(GRADE_TABLES)}"))
+
+
+async def writer(
+    service_class,
+    provider: WeightProvider,
+    students: int,
+    updates: int,
+    seed: int,
+) -> None:
+    generator = random.Random(seed)
+    assignment_ids = sorted(
+        assignment_id
+        for module_id in provider.get_module_ids()
+        for assignment_id in provider.get_exercise_weights_for_module(module_id)
+    )
+    async with AsyncSessionLocal() as db:
+        service = service_class.create(db, provider, GradingCalculator())
+        for _ in range(updates):
+            assignment_id = generator.choice(assignment_ids)
+            module_id = provider.get_module_for_exercise(assignment_id)
+            await service.update_response_grade(
+                student_id=generator.randrange(students),
+                response_id=assignment_id * 10 + generator.randrange(3),
+                assignment_id=assignment_id,
+                module_id=module_id,
+                subject_id=provider.get_subject_for_module(module_id),
+                new_grade=round(generator.uniform(1, 10), 2),
+            )
+
+
+def expected_overall_grades(
+    provider: WeightProvider, response_rows: List[Tuple[int, int, int, float]]
+) -> Dict[int, float]:
+    calculator = GradingCalculator()
+    responses = defaultdict(list)
+    for student_id, assignment_id, response_id, grade in sorted(response_rows):
+        responses[student_id, assignment_id].append((response_id, grade))
+
+    assignment_grades = defaultdict(dict)
+    for (student_id, assignment_id), grades in responses.items():
+        module_id = provider.get_module_for_exercise(assignment_id)
+        assignment_grades[student_id, module_id][assignment_id] = (
+            calculator.calculate_assignment_grade(
+                [SimpleNamespace(grade=grade) for _, grade in grades]
+            )
+        )
+
+    module_grades = defaultdict(dict)
+    for (student_id, module_id), grades in assignment_grades.items():
+        subject_id = provider.get_subject_for_module(module_id)
+        module_grades[student_id, subject_id][module_id] = (
+            calculator.calculate_weighted_average(
+                grades, provider.get_exercise_weights_for_module(module_id)
+            )
+        )
+
+    subject_grades = defaultdict(dict)
+    for (student_id, subject_id), grades in module_grades.items():
+        subject_grades[student_id][subject_id] = calculator.calculate_weighted_average(
+            grades, provider.get_module_weights_for_subject(subject_id)
+        )
+
+    return {
+        student_id: calculator.calculate_weighted_average(
+            grades, provider.get_subject_weights()
+        )
+        for student_id, grades in subject_grades.items()
+    }
+
+
+async def count_inconsistent_students(provider: WeightProvider) -> int:
+    async with AsyncSessionLocal() as db:
+        response_rows = (
+            await db.execute(
+                select(
+                    ResponseGrade.student_id,
+                    ResponseGrade.assignment_id,
+                    ResponseGrade.response_id,
+                    ResponseGrade.grade,
+                )
+            )
+        ).all()
+        overall_rows = await db.execute(
+            select(OverallGrade.student_id, OverallGrade.grade)
+        )
+        stored = dict(overall_rows.all())
+    expected = expected_overall_grades(provider, response_rows)
+    return sum(
+        1
+        for student_id, grade in expected.items()
+        if abs(stored.get(student_id, -1.0) - grade) > 1e-9
+    )
+
+
+async def measure(
+    label: str,
+    service_class,
+    provider: WeightProvider,
+    writers: int,
+    students: int,
+    updates: int,
+) -> None:
+    await reset()
+    started_at = time.perf_counter()
+    await asyncio.gather(
+        *(
+            writer(service_class, provider, students, updates, seed)
+            for seed in range(writers)
+        )
+    )
+    elapsed = time.perf_counter() - started_at
+    inconsistent = await count_inconsistent_students(provider)
+    total = writers * updates
+    print(
+        f"{label:<10}{writers:>4} writers {students:>6} students "
+        f"{total / elapsed:>9.0f} updates/s {inconsistent:>6} inconsistent students"
+    )
+
+
+async def run(arguments: argparse.Namespace) -> None:
+    provider = build_weight_provider(
+        arguments.subjects, arguments.modules, arguments.assignments
+    )
+    for students in arguments.students:
+        for label, service_class in (
+            ("locked", GradeService),
+            ("unlocked", UnlockedGradeService),
+        ):
+            await measure(
+                label,
+                service_class,
+                provider,
+                arguments.writers,
+                students,
+                arguments.updates,
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run concurrent grade cascades with and without per-student locks and "
+            "report throughput and students whose stored overall grade disagrees "
+            "with their response grades. Truncates all grade tables."
+        )
+    )
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--students", type=int, nargs="+", default=[1, 16, 1000])
+    parser.add_argument("--updates", type=int, default=100)
+    parser.add_argument("--subjects", type=int, default=2)
+    parser.add_argument("--modules", type=int, default=2)
+    parser.add_argument("--assignments", type=int, default=3)
+    asyncio.run(run(parser.parse_args()))
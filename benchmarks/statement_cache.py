@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from evaluer.common.database.models import AssignmentGrade, Base
+from evaluer.common.database.partitions import ensure_partitions
+from evaluer.common.database.session import AsyncSessionLocal, engine
+from evaluer.common.repositories.grading import AssignmentGradeRepository
+from evaluer.common.settings import get_settings
+
+
+async def dynamic_get_grade(db, **filters):
+    stmt = select(AssignmentGrade.grade)
+    for column, value in filters.items():
+        stmt = stmt.where(getattr(AssignmentGrade, column) == value)
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def dynamic_upsert(db, grade, **values):
+    stmt = (
+        insert(AssignmentGrade)
+        .values(grade=grade, updated_at=func.now(), **values)
+        .on_conflict_do_update(
+            index_elements=["assignment_id", "student_id"],
+            set_={"grade": grade, "updated_at": func.now()},
+        )
+    )
+    await db.execute(stmt)
+
+
+async def cached_upsert(repository, grade, **values):
+    stmt = repository._cached_statement(
+        "upsert", (), repository._upsert_statement
+    )
+    await repository.db.execute(stmt, {**values, "grade": grade})
+
+
+async def measure(label: str, calls: int, call) -> None:
+    for index in range(min(calls, 100)):
+        await call(index)
+    started_at = time.perf_counter()
+    for index in range(calls):
+        await call(index)
+    elapsed = time.perf_counter() - started_at
+    print(f"{label:<34}{elapsed / calls * 1_000_000:>10.1f} us/call")
+
+
+async def run(calls: int, students: int) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await ensure_partitions(
+            connection,
+            hash_partitions=get_settings().database.grade_hash_partitions,
+            months_ahead=get_settings().database.history_months_ahead,
+        )
+
+    async with AsyncSessionLocal() as db:
+        repository = AssignmentGradeRepository(db)
+        await db.execute(delete(AssignmentGrade))
+        await repository.bulk_upsert(
+            [
+                {
+                    "student_id": student_id,
+                    "assignment_id": assignment_id,
+                    "module_id": 1,
+                    "grade": 7.5,
+                }
+                for student_id in range(students)
+                for assignment_id in range(10)
+            ]
+        )
+
+        def lookup(index):
+            return {"student_id": index % students, "assignment_id": index % 10}
+
+        await measure(
+            "get_grade (dynamic select)",
+            calls,
+            lambda index: dynamic_get_grade(db, **lookup(index)),
+        )
+        await measure(
+            "get_grade (cached statement)",
+            calls,
+            lambda index: repository.get_grade(**lookup(index)),
+        )
+        await measure(
+            "upsert (dynamic insert)",
+            calls,
+            lambda index: dynamic_upsert(db, 8.0, module_id=1, **lookup(index)),
+        )
+        await measure(
+            "upsert (cached statement)",
+            calls,
+            lambda index: cached_upsert(repository, 8.0, module_id=1, **lookup(index)),
+        )
+        await db.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure per-call overhead of repository statements."
+    )
+    parser.add_argument("--calls", type=int, default=5_000)
+    parser.add_argument("--students", type=int, default=1_000)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.calls, arguments.students))
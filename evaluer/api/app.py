@@ -1,22 +1,83 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from evaluer.common.database.models import Base
-from evaluer.common.database.session import engine
+from evaluer.common.database.notifications import get_notification_listener
+from evaluer.common.database.locks import lock_schema
+from evaluer.common.database.partitions import PartitionMaintainer
+from evaluer.common.database.session import dispose_engines, engine
+from evaluer.common.repositories.grading import GRADE_CHANGES_CHANNEL
+from evaluer.common.repositories.weights import WEIGHTS_CHANGED_CHANNEL
+from evaluer.common.settings import get_settings
+from evaluer.api.dependencies.grades import (
+    get_grade_change_broadcaster,
+    get_grade_change_subscriber,
+)
+from evaluer.api.dependencies.hooks import get_hive_event_queue
+from evaluer.api.dependencies.weights import get_weights_store
 from evaluer.api.routers import create_app_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    settings = get_settings()
     async with engine.begin() as conn:
+        await lock_schema(conn)
         await conn.run_sync(Base.metadata.create_all)
 
+    partition_maintainer = PartitionMaintainer(
+        engine,
+        hash_partitions=settings.database.grade_hash_partitions,
+        months_ahead=settings.database.history_months_ahead,
+        check_interval=settings.database.partition_check_seconds,
+    )
+    await partition_maintainer.ensure()
+    await partition_maintainer.start()
+
+    listener = get_notification_listener()
+
+    pending_recalculation = None
+    if settings.grading.weights_source == "database":
+        weights_store = get_weights_store()
+        await weights_store.load_latest()
+        pending_recalculation = asyncio.create_task(
+            weights_store.resume_recalculations()
+        )
+        listener.subscribe(WEIGHTS_CHANGED_CHANNEL, weights_store.handle_weights_changed)
+        listener.on_reconnect(weights_store.handle_reconnect)
+
+    grade_change_subscriber = get_grade_change_subscriber()
+    if grade_change_subscriber is not None:
+        listener.subscribe(
+            GRADE_CHANGES_CHANNEL, grade_change_subscriber.handle_grade_changes
+        )
+        listener.on_reconnect(grade_change_subscriber.handle_reconnect)
+
+    grade_change_broadcaster = get_grade_change_broadcaster()
+    listener.subscribe(
+        GRADE_CHANGES_CHANNEL, grade_change_broadcaster.handle_grade_changes
+    )
+    listener.on_reconnect(grade_change_broadcaster.handle_reconnect)
+
+    await listener.start()
+
+    hive_event_queue = get_hive_event_queue()
+    await hive_event_queue.start()
+
     yield
 
-    await engine.dispose()
+    await hive_event_queue.stop()
+    if pending_recalculation is not None:
+        pending_recalculation.cancel()
+        with suppress(asyncio.CancelledError):
+            await pending_recalculation
+    await partition_maintainer.stop()
+    await listener.stop()
+    await dispose_engines()
 
 
 app = FastAPI(title="Evaluer API", lifespan=lifespan)
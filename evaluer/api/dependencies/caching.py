@@ -0,0 +1,157 @@
+from datetime import datetime
+from hashlib import sha256
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Depends, Header, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from evaluer.api.dependencies.grades import get_grade_service
+from evaluer.common.models.grades import GradeLevel
+from evaluer.common.services.grades import GradeService
+
+GRADE_CACHE_CONTROL = "private, no-cache"
+COURSE_CACHE_CONTROL = "private, max-age=30"
+
+
+def make_etag(*parts: Any) -> str:
+    digest = sha256("\x1f".join(str(part) for part in parts).encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {
+        candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")
+    }
+    return "*" in candidates or etag in candidates
+
+
+def raise_if_not_modified(
+    if_none_match: Optional[str], etag: str, cache_control: str
+) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return headers
+
+
+def cached_json_response(
+    request: Request, content: Any, cache_control: str = COURSE_CACHE_CONTROL
+) -> Response:
+    body = JSONResponse(jsonable_encoder(content)).body
+    etag = make_etag(sha256(body).hexdigest())
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def versioned_json_response(
+    request: Request,
+    etag: str,
+    build_content: Callable[[], Any],
+    cache_control: str = COURSE_CACHE_CONTROL,
+) -> Response:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return JSONResponse(jsonable_encoder(build_content()), headers=headers)
+
+
+async def _check_grade_etag(
+    response: Response,
+    grade_service: GradeService,
+    if_none_match: Optional[str],
+    level: GradeLevel,
+    student_id: int,
+    item_id: Optional[int] = None,
+    as_of: Optional[datetime] = None,
+) -> None:
+    version = await grade_service.get_grade_version(level, student_id, item_id)
+    etag = make_etag(
+        level.value,
+        student_id,
+        item_id,
+        version.isoformat() if version else None,
+        as_of.isoformat() if as_of else None,
+    )
+    response.headers.update(
+        raise_if_not_modified(if_none_match, etag, GRADE_CACHE_CONTROL)
+    )
+
+
+async def check_response_grade_etag(
+    response: Response,
+    student_id: int,
+    response_id: int,
+    as_of: Optional[datetime] = None,
+    grade_service: GradeService = Depends(get_grade_service),
+    if_none_match: Optional[str] = Header(None),
+) -> None:
+    await _check_grade_etag(
+        response,
+        grade_service,
+        if_none_match,
+        GradeLevel.RESPONSE,
+        student_id,
+        response_id,
+        as_of,
+    )
+
+
+async def check_assignment_grade_etag(
+    response: Response,
+    student_id: int,
+    assignment_id: int,
+    as_of: Optional[datetime] = None,
+    grade_service: GradeService = Depends(get_grade_service),
+    if_none_match: Optional[str] = Header(None),
+) -> None:
+    await _check_grade_etag(
+        response,
+        grade_service,
+        if_none_match,
+        GradeLevel.ASSIGNMENT,
+        student_id,
+        assignment_id,
+        as_of,
+    )
+
+
+async def check_module_grade_etag(
+    response: Response,
+    student_id: int,
+    module_id: int,
+    as_of: Optional[datetime] = None,
+    grade_service: GradeService = Depends(get_grade_service),
+    if_none_match: Optional[str] = Header(None),
+) -> None:
+    await _check_grade_etag(
+        response,
+        grade_service,
+        if_none_match,
+        GradeLevel.MODULE,
+        student_id,
+        module_id,
+        as_of,
+    )
+
+
+async def check_overall_grade_etag(
+    response: Response,
+    student_id: int,
+    as_of: Optional[datetime] = None,
+    grade_service: GradeService = Depends(get_grade_service),
+    if_none_match: Optional[str] = Header(None),
+) -> None:
+    await _check_grade_etag(
+        response,
+        grade_service,
+        if_none_match,
+        GradeLevel.OVERALL,
+        student_id,
+        as_of=as_of,
+    )
@@ -1,10 +1,19 @@
-from typing import Annotated
+from functools import lru_cache
+from typing import Annotated, Optional
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from evaluer.api.dependencies.weights import get_weight_provider
-from evaluer.common.database.session import get_db_session
+from evaluer.api.dependencies.hive import (
+    get_course_hierarchy_resolver,
+    get_course_tree_cache,
+    get_hive_client,
+)
+from evaluer.api.dependencies.weights import get_weight_provider, get_weights_registry
+from evaluer.common.clients.hive import HiveClient
+from evaluer.common.database.routing import RecentWrites, get_recent_writes
+from evaluer.common.database.session import get_db_session, get_replica_db_session
+from evaluer.common.repositories.aggregates import GradeAggregateRepository
 from evaluer.common.repositories.grading import (
     AssignmentGradeRepository,
     ModuleGradeRepository,
@@ -12,42 +21,127 @@ from evaluer.common.repositories.grading import (
     ResponseGradeRepository,
     SubjectGradeRepository,
 )
+from evaluer.common.repositories.history import GradeHistoryRepository
+from evaluer.common.repositories.responses import HiveResponseRepository
+from evaluer.common.repositories.sync import AssignmentSyncStateRepository
 from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.course import CourseHierarchyResolver, CourseTreeCache
+from evaluer.common.services.export import CourseNameIndex, GradebookExporter
+from evaluer.common.services.grade_cache import GradeCache, GradeChangeSubscriber
+from evaluer.common.services.grade_stream import GradeChangeBroadcaster
 from evaluer.common.services.grades import GradeService
+from evaluer.common.services.history import GradeHistoryService
+from evaluer.common.services.sync import AutoGradeSync
 from evaluer.common.services.weights import WeightProvider
+from evaluer.common.settings import get_settings
+
+
+@lru_cache
+def get_grade_cache() -> Optional[GradeCache]:
+    grading = get_settings().grading
+    if grading.grade_cache_size <= 0:
+        return None
+    return GradeCache(
+        max_entries=grading.grade_cache_size,
+        ttl_seconds=grading.grade_cache_ttl_seconds,
+    )
+
+
+@lru_cache
+def get_grade_change_subscriber() -> Optional[GradeChangeSubscriber]:
+    grade_cache = get_grade_cache()
+    if grade_cache is None:
+        return None
+    return GradeChangeSubscriber(grade_cache, get_recent_writes())
+
+
+@lru_cache
+def get_grade_change_broadcaster() -> GradeChangeBroadcaster:
+    settings = get_settings()
+    return GradeChangeBroadcaster(
+        weights_registry=get_weights_registry(),
+        buffer_size=settings.grading.grade_stream_buffer_size,
+        queue_size=settings.grading.grade_stream_queue_size,
+        course_hierarchy=get_course_hierarchy_resolver(),
+        hive_client_factory=lambda: get_hive_client(settings),
+    )
+
 
 def get_grading_calculator() -> GradingCalculator:
     return GradingCalculator(base_score=10.0, minimum_score=2.0)
 
 
+def get_grade_aggregate_repo(
+    db: Annotated[AsyncSession, Depends(get_db_session)],
+    read_db: Annotated[Optional[AsyncSession], Depends(get_replica_db_session)],
+) -> GradeAggregateRepository:
+    return GradeAggregateRepository(
+        db, read_db, shards=get_settings().grading.aggregate_shards
+    )
+
+
 def get_response_grade_repo(
     db: Annotated[AsyncSession, Depends(get_db_session)],
+    read_db: Annotated[Optional[AsyncSession], Depends(get_replica_db_session)],
+    recent_writes: Annotated[RecentWrites, Depends(get_recent_writes)],
+    aggregates: Annotated[
+        GradeAggregateRepository, Depends(get_grade_aggregate_repo)
+    ],
 ) -> ResponseGradeRepository:
-    return ResponseGradeRepository(db)
+    return ResponseGradeRepository(db, read_db, recent_writes, aggregates)
 
 
 def get_assignment_grade_repo(
     db: Annotated[AsyncSession, Depends(get_db_session)],
+    read_db: Annotated[Optional[AsyncSession], Depends(get_replica_db_session)],
+    recent_writes: Annotated[RecentWrites, Depends(get_recent_writes)],
+    aggregates: Annotated[
+        GradeAggregateRepository, Depends(get_grade_aggregate_repo)
+    ],
 ) -> AssignmentGradeRepository:
-    return AssignmentGradeRepository(db)
+    return AssignmentGradeRepository(db, read_db, recent_writes, aggregates)
 
 
 def get_module_grade_repo(
     db: Annotated[AsyncSession, Depends(get_db_session)],
+    read_db: Annotated[Optional[AsyncSession], Depends(get_replica_db_session)],
+    recent_writes: Annotated[RecentWrites, Depends(get_recent_writes)],
+    aggregates: Annotated[
+        GradeAggregateRepository, Depends(get_grade_aggregate_repo)
+    ],
 ) -> ModuleGradeRepository:
-    return ModuleGradeRepository(db)
+    return ModuleGradeRepository(db, read_db, recent_writes, aggregates)
 
 
 def get_subject_grade_repo(
     db: Annotated[AsyncSession, Depends(get_db_session)],
+    read_db: Annotated[Optional[AsyncSession], Depends(get_replica_db_session)],
+    recent_writes: Annotated[RecentWrites, Depends(get_recent_writes)],
+    aggregates: Annotated[
+        GradeAggregateRepository, Depends(get_grade_aggregate_repo)
+    ],
 ) -> SubjectGradeRepository:
-    return SubjectGradeRepository(db)
+    return SubjectGradeRepository(db, read_db, recent_writes, aggregates)
 
 
 def get_overall_grade_repo(
     db: Annotated[AsyncSession, Depends(get_db_session)],
+    read_db: Annotated[Optional[AsyncSession], Depends(get_replica_db_session)],
+    recent_writes: Annotated[RecentWrites, Depends(get_recent_writes)],
+    aggregates: Annotated[
+        GradeAggregateRepository, Depends(get_grade_aggregate_repo)
+    ],
 ) -> OverallGradeRepository:
-    return OverallGradeRepository(db)
+    return OverallGradeRepository(db, read_db, recent_writes, aggregates)
+
+
+def get_grade_history(
+    db: Annotated[AsyncSession, Depends(get_db_session)],
+) -> GradeHistoryService:
+    return GradeHistoryService(
+        GradeHistoryRepository(db),
+        snapshot_interval=get_settings().grading.history_snapshot_interval,
+    )
 
 
 def get_grade_service(
@@ -67,6 +161,14 @@ def get_grade_service(
     overall_grade_repo: Annotated[
         OverallGradeRepository, Depends(get_overall_grade_repo)
     ],
+    grade_cache: Annotated[Optional[GradeCache], Depends(get_grade_cache)],
+    grade_history: Annotated[GradeHistoryService, Depends(get_grade_history)],
+    grade_aggregates: Annotated[
+        GradeAggregateRepository, Depends(get_grade_aggregate_repo)
+    ],
+    course_hierarchy: Annotated[
+        CourseHierarchyResolver, Depends(get_course_hierarchy_resolver)
+    ],
 ):
     return GradeService(
         db=db,
@@ -77,4 +179,62 @@ def get_grade_service(
         module_grade_repo=module_grade_repo,
         subject_grade_repo=subject_grade_repo,
         overall_grade_repo=overall_grade_repo,
+        grade_cache=grade_cache,
+        grade_history=grade_history,
+        grade_aggregates=grade_aggregates,
+        course_hierarchy=course_hierarchy,
+    )
+
+
+def get_hive_response_repo(
+    db: Annotated[AsyncSession, Depends(get_db_session)],
+    read_db: Annotated[Optional[AsyncSession], Depends(get_replica_db_session)],
+) -> HiveResponseRepository:
+    return HiveResponseRepository(db, read_db)
+
+
+def get_auto_grade_sync(
+    db: Annotated[AsyncSession, Depends(get_db_session)],
+    grade_service: Annotated[GradeService, Depends(get_grade_service)],
+    hive_responses: Annotated[
+        HiveResponseRepository, Depends(get_hive_response_repo)
+    ],
+) -> AutoGradeSync:
+    return AutoGradeSync(
+        grade_service, AssignmentSyncStateRepository(db), hive_responses
+    )
+
+
+def get_gradebook_exporter(
+    response_grade_repo: Annotated[
+        ResponseGradeRepository, Depends(get_response_grade_repo)
+    ],
+    assignment_grade_repo: Annotated[
+        AssignmentGradeRepository, Depends(get_assignment_grade_repo)
+    ],
+    module_grade_repo: Annotated[ModuleGradeRepository, Depends(get_module_grade_repo)],
+    subject_grade_repo: Annotated[
+        SubjectGradeRepository, Depends(get_subject_grade_repo)
+    ],
+    overall_grade_repo: Annotated[
+        OverallGradeRepository, Depends(get_overall_grade_repo)
+    ],
+    hive_client: Annotated[HiveClient, Depends(get_hive_client)],
+    course_hierarchy: Annotated[
+        CourseHierarchyResolver, Depends(get_course_hierarchy_resolver)
+    ],
+    course_tree_cache: Annotated[CourseTreeCache, Depends(get_course_tree_cache)],
+) -> GradebookExporter:
+    return GradebookExporter(
+        repositories=(
+            overall_grade_repo,
+            subject_grade_repo,
+            module_grade_repo,
+            assignment_grade_repo,
+            response_grade_repo,
+        ),
+        course_names=CourseNameIndex.from_course(
+            course_tree_cache.get_components(hive_client),
+            course_hierarchy.get_hierarchy(hive_client),
+        ),
     )
@@ -1,10 +1,13 @@
+from functools import lru_cache
 from http import HTTPStatus
-from typing import Any, Dict, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from fastapi import Depends, HTTPException
 
 from evaluer.common.clients.hive import HiveClient
 from evaluer.common.models.hive import TokenObtainRequest
+from evaluer.common.services.course import CourseHierarchyResolver, CourseTreeCache
+from evaluer.common.services.students import StudentDirectory
 from evaluer.common.settings import Settings, get_settings
 
 
@@ -19,6 +22,31 @@ def get_hive_client(settings: Settings = Depends(get_settings)) -> HiveClient:
     return hive_client
 
 
+def get_hive_client_factory(
+    settings: Settings = Depends(get_settings),
+) -> Callable[[], HiveClient]:
+    return lambda: get_hive_client(settings)
+
+
+@lru_cache
+def get_course_hierarchy_resolver() -> CourseHierarchyResolver:
+    return CourseHierarchyResolver(
+        refresh_interval=get_settings().hive.course_refresh_seconds
+    )
+
+
+@lru_cache
+def get_course_tree_cache() -> CourseTreeCache:
+    return CourseTreeCache(refresh_interval=get_settings().hive.course_refresh_seconds)
+
+
+@lru_cache
+def get_student_directory() -> StudentDirectory:
+    return StudentDirectory(
+        refresh_interval=get_settings().hive.student_refresh_seconds
+    )
+
+
 class HiveResourceValidation:
 
     def __init__(
@@ -33,6 +61,7 @@ def validate_hive_resources(
     request_dict: Dict[str, Any],
     hive_client: HiveClient,
     validations: Tuple[HiveResourceValidation, ...],
+    student_directory: Optional[StudentDirectory] = None,
 ):
     for validation in validations:
         resource_id = request_dict.get(validation.field_name)
@@ -47,9 +76,13 @@ def validate_hive_resources(
             else:
                 kwargs[dep_field] = dep_value
 
-        if not hive_client.is_resource_exist(
-            validation.resource_type, resource_id, **kwargs
-        ):
+        if validation.resource_type == "user" and student_directory is not None:
+            exists = student_directory.exists(resource_id, hive_client)
+        else:
+            exists = hive_client.is_resource_exist(
+                validation.resource_type, resource_id, **kwargs
+            )
+        if not exists:
             field_display_name = (
                 validation.field_name.replace("_id", "").replace("_", " ").title()
             )
@@ -0,0 +1,29 @@
+from functools import lru_cache
+
+from evaluer.api.dependencies.grades import get_grading_calculator
+from evaluer.api.dependencies.hive import (
+    get_course_hierarchy_resolver,
+    get_hive_client,
+)
+from evaluer.api.dependencies.weights import get_weights_registry
+from evaluer.common.database.session import AsyncSessionLocal
+from evaluer.common.services.hooks import AutoGradeWorker, HiveEventQueue
+from evaluer.common.settings import get_settings
+
+
+@lru_cache
+def get_hive_event_queue() -> HiveEventQueue:
+    settings = get_settings()
+    worker = AutoGradeWorker(
+        session_factory=AsyncSessionLocal,
+        weights_registry=get_weights_registry(),
+        grading_calculator=get_grading_calculator(),
+        hive_client_factory=lambda: get_hive_client(settings),
+        course_hierarchy=get_course_hierarchy_resolver(),
+        history_snapshot_interval=settings.grading.history_snapshot_interval,
+    )
+    return HiveEventQueue(
+        worker.process,
+        max_pending=settings.hive.webhook_queue_size,
+        debounce_seconds=settings.hive.webhook_debounce_seconds,
+    )
@@ -1,18 +1,48 @@
+from functools import lru_cache
 from typing import Annotated
 
 from fastapi import Depends
 
-from evaluer.common.services.weights import WeightProvider, WeightsConfiguration
-from evaluer.common.settings import Settings, get_settings
+from evaluer.common.database.session import AsyncSessionLocal
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.weights import (
+    WeightProvider,
+    WeightsConfiguration,
+    WeightsRegistry,
+)
+from evaluer.common.services.weights_store import DatabaseWeightsStore
+from evaluer.common.settings import get_settings
 
 
-def get_weights_configuration(
-    settings: Settings = Depends(get_settings),
-) -> WeightsConfiguration:
-    return WeightsConfiguration.from_yaml(str(settings.grading.weights_config_path))
+@lru_cache
+def get_weights_registry() -> WeightsRegistry:
+    settings = get_settings()
+    is_file_source = settings.grading.weights_source == "file"
+    return WeightsRegistry(
+        config_path=settings.grading.weights_config_path if is_file_source else None,
+        check_interval=settings.grading.weights_reload_interval_seconds,
+    )
+
+
+@lru_cache
+def get_weights_store() -> DatabaseWeightsStore:
+    settings = get_settings()
+    return DatabaseWeightsStore(
+        registry=get_weights_registry(),
+        session_factory=AsyncSessionLocal,
+        grading_calculator=GradingCalculator(),
+        seed_config_path=settings.grading.weights_config_path,
+        history_snapshot_interval=settings.grading.history_snapshot_interval,
+    )
 
 
 def get_weight_provider(
-    weights: Annotated[WeightsConfiguration, Depends(get_weights_configuration)],
+    registry: Annotated[WeightsRegistry, Depends(get_weights_registry)],
 ) -> WeightProvider:
-    return WeightProvider(weights)
+    return registry.get_provider()
+
+
+def get_weights_configuration(
+    weight_provider: Annotated[WeightProvider, Depends(get_weight_provider)],
+) -> WeightsConfiguration:
+    return weight_provider.configuration
@@ -1,11 +1,13 @@
 def create_app_router():
     from fastapi import APIRouter
 
-    from evaluer.api.routers import course, grades
+    from evaluer.api.routers import course, grades, hooks, weights
 
     router = APIRouter()
 
     router.include_router(course.router)
     router.include_router(grades.router)
+    router.include_router(hooks.router)
+    router.include_router(weights.router)
 
     return router
\ No newline at end of file
@@ -1,63 +1,214 @@
-from typing import List
+from http import HTTPStatus
+from typing import Callable, List, Optional, Tuple
 
-from fastapi import Depends, APIRouter
+from fastapi import Depends, APIRouter, HTTPException, Query, Request, Response
 
-from evaluer.api.dependencies.hive import get_hive_client
+from evaluer.api.dependencies.caching import (
+    cached_json_response,
+    make_etag,
+    versioned_json_response,
+)
+from evaluer.api.dependencies.hive import (
+    get_course_tree_cache,
+    get_hive_client,
+    get_hive_client_factory,
+    get_student_directory,
+)
+from evaluer.api.dependencies.weights import get_weight_provider
+from evaluer.api.schemas.course import CourseStudent, CourseStudentPage, CourseTree
 from evaluer.common.clients.hive import HiveClient
 from evaluer.common.models.hive import (
     AssignmentResponse,
     AssignmentResponseFiles,
-    ClearanceLevel,
 )
+from evaluer.common.pagination import decode_cursor, encode_cursor
+from evaluer.common.services.course import CourseComponents, CourseTreeCache
+from evaluer.common.services.students import StudentDirectory, StudentIndex
+from evaluer.common.services.weights import WeightProvider
 
 router = APIRouter(prefix="/course", tags=["Course"])
 
 
+def load_course_components(
+    course_tree_cache: CourseTreeCache,
+    hive_client_factory: Callable[[], HiveClient],
+) -> Tuple[CourseComponents, str]:
+    cached = course_tree_cache.peek_components()
+    if cached is not None:
+        return cached
+    return course_tree_cache.get_versioned_components(hive_client_factory())
+
+
+def load_student_index(
+    student_directory: StudentDirectory,
+    hive_client_factory: Callable[[], HiveClient],
+) -> StudentIndex:
+    index = student_directory.peek_index()
+    if index is not None:
+        return index
+    return student_directory.get_index(hive_client_factory())
+
+
 @router.get("/subjects")
 def get_course_subjects(
-    hive_client: HiveClient = Depends(get_hive_client),
-):
-    return hive_client.get_subjects()
+    request: Request,
+    hive_client_factory: Callable[[], HiveClient] = Depends(get_hive_client_factory),
+    course_tree_cache: CourseTreeCache = Depends(get_course_tree_cache),
+) -> Response:
+    (subjects, _, _), version = load_course_components(
+        course_tree_cache, hive_client_factory
+    )
+    return versioned_json_response(
+        request, make_etag("course-subjects", version), lambda: subjects
+    )
+
+
+@router.get("/tree", response_model=CourseTree)
+def get_course_tree(
+    request: Request,
+    hive_client_factory: Callable[[], HiveClient] = Depends(get_hive_client_factory),
+    weight_provider: WeightProvider = Depends(get_weight_provider),
+    course_tree_cache: CourseTreeCache = Depends(get_course_tree_cache),
+) -> Response:
+    tree = course_tree_cache.peek_tree(weight_provider)
+    if tree is None:
+        tree = course_tree_cache.get_tree(hive_client_factory(), weight_provider)
+    return versioned_json_response(
+        request, make_etag("course-tree", tree.version), tree._asdict
+    )
 
 
-@router.get("/students")
+@router.get("/students", response_model=CourseStudentPage)
 def get_course_students(
-    hive_client: HiveClient = Depends(get_hive_client),
-):
-    return hive_client.get_users_by_clearance(ClearanceLevel.HANICH)
+    request: Request,
+    search: Optional[str] = None,
+    username: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    hive_client_factory: Callable[[], HiveClient] = Depends(get_hive_client_factory),
+    student_directory: StudentDirectory = Depends(get_student_directory),
+) -> Response:
+    try:
+        after = decode_cursor(cursor, parsers=(int,)) if cursor else None
+    except ValueError as error:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail=str(error)
+        ) from error
+
+    index = load_student_index(student_directory, hive_client_factory)
+    etag = make_etag("course-students", index.version, search, username, cursor, limit)
+    if username is not None:
+        student = index.get_by_username(username)
+        return versioned_json_response(
+            request,
+            etag,
+            lambda: CourseStudentPage(
+                items=[CourseStudent(**student.to_dict())] if student else [],
+                total=1 if student else 0,
+            ),
+        )
+
+    def build_page() -> CourseStudentPage:
+        page = index.page(
+            search=search, after_id=after[0] if after else None, limit=limit
+        )
+        return CourseStudentPage(
+            items=[CourseStudent(**student.to_dict()) for student in page.items],
+            next_cursor=(
+                encode_cursor([page.next_cursor])
+                if page.next_cursor is not None
+                else None
+            ),
+            total=page.total,
+        )
+
+    return versioned_json_response(request, etag, build_page)
+
+
+@router.get("/students/{student_id}", response_model=CourseStudent)
+def get_course_student(
+    request: Request,
+    student_id: int,
+    hive_client_factory: Callable[[], HiveClient] = Depends(get_hive_client_factory),
+    student_directory: StudentDirectory = Depends(get_student_directory),
+) -> Response:
+    index = load_student_index(student_directory, hive_client_factory)
+    student = index.get(student_id)
+    if student is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Student with ID {student_id} does not exist.",
+        )
+    return versioned_json_response(
+        request,
+        make_etag("course-student", index.version, student_id),
+        lambda: CourseStudent(**student.to_dict()),
+    )
 
 
 @router.get("/modules")
 def get_course_modules_by_subject(
-    subject_id: int, hive_client: HiveClient = Depends(get_hive_client)
-):
-    return hive_client.get_modules_by_subject(subject_id=subject_id)
+    request: Request,
+    subject_id: int,
+    hive_client_factory: Callable[[], HiveClient] = Depends(get_hive_client_factory),
+    course_tree_cache: CourseTreeCache = Depends(get_course_tree_cache),
+) -> Response:
+    (_, modules, _), version = load_course_components(
+        course_tree_cache, hive_client_factory
+    )
+    return versioned_json_response(
+        request,
+        make_etag("course-modules", version, subject_id),
+        lambda: [module for module in modules if module.subject_id == subject_id],
+    )
 
 
 @router.get("/exercises")
 def get_course_exercises_by_module(
-    module_id: int, hive_client: HiveClient = Depends(get_hive_client)
-):
-    return hive_client.get_exercises_by_module(module_id=module_id)
+    request: Request,
+    module_id: int,
+    hive_client_factory: Callable[[], HiveClient] = Depends(get_hive_client_factory),
+    course_tree_cache: CourseTreeCache = Depends(get_course_tree_cache),
+) -> Response:
+    (_, _, exercises), version = load_course_components(
+        course_tree_cache, hive_client_factory
+    )
+    return versioned_json_response(
+        request,
+        make_etag("course-exercises", version, module_id),
+        lambda: [
+            exercise for exercise in exercises if exercise.module_id == module_id
+        ],
+    )
 
 
 @router.get("/assignments")
 def get_course_assignments_by_module(
+    request: Request,
     exercise_id: int,
     student_id: int,
     hive_client: HiveClient = Depends(get_hive_client),
 ):
-    return hive_client.get_student_assignment_by_exercise(
-        exercise_id=exercise_id, student_id=student_id
+    return cached_json_response(
+        request,
+        hive_client.get_student_assignment_by_exercise(
+            exercise_id=exercise_id, student_id=student_id
+        ),
     )
 
 
-@router.get("/assignments/{assignment_id}/responses")
+@router.get(
+    "/assignments/{assignment_id}/responses",
+    response_model=List[AssignmentResponse],
+)
 def get_course_assignment_responses(
+    request: Request,
     assignment_id: int,
     hive_client: HiveClient = Depends(get_hive_client),
-) -> List[AssignmentResponse]:
-    return hive_client.get_assignment_responses(assignment_id=assignment_id)
+) -> Response:
+    return cached_json_response(
+        request, hive_client.get_assignment_responses(assignment_id=assignment_id)
+    )
 
 
 @router.get(
@@ -65,11 +216,15 @@ def get_course_assignment_responses(
     response_model=AssignmentResponseFiles,
 )
 def get_assignment_response_files(
+    request: Request,
     assignment_id: int,
     response_id: int,
     hive_client: HiveClient = Depends(get_hive_client),
-) -> AssignmentResponseFiles:
-    return hive_client.get_assignment_response_files(
-        assignment_id=assignment_id,
-        response_id=response_id,
+) -> Response:
+    return cached_json_response(
+        request,
+        hive_client.get_assignment_response_files(
+            assignment_id=assignment_id,
+            response_id=response_id,
+        ),
     )
@@ -1,43 +1,218 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import AsyncIterator, List, Optional
 
-from evaluer.api.dependencies.grades import get_grade_service
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+)
+from fastapi.responses import StreamingResponse
+
+from evaluer.api.dependencies.caching import (
+    check_assignment_grade_etag,
+    check_module_grade_etag,
+    check_overall_grade_etag,
+    check_response_grade_etag,
+)
+from evaluer.api.dependencies.grades import (
+    get_auto_grade_sync,
+    get_grade_cache,
+    get_grade_change_broadcaster,
+    get_grade_service,
+    get_gradebook_exporter,
+    get_hive_response_repo,
+)
 from evaluer.api.dependencies.hive import (
     HiveResourceValidation,
     get_hive_client,
+    get_student_directory,
     validate_hive_resources,
 )
-from evaluer.api.schemas.grades import UpdateAssignmentGradeRequest
+from evaluer.api.schemas.grades import (
+    GradeCacheStats,
+    GradeHistogramBucket,
+    GradeHistoryItem,
+    GradeHistorySnapshot,
+    GradeListItem,
+    GradeListPage,
+    GradeSimulationRequest,
+    GradeSimulationResponse,
+    PendingResponse,
+    PendingResponsePage,
+    GradeSimulationResult,
+    GradeStatistics,
+    TopGrade,
+    UpdateAssignmentGradeRequest,
+)
 from evaluer.common.clients.hive import HiveClient
+from evaluer.common.models.grades import GradeLevel
 from evaluer.common.models.hive import AssignmentResponseType
+from evaluer.common.models.statistics import BUCKET_WIDTH
+from evaluer.common.pagination import decode_cursor, encode_cursor
+from evaluer.common.repositories.grading import GradeListFilters
+from evaluer.common.repositories.responses import HiveResponseRepository
+from evaluer.common.services.export import (
+    ExportFormat,
+    GradebookExporter,
+    create_gradebook_encoder,
+)
+from evaluer.common.services.grade_cache import GradeCache
+from evaluer.common.services.grade_stream import (
+    GradeChangeBroadcaster,
+    GradeStreamFilters,
+    GradeStreamSubscription,
+    format_server_sent_event,
+)
 from evaluer.common.services.grades import GradeService
+from evaluer.common.services.simulation import (
+    GradeScenario,
+    HypotheticalAssignmentGrade,
+    HypotheticalResponseGrade,
+)
+from evaluer.common.services.students import StudentDirectory
+from evaluer.common.services.sync import AutoGradeSync
+from evaluer.common.settings import get_settings
 
 router = APIRouter(prefix="/grades", tags=["Grades"])
 
 
+@router.get("", response_model=GradeListPage)
+async def list_grades(
+    level: GradeLevel = GradeLevel.ASSIGNMENT,
+    student_id: Optional[int] = None,
+    subject_id: Optional[int] = None,
+    module_id: Optional[int] = None,
+    assignment_id: Optional[int] = None,
+    min_grade: Optional[float] = Query(None, ge=0, le=10),
+    max_grade: Optional[float] = Query(None, ge=0, le=10),
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    grade_service: GradeService = Depends(get_grade_service),
+) -> GradeListPage:
+    equals = {
+        column: value
+        for column, value in (
+            ("student_id", student_id),
+            ("subject_id", subject_id),
+            ("module_id", module_id),
+            ("assignment_id", assignment_id),
+        )
+        if value is not None
+    }
+    filters = GradeListFilters(
+        equals=equals,
+        min_grade=min_grade,
+        max_grade=max_grade,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
+    try:
+        after = decode_cursor(cursor, parsers=(int, int)) if cursor else None
+        page = await grade_service.list_grades(
+            level=level, filters=filters, limit=limit, after=after
+        )
+    except ValueError as error:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail=str(error)
+        ) from error
+
+    return GradeListPage(
+        items=[GradeListItem(level=level, **item) for item in page.items],
+        next_cursor=encode_cursor(page.next_cursor) if page.next_cursor else None,
+        estimated_total=page.estimated_total,
+    )
+
+
+@router.get("/pending", response_model=PendingResponsePage)
+async def list_pending_responses(
+    module_id: Optional[int] = None,
+    subject_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    hive_responses: HiveResponseRepository = Depends(get_hive_response_repo),
+) -> PendingResponsePage:
+    try:
+        after = (
+            decode_cursor(cursor, parsers=(datetime.fromisoformat, int))
+            if cursor
+            else None
+        )
+    except ValueError as error:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail=str(error)
+        ) from error
+
+    items = await hive_responses.get_pending_redo(
+        module_id=module_id, subject_id=subject_id, after=after, limit=limit + 1
+    )
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            [last["submitted_at"].isoformat(), last["response_id"]]
+        )
+    return PendingResponsePage(
+        items=[PendingResponse(**item) for item in items], next_cursor=next_cursor
+    )
+
+
 @router.put("/assignment")
 async def update_student_assignment_response_grade(
     update_grade_request: UpdateAssignmentGradeRequest,
     grade_service: GradeService = Depends(get_grade_service),
     hive_client: HiveClient = Depends(get_hive_client),
+    student_directory: StudentDirectory = Depends(get_student_directory),
 ):
     validate_hive_resources(
         request_dict=update_grade_request.model_dump(),
         hive_client=hive_client,
         validations=(
             HiveResourceValidation(resource_type="user", field_name="student_id"),
-            HiveResourceValidation(resource_type="module", field_name="module_id"),
-            HiveResourceValidation(resource_type="subject", field_name="subject_id"),
-            HiveResourceValidation(
-                resource_type="assignment", field_name="assignment_id"
-            ),
             HiveResourceValidation(
                 resource_type="assignment_response",
                 field_name="response_id",
                 depends_on={"assignment_id": "field:assignment_id"},
             ),
         ),
+        student_directory=student_directory,
     )
 
+    ancestry = grade_service.resolve_assignment(
+        update_grade_request.assignment_id, hive_client
+    )
+    if ancestry is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=(
+                f"Assignment with ID {update_grade_request.assignment_id} "
+                "does not exist."
+            ),
+        )
+    for field_name, resolved_id in (
+        ("module_id", ancestry.module_id),
+        ("subject_id", ancestry.subject_id),
+    ):
+        requested_id = getattr(update_grade_request, field_name)
+        if requested_id is not None and requested_id != resolved_id:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=(
+                    f"Assignment {update_grade_request.assignment_id} belongs to "
+                    f"{field_name.replace('_id', '')} {resolved_id}, "
+                    f"not {requested_id}"
+                ),
+            )
+
     assignment_response = hive_client.get_assignment_response(
         assignment_id=update_grade_request.assignment_id,
         response_id=update_grade_request.response_id
@@ -47,18 +222,29 @@ async def update_student_assignment_response_grade(
             status_code=400, detail="Assignment response's type must be redo"
         )
     
-    await grade_service.update_response_grade(**update_grade_request.model_dump())
+    await grade_service.update_response_grade(
+        student_id=update_grade_request.student_id,
+        response_id=update_grade_request.response_id,
+        assignment_id=update_grade_request.assignment_id,
+        module_id=ancestry.module_id,
+        subject_id=ancestry.subject_id,
+        new_grade=update_grade_request.new_grade,
+    )
 
 
 @router.get(
-    "/assignments/{assignment_id}/responses/{response_id}", response_model=float
+    "/assignments/{assignment_id}/responses/{response_id}",
+    response_model=float,
+    dependencies=[Depends(check_response_grade_etag)],
 )
 async def get_student_assignment_response_grade(
     student_id: int,
     assignment_id: int,
     response_id: int,
+    as_of: Optional[datetime] = None,
     grade_service: GradeService = Depends(get_grade_service),
     hive_client: HiveClient = Depends(get_hive_client),
+    student_directory: StudentDirectory = Depends(get_student_directory),
 ) -> float:
     validate_hive_resources(
         request_dict={
@@ -78,18 +264,28 @@ async def get_student_assignment_response_grade(
                 depends_on={"assignment_id": "field:assignment_id"},
             ),
         ),
+        student_directory=student_directory,
     )
     return await grade_service.get_assignment_response_grade(
-        student_id=student_id, assignment_id=assignment_id, response_id=response_id
+        student_id=student_id,
+        assignment_id=assignment_id,
+        response_id=response_id,
+        as_of=as_of,
     )
 
 
-@router.get("/assignments/{assignment_id}", response_model=float)
+@router.get(
+    "/assignments/{assignment_id}",
+    response_model=float,
+    dependencies=[Depends(check_assignment_grade_etag)],
+)
 async def get_student_assignment_grade(
     student_id: int,
     assignment_id: int,
+    as_of: Optional[datetime] = None,
     grade_service: GradeService = Depends(get_grade_service),
     hive_client: HiveClient = Depends(get_hive_client),
+    student_directory: StudentDirectory = Depends(get_student_directory),
 ) -> float:
     validate_hive_resources(
         request_dict={
@@ -103,18 +299,22 @@ async def get_student_assignment_grade(
                 resource_type="assignment", field_name="assignment_id"
             ),
         ),
+        student_directory=student_directory,
     )
 
     return await grade_service.get_assignment_grade(
-        student_id=student_id, assignment_id=assignment_id
+        student_id=student_id, assignment_id=assignment_id, as_of=as_of
     )
 
 
 @router.post("/sync/overall", response_model=float)
 async def sync_overall_grades(
     student_id: int,
+    full: bool = False,
     grade_service: GradeService = Depends(get_grade_service),
+    auto_grade_sync: AutoGradeSync = Depends(get_auto_grade_sync),
     hive_client: HiveClient = Depends(get_hive_client),
+    student_directory: StudentDirectory = Depends(get_student_directory),
 ) -> float:
     validate_hive_resources(
         request_dict={"student_id": student_id},
@@ -122,19 +322,24 @@ async def sync_overall_grades(
         validations=(
             HiveResourceValidation(resource_type="user", field_name="student_id"),
         ),
+        student_directory=student_directory,
     )
-    return await grade_service.ensure_overall_auto_grades(
-        student_id=student_id,
-        hive_client=hive_client,
-    )
+    await auto_grade_sync.run(hive_client, student_id=student_id, full=full)
+    return await grade_service.get_overall_grade(student_id)
 
 
-@router.get("/modules", response_model=float)
+@router.get(
+    "/modules",
+    response_model=float,
+    dependencies=[Depends(check_module_grade_etag)],
+)
 async def get_student_module_grade(
     student_id: int,
     module_id: int,
+    as_of: Optional[datetime] = None,
     grade_service: GradeService = Depends(get_grade_service),
     hive_client: HiveClient = Depends(get_hive_client),
+    student_directory: StudentDirectory = Depends(get_student_directory),
 ) -> float:
     validate_hive_resources(
         request_dict={"student_id": student_id, "module_id": module_id},
@@ -143,17 +348,24 @@ async def get_student_module_grade(
             HiveResourceValidation(resource_type="user", field_name="student_id"),
             HiveResourceValidation(resource_type="module", field_name="module_id"),
         ),
+        student_directory=student_directory,
     )
     return await grade_service.get_module_grade(
-        student_id=student_id, module_id=module_id
+        student_id=student_id, module_id=module_id, as_of=as_of
     )
 
 
-@router.get("/overall", response_model=float)
+@router.get(
+    "/overall",
+    response_model=float,
+    dependencies=[Depends(check_overall_grade_etag)],
+)
 async def get_student_overall_grade(
     student_id: int,
+    as_of: Optional[datetime] = None,
     grade_service: GradeService = Depends(get_grade_service),
     hive_client: HiveClient = Depends(get_hive_client),
+    student_directory: StudentDirectory = Depends(get_student_directory),
 ) -> float:
     validate_hive_resources(
         request_dict={"student_id": student_id},
@@ -161,5 +373,240 @@ async def get_student_overall_grade(
         validations=(
             HiveResourceValidation(resource_type="user", field_name="student_id"),
         ),
+        student_directory=student_directory,
+    )
+    return await grade_service.get_overall_grade(student_id=student_id, as_of=as_of)
+
+
+@router.get("/history", response_model=GradeHistorySnapshot)
+async def get_student_grade_history(
+    student_id: int,
+    as_of: Optional[datetime] = None,
+    grade_service: GradeService = Depends(get_grade_service),
+) -> GradeHistorySnapshot:
+    as_of = as_of or datetime.now(timezone.utc)
+    grades = await grade_service.get_grades_as_of(student_id=student_id, as_of=as_of)
+    return GradeHistorySnapshot(
+        student_id=student_id,
+        as_of=as_of,
+        grades=[
+            GradeHistoryItem(level=level, item_id=item_id, grade=grade)
+            for (level, item_id), grade in sorted(
+                grades.items(), key=lambda item: (item[0][0].value, item[0][1] or 0)
+            )
+        ],
+    )
+
+
+@router.post(
+    "/students/{student_id}/simulate", response_model=GradeSimulationResponse
+)
+async def simulate_student_grades(
+    student_id: int,
+    simulation_request: GradeSimulationRequest,
+    grade_service: GradeService = Depends(get_grade_service),
+) -> GradeSimulationResponse:
+    scenarios = [
+        GradeScenario(
+            responses=[
+                HypotheticalResponseGrade(**response.model_dump())
+                for response in scenario.responses
+            ],
+            assignments=[
+                HypotheticalAssignmentGrade(**assignment.model_dump())
+                for assignment in scenario.assignments
+            ],
+        )
+        for scenario in simulation_request.scenarios
+    ]
+    try:
+        simulation = await grade_service.simulate_grades(student_id, scenarios)
+    except ValueError as error:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail=str(error)
+        ) from error
+
+    return GradeSimulationResponse(
+        student_id=student_id,
+        current_overall=simulation.current_overall,
+        results=[
+            GradeSimulationResult(name=scenario.name, **outcome._asdict())
+            for scenario, outcome in zip(
+                simulation_request.scenarios, simulation.outcomes
+            )
+        ],
+    )
+
+
+@router.get("/statistics", response_model=GradeStatistics)
+async def get_grade_statistics(
+    level: GradeLevel = GradeLevel.OVERALL,
+    item_id: Optional[int] = None,
+    percentiles: List[float] = Query([25.0, 50.0, 75.0, 90.0]),
+    grade_service: GradeService = Depends(get_grade_service),
+) -> GradeStatistics:
+    try:
+        if any(not 0 <= percent <= 100 for percent in percentiles):
+            raise ValueError("Percentiles must be between 0 and 100")
+        distribution = await grade_service.get_grade_distribution(
+            level=level, item_id=item_id
+        )
+    except ValueError as error:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail=str(error)
+        ) from error
+
+    return GradeStatistics(
+        level=level,
+        item_id=item_id,
+        count=distribution.count,
+        mean=distribution.mean,
+        stddev=distribution.stddev,
+        percentiles={
+            f"p{percent:g}": distribution.percentile(percent)
+            for percent in percentiles
+        },
+        histogram=[
+            GradeHistogramBucket(
+                lower=bucket * BUCKET_WIDTH,
+                upper=(bucket + 1) * BUCKET_WIDTH,
+                count=count,
+            )
+            for bucket, count in enumerate(distribution.histogram)
+        ],
+    )
+
+
+@router.get("/statistics/top", response_model=List[TopGrade])
+async def get_top_grades(
+    level: GradeLevel = GradeLevel.OVERALL,
+    item_id: Optional[int] = None,
+    limit: int = Query(10, ge=1, le=100),
+    grade_service: GradeService = Depends(get_grade_service),
+) -> List[TopGrade]:
+    try:
+        top_grades = await grade_service.get_top_grades(
+            level=level, limit=limit, item_id=item_id
+        )
+    except ValueError as error:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail=str(error)
+        ) from error
+
+    return [
+        TopGrade(rank=rank, student_id=student_id, grade=grade)
+        for rank, (student_id, grade) in enumerate(top_grades, start=1)
+    ]
+
+
+@router.get("/export")
+async def export_gradebook(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    exporter: GradebookExporter = Depends(get_gradebook_exporter),
+) -> StreamingResponse:
+    try:
+        encoder = create_gradebook_encoder(export_format)
+    except RuntimeError as error:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_IMPLEMENTED, detail=str(error)
+        ) from error
+
+    return StreamingResponse(
+        exporter.stream(encoder),
+        media_type=export_format.media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="gradebook.{export_format.value}"'
+            )
+        },
+    )
+
+
+@router.get("/cache/stats", response_model=GradeCacheStats)
+async def get_grade_cache_stats(
+    grade_cache: Optional[GradeCache] = Depends(get_grade_cache),
+) -> GradeCacheStats:
+    if grade_cache is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail="Grade cache is disabled"
+        )
+    return GradeCacheStats(**grade_cache.stats())
+
+
+async def _server_sent_events(
+    request: Request,
+    broadcaster: GradeChangeBroadcaster,
+    subscription: GradeStreamSubscription,
+) -> AsyncIterator[str]:
+    heartbeat_seconds = get_settings().grading.grade_stream_heartbeat_seconds
+    try:
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            event = await subscription.get(timeout=heartbeat_seconds)
+            yield format_server_sent_event(event) if event else ": keep-alive\n\n"
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_grade_changes(
+    request: Request,
+    student_id: Optional[int] = None,
+    subject_id: Optional[int] = None,
+    module_id: Optional[int] = None,
+    assignment_id: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None),
+    broadcaster: GradeChangeBroadcaster = Depends(get_grade_change_broadcaster),
+) -> StreamingResponse:
+    subscription = broadcaster.subscribe(
+        GradeStreamFilters(
+            student_id=student_id,
+            subject_id=subject_id,
+            module_id=module_id,
+            assignment_id=assignment_id,
+        ),
+        last_event_id=last_event_id,
+    )
+    return StreamingResponse(
+        _server_sent_events(request, broadcaster, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/stream/ws")
+async def stream_grade_changes_websocket(
+    websocket: WebSocket,
+    student_id: Optional[int] = None,
+    subject_id: Optional[int] = None,
+    module_id: Optional[int] = None,
+    assignment_id: Optional[int] = None,
+    last_event_id: Optional[str] = None,
+    broadcaster: GradeChangeBroadcaster = Depends(get_grade_change_broadcaster),
+) -> None:
+    await websocket.accept()
+    subscription = broadcaster.subscribe(
+        GradeStreamFilters(
+            student_id=student_id,
+            subject_id=subject_id,
+            module_id=module_id,
+            assignment_id=assignment_id,
+        ),
+        last_event_id=last_event_id,
     )
-    return await grade_service.get_overall_grade(student_id=student_id)
+    heartbeat_seconds = get_settings().grading.grade_stream_heartbeat_seconds
+
+    async def forward_events() -> None:
+        while True:
+            event = await subscription.get(timeout=heartbeat_seconds)
+            await websocket.send_json(
+                event._asdict() if event else {"event": "keep-alive"}
+            )
+
+    forwarder = asyncio.create_task(forward_events())
+    try:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            continue
+    finally:
+        forwarder.cancel()
+        broadcaster.unsubscribe(subscription)
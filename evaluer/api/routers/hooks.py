@@ -0,0 +1,46 @@
+from http import HTTPStatus
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from pydantic import ValidationError
+
+from evaluer.api.dependencies.hooks import get_hive_event_queue
+from evaluer.api.schemas.hooks import HiveEvent, HiveEventAccepted
+from evaluer.common.services.hooks import HiveEventQueue, verify_signature
+from evaluer.common.settings import Settings, get_settings
+
+router = APIRouter(prefix="/hooks", tags=["Hooks"])
+
+
+@router.post(
+    "/hive", status_code=HTTPStatus.ACCEPTED, response_model=HiveEventAccepted
+)
+async def receive_hive_event(
+    request: Request,
+    x_hive_signature: Optional[str] = Header(None),
+    settings: Settings = Depends(get_settings),
+    event_queue: HiveEventQueue = Depends(get_hive_event_queue),
+) -> HiveEventAccepted:
+    secret = settings.hive.webhook_secret
+    if not secret:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail="Hive webhooks are disabled."
+        )
+
+    body = await request.body()
+    if not verify_signature(secret, body, x_hive_signature):
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED, detail="Invalid signature."
+        )
+
+    try:
+        event = HiveEvent.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+
+    if not event_queue.enqueue(event.user_id, event.assignment_id):
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail="Hive event queue is full.",
+        )
+    return HiveEventAccepted(pending=event_queue.pending_count)
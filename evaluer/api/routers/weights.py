@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+
+from evaluer.api.dependencies.weights import get_weight_provider, get_weights_store
+from evaluer.api.schemas.weights import (
+    UpdateWeightsRequest,
+    UpdateWeightsResponse,
+    WeightsVersionResponse,
+)
+from evaluer.common.services.weights import WeightProvider
+from evaluer.common.services.weights_store import DatabaseWeightsStore
+from evaluer.common.settings import Settings, get_settings
+
+router = APIRouter(prefix="/weights", tags=["Weights"])
+
+
+@router.get("", response_model=WeightsVersionResponse)
+def get_weights(
+    weight_provider: WeightProvider = Depends(get_weight_provider),
+) -> WeightsVersionResponse:
+    return WeightsVersionResponse(
+        version=weight_provider.version, weights=weight_provider.configuration
+    )
+
+
+@router.put("", response_model=UpdateWeightsResponse)
+async def update_weights(
+    update_weights_request: UpdateWeightsRequest,
+    background_tasks: BackgroundTasks,
+    settings: Settings = Depends(get_settings),
+    weights_store: DatabaseWeightsStore = Depends(get_weights_store),
+) -> UpdateWeightsResponse:
+    if settings.grading.weights_source != "database":
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail="Weights are managed by the weights file, edit it instead.",
+        )
+
+    version, changes = await weights_store.update(
+        update_weights_request.weights,
+        description=update_weights_request.description,
+    )
+    background_tasks.add_task(weights_store.recalculate_pending)
+
+    return UpdateWeightsResponse(
+        version=version,
+        recalculated_module_ids=sorted(changes.module_ids),
+        recalculated_subject_ids=sorted(changes.subject_ids),
+        recalculated_overall=changes.subjects_changed,
+    )
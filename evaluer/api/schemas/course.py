@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class CourseStudent(BaseModel):
+    id: int
+    name: str
+    username: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+
+
+class CourseStudentPage(BaseModel):
+    items: List[CourseStudent]
+    next_cursor: Optional[str] = None
+    total: int
+
+
+class CourseTreeExercise(BaseModel):
+    id: int
+    name: str
+    weight: Optional[float] = None
+
+
+class CourseTreeModule(BaseModel):
+    id: int
+    name: str
+    weight: Optional[float] = None
+    exercises: List[CourseTreeExercise]
+
+
+class CourseTreeSubject(BaseModel):
+    id: int
+    name: str
+    weight: Optional[float] = None
+    modules: List[CourseTreeModule]
+
+
+class CourseTree(BaseModel):
+    version: str
+    subjects: List[CourseTreeSubject]
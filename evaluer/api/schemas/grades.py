@@ -1,10 +1,132 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
 from pydantic import BaseModel, Field
 
+from evaluer.common.models.grades import GradeLevel
+
 
 class UpdateAssignmentGradeRequest(BaseModel):
     student_id: int
     response_id: int
     assignment_id: int
+    module_id: Optional[int] = None
+    subject_id: Optional[int] = None
+    new_grade: float = Field(ge=1, le=10, description="Grade must be between 1 and 10")
+
+
+class GradeListItem(BaseModel):
+    level: GradeLevel
+    id: int
+    student_id: int
+    subject_id: Optional[int] = None
+    module_id: Optional[int] = None
+    assignment_id: Optional[int] = None
+    response_id: Optional[int] = None
+    grade: float
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class GradeListPage(BaseModel):
+    items: List[GradeListItem]
+    next_cursor: Optional[str] = None
+    estimated_total: int
+
+
+class PendingResponse(BaseModel):
+    response_id: int
+    assignment_id: int
+    student_id: int
     module_id: int
     subject_id: int
-    new_grade: float = Field(ge=1, le=10, description="Grade must be between 1 and 10")
+    submitted_at: datetime
+
+
+class PendingResponsePage(BaseModel):
+    items: List[PendingResponse]
+    next_cursor: Optional[str] = None
+
+
+class GradeCacheStats(BaseModel):
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    expirations: int
+    invalidations: int
+    invalidation_notifications: int
+    invalidation_lag_last_ms: float
+    invalidation_lag_avg_ms: float
+    invalidation_lag_max_ms: float
+
+
+class GradeHistoryItem(BaseModel):
+    level: GradeLevel
+    item_id: Optional[int] = None
+    grade: float
+
+
+class GradeHistorySnapshot(BaseModel):
+    student_id: int
+    as_of: datetime
+    grades: List[GradeHistoryItem]
+
+
+class SimulatedResponseGrade(BaseModel):
+    assignment_id: int
+    response_id: Optional[int] = None
+    grade: float = Field(ge=1, le=10, description="Grade must be between 1 and 10")
+
+
+class SimulatedAssignmentGrade(BaseModel):
+    assignment_id: int
+    grade: float = Field(ge=1, le=10, description="Grade must be between 1 and 10")
+
+
+class GradeSimulationScenario(BaseModel):
+    name: Optional[str] = None
+    responses: List[SimulatedResponseGrade] = []
+    assignments: List[SimulatedAssignmentGrade] = []
+
+
+class GradeSimulationRequest(BaseModel):
+    scenarios: List[GradeSimulationScenario] = Field(min_length=1, max_length=1000)
+
+
+class GradeSimulationResult(BaseModel):
+    name: Optional[str] = None
+    overall: float
+    subjects: Dict[int, float]
+    modules: Dict[int, float]
+    assignments: Dict[int, float]
+
+
+class GradeSimulationResponse(BaseModel):
+    student_id: int
+    current_overall: float
+    results: List[GradeSimulationResult]
+
+
+class GradeHistogramBucket(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+
+class GradeStatistics(BaseModel):
+    level: GradeLevel
+    item_id: Optional[int] = None
+    count: int
+    mean: Optional[float] = None
+    stddev: Optional[float] = None
+    percentiles: Dict[str, Optional[float]]
+    histogram: List[GradeHistogramBucket]
+
+
+class TopGrade(BaseModel):
+    rank: int
+    student_id: int
+    grade: float
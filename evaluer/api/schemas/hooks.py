@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+from evaluer.common.models.hive import HiveEventType
+
+
+class HiveEvent(BaseModel):
+    event: HiveEventType
+    assignment_id: int
+    user_id: int
+
+
+class HiveEventAccepted(BaseModel):
+    pending: int
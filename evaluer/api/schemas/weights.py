@@ -0,0 +1,22 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from evaluer.common.services.weights import WeightsConfiguration
+
+
+class WeightsVersionResponse(BaseModel):
+    version: int
+    weights: WeightsConfiguration
+
+
+class UpdateWeightsRequest(BaseModel):
+    weights: WeightsConfiguration
+    description: Optional[str] = None
+
+
+class UpdateWeightsResponse(BaseModel):
+    version: int
+    recalculated_module_ids: List[int]
+    recalculated_subject_ids: List[int]
+    recalculated_overall: bool
@@ -0,0 +1,36 @@
+from typing import List, Tuple
+
+from evaluer.common.database.session import AsyncSessionLocal, dispose_engines
+from evaluer.common.models.grades import GradeLevel
+from evaluer.common.repositories.aggregates import GradeAggregateRepository
+from evaluer.common.repositories.grading import (
+    AssignmentGradeRepository,
+    ModuleGradeRepository,
+    OverallGradeRepository,
+    ResponseGradeRepository,
+    SubjectGradeRepository,
+)
+
+
+async def rebuild_aggregates(shards: int) -> List[Tuple[GradeLevel, int]]:
+    try:
+        async with AsyncSessionLocal() as db:
+            aggregates = GradeAggregateRepository(db, shards=shards)
+            rebuilt = []
+            for repository in (
+                ResponseGradeRepository(db),
+                AssignmentGradeRepository(db),
+                ModuleGradeRepository(db),
+                SubjectGradeRepository(db),
+                OverallGradeRepository(db),
+            ):
+                rows = await aggregates.rebuild(
+                    repository.level,
+                    repository.model.__tablename__,
+                    repository.item_column,
+                )
+                rebuilt.append((repository.level, rows))
+            await db.commit()
+    finally:
+        await dispose_engines()
+    return rebuilt
@@ -1,3 +1,5 @@
+import asyncio
+from datetime import datetime
 from pathlib import Path
 
 import typer
@@ -7,7 +9,8 @@ from rich.panel import Panel
 from evaluer.cli.generator import GradingConfigGenerator
 from evaluer.common.clients.hive import HiveClient
 from evaluer.common.settings import get_settings
-from evaluer.common.models.hive import TokenObtainRequest
+from evaluer.common.models.hive import HiveEventType, TokenObtainRequest
+from evaluer.common.services.export import ExportFormat
 
 
 app = typer.Typer(
@@ -77,5 +80,283 @@ def generate(
         raise typer.Exit(code=1)
 
 
+@app.command()
+def export(
+    ctx: typer.Context,
+    output: Path = typer.Option(
+        ...,
+        "--output",
+        "-o",
+        help="Output file path for the exported gradebook.",
+        writable=True,
+        resolve_path=True,
+    ),
+    export_format: ExportFormat = typer.Option(
+        ExportFormat.CSV, "--format", help="Export file format."
+    ),
+    batch_size: int = typer.Option(
+        1000, "--batch-size", help="Rows fetched per keyset page."
+    ),
+    row_group_size: int = typer.Option(
+        65536, "--row-group-size", help="Rows per Parquet/Arrow row group."
+    ),
+    force: bool = typer.Option(
+        False, "--force", "-f", help="Overwrite existing file."
+    ),
+):
+    """
+    Export the whole course gradebook to a file.
+    """
+    from evaluer.cli.exporter import export_gradebook
+
+    console = ctx.obj["console"]
+    settings = get_settings()
+
+    if output.exists() and not force:
+        console.print(
+            f"[bold red]❌ Error:[/] File [cyan]'{output}'[/cyan] already exists. Use [yellow]--force[/yellow] to overwrite."
+        )
+        raise typer.Exit(1)
+
+    try:
+        hive_client = HiveClient(base_url=settings.hive.base_url)
+        hive_client.authenticate(
+            credentials=TokenObtainRequest(
+                username=settings.hive.username, password=settings.hive.password
+            )
+        )
+
+        with console.status(f"Exporting gradebook to [cyan]{output.name}[/cyan]..."):
+            row_count = asyncio.run(
+                export_gradebook(
+                    hive_client=hive_client,
+                    output=output,
+                    export_format=export_format,
+                    batch_size=batch_size,
+                    row_group_size=row_group_size,
+                )
+            )
+
+        console.print(
+            f"[bold green]✅ Exported {row_count} grades to: [cyan]{output}[/cyan][/bold green]"
+        )
+
+    except Exception as e:
+        console.print(f"[bold red]❌ An unexpected error occurred:[/] {e}")
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def partitions(
+    ctx: typer.Context,
+    months_ahead: int = typer.Option(
+        None, "--months-ahead", help="Months of grade history partitions to create."
+    ),
+):
+    """
+    Create missing grade table partitions and report their sizes.
+    """
+    from evaluer.cli.partitions import maintain_partitions
+
+    console = ctx.obj["console"]
+    settings = get_settings()
+
+    try:
+        created, existing = asyncio.run(
+            maintain_partitions(
+                hash_partitions=settings.database.grade_hash_partitions,
+                months_ahead=(
+                    months_ahead
+                    if months_ahead is not None
+                    else settings.database.history_months_ahead
+                ),
+            )
+        )
+    except Exception as e:
+        console.print(f"[bold red]❌ An unexpected error occurred:[/] {e}")
+        raise typer.Exit(code=1)
+
+    for partition in existing:
+        console.print(
+            f"[cyan]{partition.name}[/cyan] {partition.bound} "
+            f"({partition.size_bytes // 1024} KiB)"
+        )
+    console.print(f"[bold green]✅ Created {len(created)} partitions.[/bold green]")
+
+
+@app.command()
+def archive(
+    ctx: typer.Context,
+    before: datetime = typer.Option(
+        ...,
+        "--before",
+        formats=["%Y-%m-%d"],
+        help="Archive grade history partitions that end on or before this date.",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="List the partitions without detaching them."
+    ),
+):
+    """
+    Detach finished months of grade history into the archive schema.
+    """
+    from evaluer.cli.partitions import archive_history
+
+    console = ctx.obj["console"]
+    settings = get_settings()
+    schema = settings.database.archive_schema
+
+    try:
+        archived = asyncio.run(archive_history(before.date(), schema, dry_run))
+    except Exception as e:
+        console.print(f"[bold red]❌ An unexpected error occurred:[/] {e}")
+        raise typer.Exit(code=1)
+
+    for name, size_bytes in archived:
+        console.print(f"[cyan]{name}[/cyan] ({size_bytes // 1024} KiB)")
+    action = "Would archive" if dry_run else f"Archived into '{schema}'"
+    console.print(
+        f"[bold green]✅ {action}: {len(archived)} partitions.[/bold green]"
+    )
+
+
+@app.command()
+def aggregates(ctx: typer.Context):
+    """
+    Recompute the grade statistics aggregates from the grade tables.
+    """
+    from evaluer.cli.aggregates import rebuild_aggregates
+
+    console = ctx.obj["console"]
+    settings = get_settings()
+
+    try:
+        rebuilt = asyncio.run(rebuild_aggregates(settings.grading.aggregate_shards))
+    except Exception as e:
+        console.print(f"[bold red]❌ An unexpected error occurred:[/] {e}")
+        raise typer.Exit(code=1)
+
+    for level, rows in rebuilt:
+        console.print(f"[cyan]{level.value}[/cyan] {rows} aggregate rows")
+    console.print("[bold green]✅ Rebuilt grade aggregates.[/bold green]")
+
+
+@app.command()
+def recalculate(ctx: typer.Context):
+    """
+    Re-run the grade recalculations of weights versions that never finished.
+    """
+    from evaluer.cli.weights import recalculate_pending_weights
+
+    console = ctx.obj["console"]
+    settings = get_settings()
+
+    if settings.grading.weights_source != "database":
+        console.print(
+            "[bold red]❌ Error:[/] Weights are managed by the weights file, "
+            "there are no stored versions to recalculate."
+        )
+        raise typer.Exit(1)
+
+    try:
+        with console.status("Recalculating grades for pending weights..."):
+            changes = asyncio.run(recalculate_pending_weights())
+    except Exception as e:
+        console.print(f"[bold red]❌ An unexpected error occurred:[/] {e}")
+        raise typer.Exit(code=1)
+
+    if not changes:
+        console.print("[bold green]✅ No pending weight recalculations.[/bold green]")
+        return
+    console.print(
+        f"[bold green]✅ Recalculated modules {sorted(changes.module_ids)}, "
+        f"subjects {sorted(changes.subject_ids)}, "
+        f"overall={changes.subjects_changed}.[/bold green]"
+    )
+
+
+@app.command()
+def sync(
+    ctx: typer.Context,
+    student_id: int = typer.Option(
+        None, "--student-id", help="Only sync the assignments of this student."
+    ),
+    full: bool = typer.Option(
+        False, "--full", help="Re-read every response instead of only new ones."
+    ),
+):
+    """
+    Apply auto grades for assignments with new Hive responses.
+    """
+    from evaluer.cli.sync import sync_auto_grades
+
+    console = ctx.obj["console"]
+    settings = get_settings()
+
+    try:
+        hive_client = HiveClient(base_url=settings.hive.base_url)
+        hive_client.authenticate(
+            credentials=TokenObtainRequest(
+                username=settings.hive.username, password=settings.hive.password
+            )
+        )
+
+        with console.status("Syncing auto grades from Hive..."):
+            report = asyncio.run(
+                sync_auto_grades(
+                    hive_client=hive_client, student_id=student_id, full=full
+                )
+            )
+    except Exception as e:
+        console.print(f"[bold red]❌ An unexpected error occurred:[/] {e}")
+        raise typer.Exit(code=1)
+
+    console.print(
+        f"[bold green]✅ Synced {report.changed} of {report.assignments} "
+        f"assignments ({report.responses} new responses).[/bold green]"
+    )
+
+
+@app.command()
+def hook(
+    ctx: typer.Context,
+    event: HiveEventType = typer.Argument(..., help="Hive event type to send."),
+    student_id: int = typer.Option(..., "--student-id", help="Student of the event."),
+    assignment_id: int = typer.Option(
+        ..., "--assignment-id", help="Assignment of the event."
+    ),
+    url: str = typer.Option(
+        "http://localhost:8080/hooks/hive", "--url", help="Webhook endpoint URL."
+    ),
+):
+    """
+    Post a signed Hive event to a running Evaluer API.
+    """
+    from evaluer.cli.hooks import post_hive_event
+
+    console = ctx.obj["console"]
+    settings = get_settings()
+
+    if not settings.hive.webhook_secret:
+        console.print(
+            "[bold red]❌ Error:[/] Set [yellow]HIVE__WEBHOOK_SECRET[/yellow] to sign events."
+        )
+        raise typer.Exit(1)
+
+    try:
+        response = post_hive_event(
+            url=url,
+            secret=settings.hive.webhook_secret,
+            event=event,
+            student_id=student_id,
+            assignment_id=assignment_id,
+        )
+    except Exception as e:
+        console.print(f"[bold red]❌ An unexpected error occurred:[/] {e}")
+        raise typer.Exit(code=1)
+
+    console.print(f"[bold green]✅ {response.status_code}[/bold green] {response.text}")
+
+
 def run():
     app()
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from evaluer.common.clients.hive import HiveClient
+from evaluer.common.database.session import (
+    AsyncSessionLocal,
+    ReplicaSessionLocal,
+    dispose_engines,
+)
+from evaluer.common.repositories.grading import (
+    AssignmentGradeRepository,
+    ModuleGradeRepository,
+    OverallGradeRepository,
+    ResponseGradeRepository,
+    SubjectGradeRepository,
+)
+from evaluer.common.services.export import (
+    CourseNameIndex,
+    ExportFormat,
+    GradebookExporter,
+    create_gradebook_encoder,
+)
+
+
+async def export_gradebook(
+    hive_client: HiveClient,
+    output: Path,
+    export_format: ExportFormat,
+    batch_size: int,
+    row_group_size: int,
+) -> int:
+    course_names = CourseNameIndex.from_hive(hive_client)
+    encoder = create_gradebook_encoder(export_format, row_group_size)
+    row_count = 0
+
+    try:
+        async with (ReplicaSessionLocal or AsyncSessionLocal)() as db:
+            exporter = GradebookExporter(
+                repositories=(
+                    OverallGradeRepository(db),
+                    SubjectGradeRepository(db),
+                    ModuleGradeRepository(db),
+                    AssignmentGradeRepository(db),
+                    ResponseGradeRepository(db),
+                ),
+                course_names=course_names,
+                batch_size=batch_size,
+            )
+            with output.open("wb") as file:
+                file.write(encoder.begin())
+                async for rows in exporter.iter_rows():
+                    file.write(encoder.encode(rows))
+                    row_count += len(rows)
+                file.write(encoder.finish())
+    finally:
+        await dispose_engines()
+
+    return row_count
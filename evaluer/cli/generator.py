@@ -17,6 +17,7 @@ from rich.text import Text
 
 from evaluer.common.models.hive import BaseCourseComponent
 from evaluer.common.clients.hive import HiveClient
+from evaluer.common.services.weights import WeightsConfiguration
 
 
 GRADING_CONFIG_HEADER_COMMENT = """# Grading Configuration
@@ -163,6 +164,7 @@ class GradingConfigGenerator:
         output_path.write_text(
             GRADING_CONFIG_HEADER_COMMENT + yaml_str, encoding="utf-8"
         )
+        WeightsConfiguration.compile_snapshot(output_path)
 
         success_message = Text.from_markup(
             f"[bold green]✅ Configuration saved to: [cyan]{output_path}[/cyan][/bold green]\n\n"
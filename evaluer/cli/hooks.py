@@ -0,0 +1,27 @@
+import json
+
+import requests
+
+from evaluer.common.models.hive import HiveEventType
+from evaluer.common.services.hooks import sign_payload
+
+
+def post_hive_event(
+    url: str,
+    secret: str,
+    event: HiveEventType,
+    student_id: int,
+    assignment_id: int,
+) -> requests.Response:
+    body = json.dumps(
+        {"event": event.value, "assignment_id": assignment_id, "user_id": student_id}
+    ).encode()
+    return requests.post(
+        url,
+        data=body,
+        headers={
+            "Content-Type": "application/json",
+            "X-Hive-Signature": sign_payload(secret, body),
+        },
+        timeout=10,
+    )
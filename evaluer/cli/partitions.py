@@ -0,0 +1,53 @@
+from datetime import date, datetime, time, timezone
+from typing import List, Tuple
+
+from evaluer.common.database.partitions import (
+    HASH_PARTITIONED_TABLES,
+    MONTHLY_PARTITIONED_TABLES,
+    Partition,
+    archive_partitions,
+    ensure_partitions,
+    list_partitions,
+)
+from evaluer.common.database.session import AsyncSessionLocal, dispose_engines, engine
+from evaluer.common.repositories.history import GradeHistoryRepository
+from evaluer.common.services.history import GradeHistoryService
+
+
+async def maintain_partitions(
+    hash_partitions: int, months_ahead: int
+) -> Tuple[List[str], List[Partition]]:
+    try:
+        async with engine.begin() as connection:
+            created = await ensure_partitions(connection, hash_partitions, months_ahead)
+            partitions = []
+            for table in (*HASH_PARTITIONED_TABLES, *MONTHLY_PARTITIONED_TABLES):
+                partitions += await list_partitions(connection, table)
+    finally:
+        await dispose_engines()
+    return created, partitions
+
+
+async def archive_history(
+    before: date, schema: str, dry_run: bool
+) -> List[Tuple[str, int]]:
+    cutoff = datetime.combine(before, time.min, tzinfo=timezone.utc)
+    try:
+        async with engine.connect() as connection:
+            archived = await archive_partitions(connection, before, schema, dry_run=True)
+        if dry_run or not archived:
+            return archived
+
+        async with AsyncSessionLocal() as db:
+            history_repository = GradeHistoryRepository(db)
+            history = GradeHistoryService(history_repository)
+            for student_id in await history_repository.get_student_ids_with_changes(
+                cutoff
+            ):
+                await history.snapshot_as_of(student_id, cutoff)
+            await db.commit()
+
+        async with engine.begin() as connection:
+            return await archive_partitions(connection, before, schema)
+    finally:
+        await dispose_engines()
@@ -0,0 +1,59 @@
+from typing import Optional
+
+from evaluer.common.clients.hive import HiveClient
+from evaluer.common.database.session import AsyncSessionLocal, dispose_engines
+from evaluer.common.repositories.history import GradeHistoryRepository
+from evaluer.common.repositories.responses import HiveResponseRepository
+from evaluer.common.repositories.sync import AssignmentSyncStateRepository
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.course import CourseHierarchyResolver
+from evaluer.common.services.grades import GradeService
+from evaluer.common.services.history import GradeHistoryService
+from evaluer.common.services.sync import AutoGradeSync, SyncReport
+from evaluer.common.services.weights import WeightsRegistry
+from evaluer.common.services.weights_store import DatabaseWeightsStore
+from evaluer.common.settings import get_settings
+
+
+async def sync_auto_grades(
+    hive_client: HiveClient, student_id: Optional[int], full: bool
+) -> SyncReport:
+    settings = get_settings()
+    grading_calculator = GradingCalculator(base_score=10.0, minimum_score=2.0)
+
+    try:
+        if settings.grading.weights_source == "database":
+            weight_provider = await DatabaseWeightsStore(
+                registry=WeightsRegistry(config_path=None),
+                session_factory=AsyncSessionLocal,
+                grading_calculator=grading_calculator,
+                seed_config_path=settings.grading.weights_config_path,
+            ).load_latest()
+        else:
+            weight_provider = WeightsRegistry(
+                config_path=settings.grading.weights_config_path
+            ).get_provider()
+
+        async with AsyncSessionLocal() as db:
+            grade_service = GradeService.create(
+                db=db,
+                weight_provider=weight_provider,
+                grading_calculator=grading_calculator,
+                grade_history=GradeHistoryService(
+                    GradeHistoryRepository(db),
+                    settings.grading.history_snapshot_interval,
+                ),
+                course_hierarchy=CourseHierarchyResolver(
+                    settings.hive.course_refresh_seconds
+                ),
+            )
+            auto_grade_sync = AutoGradeSync(
+                grade_service,
+                AssignmentSyncStateRepository(db),
+                HiveResponseRepository(db),
+            )
+            return await auto_grade_sync.run(
+                hive_client, student_id=student_id, full=full
+            )
+    finally:
+        await dispose_engines()
@@ -0,0 +1,18 @@
+from evaluer.common.database.session import AsyncSessionLocal, dispose_engines
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.weights import WeightChanges, WeightsRegistry
+from evaluer.common.services.weights_store import DatabaseWeightsStore
+from evaluer.common.settings import get_settings
+
+
+async def recalculate_pending_weights() -> WeightChanges:
+    settings = get_settings()
+    try:
+        return await DatabaseWeightsStore(
+            registry=WeightsRegistry(config_path=None),
+            session_factory=AsyncSessionLocal,
+            grading_calculator=GradingCalculator(),
+            history_snapshot_interval=settings.grading.history_snapshot_interval,
+        ).recalculate_pending()
+    finally:
+        await dispose_engines()
@@ -2,7 +2,8 @@ import base64
 import io
 import mimetypes
 import zipfile
-from typing import Any, Dict, List, Literal, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Literal, NamedTuple, Optional, Tuple
 
 import urllib3
 
@@ -11,6 +12,7 @@ from evaluer.common.models.hive import (
     Assignment,
     AssignmentResponse,
     AssignmentResponseFiles,
+    AssignmentResponseType,
     ClearanceLevel,
     CourseUser,
     Exercise,
@@ -42,6 +44,41 @@ class HiveAuthenticationStrategy(AuthenticationStrategy[TokenObtainResponse]):
         return f"Bearer {token.access}"
 
 
+class ResponseFilters(NamedTuple):
+    user_id: Optional[int] = None
+    response_types: Tuple[AssignmentResponseType, ...] = ()
+    since: Optional[datetime] = None
+
+    def __bool__(self) -> bool:
+        return (
+            self.user_id is not None
+            or bool(self.response_types)
+            or self.since is not None
+        )
+
+    def to_params(self) -> Dict[str, Any]:
+        params: Dict[str, Any] = {}
+        if self.user_id is not None:
+            params["user__id"] = self.user_id
+        if self.response_types:
+            params["response_type__in"] = ",".join(
+                response_type.value for response_type in self.response_types
+            )
+        if self.since is not None:
+            params["date__gte"] = self.since.isoformat()
+        return params
+
+    def matches(self, response: AssignmentResponse) -> bool:
+        return (
+            (self.user_id is None or response.user == self.user_id)
+            and (
+                not self.response_types
+                or response.response_type in self.response_types
+            )
+            and (self.since is None or response.date >= self.since)
+        )
+
+
 HiveResourceType = Literal[
     "user", "assignment", "assignment_response", "exercise", "module", "subject"
 ]
@@ -71,6 +108,8 @@ class HiveClient(BaseAPIClient[TokenObtainResponse]):
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         auth_strategy = auth_strategy
         super().__init__(base_url, auth_strategy)
+        self._responses_by_user: Dict[int, Dict[int, List[AssignmentResponse]]] = {}
+        self._response_filters_supported: Optional[bool] = None
 
     def get_subjects(self) -> List[Subject]:
         response = self._make_request(method="GET", endpoint=self.SUBJECTS_ENDPOINT)
@@ -147,11 +186,39 @@ class HiveClient(BaseAPIClient[TokenObtainResponse]):
         assignments_data = response.json()
         return Assignment(**assignments_data[0]) if assignments_data else None
 
-    def get_assignment_responses(self, assignment_id: int) -> List[AssignmentResponse]:
+    def get_assignment_responses(
+        self,
+        assignment_id: int,
+        user_id: Optional[int] = None,
+        response_types: Tuple[AssignmentResponseType, ...] = (),
+        since: Optional[datetime] = None,
+    ) -> List[AssignmentResponse]:
+        filters = ResponseFilters(
+            user_id=user_id, response_types=tuple(response_types), since=since
+        )
+        if not filters:
+            return self._fetch_assignment_responses(assignment_id)
+
+        if self._response_filters_supported is False:
+            return self._filter_locally(assignment_id, filters)
+
+        responses = self._fetch_assignment_responses(
+            assignment_id, filters.to_params()
+        )
+        matching = [response for response in responses if filters.matches(response)]
+        if len(matching) < len(responses):
+            self._response_filters_supported = False
+        elif matching:
+            self._response_filters_supported = True
+        return matching
+
+    def _fetch_assignment_responses(
+        self, assignment_id: int, params: Optional[Dict[str, Any]] = None
+    ) -> List[AssignmentResponse]:
         endpoint = self.ASSIGNMENT_RESPONSES_ENDPOINT.format(
             assignment_id=assignment_id
         )
-        response = self._make_request(method="GET", endpoint=endpoint)
+        response = self._make_request(method="GET", endpoint=endpoint, params=params)
         response.raise_for_status()
         responses_data = response.json()
         responses = []
@@ -160,14 +227,37 @@ class HiveClient(BaseAPIClient[TokenObtainResponse]):
             responses.append(AssignmentResponse(**response_data))
         return responses
 
-    def get_assignments(self) -> List[Assignment]:
+    def _filter_locally(
+        self, assignment_id: int, filters: ResponseFilters
+    ) -> List[AssignmentResponse]:
+        responses_by_user = self._responses_by_user.get(assignment_id)
+        if responses_by_user is None:
+            responses_by_user = self._responses_by_user[assignment_id] = {}
+            for response in self._fetch_assignment_responses(assignment_id):
+                responses_by_user.setdefault(response.user, []).append(response)
+
+        if filters.user_id is not None:
+            candidates = responses_by_user.get(filters.user_id, [])
+        else:
+            candidates = [
+                response
+                for responses in responses_by_user.values()
+                for response in responses
+            ]
+        return [response for response in candidates if filters.matches(response)]
+
+    def get_assignments(self, user_id: Optional[int] = None) -> List[Assignment]:
+        params = {"user__id__in": user_id} if user_id is not None else None
         response = self._make_request(
             method="GET",
             endpoint=self.ASSIGNMENTS_ENDPOINT,
+            params=params,
         )
         response.raise_for_status()
-        assignments_data = response.json()
-        return [Assignment(**assignment) for assignment in assignments_data]
+        assignments = [Assignment(**assignment) for assignment in response.json()]
+        if user_id is None:
+            return assignments
+        return [assignment for assignment in assignments if assignment.user == user_id]
 
     def get_assignment_response(
         self, assignment_id: int, response_id: int
@@ -0,0 +1,29 @@
+from typing import Union
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+STUDENT_LOCK_NAMESPACE = 0x65760001
+SCHEMA_LOCK_NAMESPACE = 0x65760002
+WEIGHTS_LOCK_NAMESPACE = 0x65760003
+
+_ADVISORY_LOCK_STATEMENT = text("SELECT pg_advisory_xact_lock(:namespace, :key)")
+
+
+async def lock_student(db: AsyncSession, student_id: int) -> None:
+    await db.execute(
+        _ADVISORY_LOCK_STATEMENT,
+        {"namespace": STUDENT_LOCK_NAMESPACE, "key": student_id},
+    )
+
+
+async def lock_schema(connection: Union[AsyncConnection, AsyncSession]) -> None:
+    await connection.execute(
+        _ADVISORY_LOCK_STATEMENT, {"namespace": SCHEMA_LOCK_NAMESPACE, "key": 0}
+    )
+
+
+async def lock_weights(db: AsyncSession) -> None:
+    await db.execute(
+        _ADVISORY_LOCK_STATEMENT, {"namespace": WEIGHTS_LOCK_NAMESPACE, "key": 0}
+    )
@@ -1,6 +1,17 @@
-from sqlalchemy import Column, Float, Integer, DateTime, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 Base = declarative_base()
 
@@ -11,13 +22,35 @@ class ResponseGrade(Base):
         UniqueConstraint(
             "response_id", "student_id", name="uq_response_grades_response_student"
         ),
+        Index("ix_response_grades_student_id_id", "student_id", "id"),
+        Index(
+            "ix_response_grades_assignment_id_student_id_id",
+            "assignment_id",
+            "student_id",
+            "id",
+        ),
+        Index(
+            "ix_response_grades_student_assignment_response_covering",
+            "student_id",
+            "assignment_id",
+            "response_id",
+            postgresql_include=["grade"],
+        ),
+        Index(
+            "ix_response_grades_response_grade_student",
+            "response_id",
+            "grade",
+            "student_id",
+        ),
+        {"postgresql_partition_by": "HASH (student_id)"},
     )
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     response_id = Column(Integer, nullable=False, index=True)
     assignment_id = Column(Integer, nullable=False, index=True)
-    student_id = Column(Integer, nullable=False, index=True)
+    student_id = Column(Integer, primary_key=True, index=True)
     grade = Column(Float, nullable=False)
+    ordinal = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -30,13 +63,42 @@ class AssignmentGrade(Base):
             "student_id",
             name="uq_assignment_grades_assignment_student",
         ),
+        Index("ix_assignment_grades_student_id_id", "student_id", "id"),
+        Index(
+            "ix_assignment_grades_module_id_student_id_id",
+            "module_id",
+            "student_id",
+            "id",
+        ),
+        Index(
+            "ix_assignment_grades_student_module_assignment_covering",
+            "student_id",
+            "module_id",
+            "assignment_id",
+            postgresql_include=["grade"],
+        ),
+        Index(
+            "ix_assignment_grades_student_assignment_covering",
+            "student_id",
+            "assignment_id",
+            postgresql_include=["grade"],
+        ),
+        Index(
+            "ix_assignment_grades_assignment_grade_student",
+            "assignment_id",
+            "grade",
+            "student_id",
+        ),
+        {"postgresql_partition_by": "HASH (student_id)"},
     )
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     assignment_id = Column(Integer, nullable=False, index=True)
     module_id = Column(Integer, nullable=False, index=True)
-    student_id = Column(Integer, nullable=False, index=True)
+    student_id = Column(Integer, primary_key=True, index=True)
     grade = Column(Float, nullable=False)
+    penalized_sum = Column(Float, nullable=True)
+    response_count = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -47,12 +109,36 @@ class ModuleGrade(Base):
         UniqueConstraint(
             "module_id", "student_id", name="uq_module_grades_module_student"
         ),
+        Index("ix_module_grades_student_id_id", "student_id", "id"),
+        Index(
+            "ix_module_grades_subject_id_student_id_id",
+            "subject_id",
+            "student_id",
+            "id",
+        ),
+        Index(
+            "ix_module_grades_student_subject_module_covering",
+            "student_id",
+            "subject_id",
+            "module_id",
+            postgresql_include=["grade"],
+        ),
+        Index(
+            "ix_module_grades_student_module_covering",
+            "student_id",
+            "module_id",
+            postgresql_include=["grade"],
+        ),
+        Index(
+            "ix_module_grades_module_grade_student", "module_id", "grade", "student_id"
+        ),
+        {"postgresql_partition_by": "HASH (student_id)"},
     )
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     module_id = Column(Integer, nullable=False, index=True)
     subject_id = Column(Integer, nullable=False, index=True)
-    student_id = Column(Integer, nullable=False, index=True)
+    student_id = Column(Integer, primary_key=True, index=True)
     grade = Column(Float, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -64,11 +150,25 @@ class SubjectGrade(Base):
         UniqueConstraint(
             "subject_id", "student_id", name="uq_subject_grades_subject_student"
         ),
+        Index("ix_subject_grades_student_id_id", "student_id", "id"),
+        Index(
+            "ix_subject_grades_student_subject_covering",
+            "student_id",
+            "subject_id",
+            postgresql_include=["grade"],
+        ),
+        Index(
+            "ix_subject_grades_subject_grade_student",
+            "subject_id",
+            "grade",
+            "student_id",
+        ),
+        {"postgresql_partition_by": "HASH (student_id)"},
     )
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     subject_id = Column(Integer, nullable=False, index=True)
-    student_id = Column(Integer, nullable=False, index=True)
+    student_id = Column(Integer, primary_key=True, index=True)
     grade = Column(Float, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -76,10 +176,186 @@ class SubjectGrade(Base):
 
 class OverallGrade(Base):
     __tablename__ = "overall_grades"
-    __table_args__ = (UniqueConstraint("student_id", name="uq_overall_grades_student"),)
+    __table_args__ = (
+        UniqueConstraint("student_id", name="uq_overall_grades_student"),
+        Index(
+            "ix_overall_grades_student_covering",
+            "student_id",
+            postgresql_include=["grade"],
+        ),
+        Index("ix_overall_grades_grade_student", "grade", "student_id"),
+        {"postgresql_partition_by": "HASH (student_id)"},
+    )
 
-    id = Column(Integer, primary_key=True)
-    student_id = Column(Integer, nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    student_id = Column(Integer, primary_key=True, index=True)
     grade = Column(Float, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class GradeChangeEntry(Base):
+    __tablename__ = "grade_changes"
+    __table_args__ = (
+        Index(
+            "ix_grade_changes_student_id_id",
+            "student_id",
+            "id",
+            postgresql_include=["level", "item_id", "grade", "changed_at"],
+        ),
+        {"postgresql_partition_by": "RANGE (changed_at)"},
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    level = Column(String(16), nullable=False)
+    student_id = Column(Integer, nullable=False)
+    item_id = Column(Integer, nullable=True)
+    grade = Column(Float, nullable=False)
+    changed_at = Column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
+
+
+class GradeSnapshot(Base):
+    __tablename__ = "grade_snapshots"
+    __table_args__ = (
+        Index(
+            "ix_grade_snapshots_student_id_taken_at",
+            "student_id",
+            "taken_at",
+            postgresql_include=["change_id"],
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    student_id = Column(Integer, nullable=False)
+    change_id = Column(BigInteger, nullable=False)
+    taken_at = Column(DateTime(timezone=True), nullable=False)
+    grades = Column(JSONB, nullable=False)
+
+
+class GradeAggregate(Base):
+    __tablename__ = "grade_aggregates"
+
+    level = Column(String(16), primary_key=True)
+    item_id = Column(Integer, primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    count = Column(BigInteger, nullable=False)
+    total = Column(Float, nullable=False)
+    total_squares = Column(Float, nullable=False)
+    histogram = Column(ARRAY(Integer), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class AssignmentSyncState(Base):
+    __tablename__ = "assignment_sync_states"
+
+    assignment_id = Column(Integer, primary_key=True)
+    student_id = Column(Integer, nullable=False, index=True)
+    check_count = Column(Integer, nullable=False)
+    redo_count = Column(Integer, nullable=False)
+    done_count = Column(Integer, nullable=False)
+    last_response_at = Column(DateTime(timezone=True), nullable=True)
+    synced_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class HiveResponse(Base):
+    __tablename__ = "hive_responses"
+    __table_args__ = (
+        Index(
+            "ix_hive_responses_pending_submitted",
+            "submitted_at",
+            "response_id",
+            postgresql_where=text("response_type = 'Redo' AND graded_at IS NULL"),
+        ),
+        Index(
+            "ix_hive_responses_pending_module_submitted",
+            "module_id",
+            "submitted_at",
+            "response_id",
+            postgresql_where=text("response_type = 'Redo' AND graded_at IS NULL"),
+        ),
+        Index(
+            "ix_hive_responses_pending_subject_submitted",
+            "subject_id",
+            "submitted_at",
+            "response_id",
+            postgresql_where=text("response_type = 'Redo' AND graded_at IS NULL"),
+        ),
+    )
+
+    response_id = Column(Integer, primary_key=True)
+    assignment_id = Column(Integer, nullable=False)
+    student_id = Column(Integer, nullable=False)
+    module_id = Column(Integer, nullable=False)
+    subject_id = Column(Integer, nullable=False)
+    response_type = Column(String(32), nullable=False)
+    submitted_at = Column(DateTime(timezone=True), nullable=False)
+    graded_at = Column(DateTime(timezone=True), nullable=True)
+    mirrored_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class WeightsVersion(Base):
+    __tablename__ = "weights_versions"
+
+    id = Column(Integer, primary_key=True)
+    description = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    recalculated_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class SubjectWeight(Base):
+    __tablename__ = "subject_weights"
+    __table_args__ = (
+        UniqueConstraint(
+            "version_id", "subject_id", name="uq_subject_weights_version_subject"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    version_id = Column(
+        Integer, ForeignKey("weights_versions.id", ondelete="CASCADE"), nullable=False
+    )
+    subject_id = Column(Integer, nullable=False)
+    name = Column(String, nullable=False)
+    weight = Column(Float, nullable=False)
+
+
+class ModuleWeight(Base):
+    __tablename__ = "module_weights"
+    __table_args__ = (
+        UniqueConstraint(
+            "version_id", "module_id", name="uq_module_weights_version_module"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    version_id = Column(
+        Integer, ForeignKey("weights_versions.id", ondelete="CASCADE"), nullable=False
+    )
+    module_id = Column(Integer, nullable=False)
+    subject_id = Column(Integer, nullable=False)
+    name = Column(String, nullable=False)
+    weight = Column(Float, nullable=False)
+
+
+class ExerciseWeight(Base):
+    __tablename__ = "exercise_weights"
+    __table_args__ = (
+        UniqueConstraint(
+            "version_id", "exercise_id", name="uq_exercise_weights_version_exercise"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    version_id = Column(
+        Integer, ForeignKey("weights_versions.id", ondelete="CASCADE"), nullable=False
+    )
+    exercise_id = Column(Integer, nullable=False)
+    module_id = Column(Integer, nullable=False)
+    name = Column(String, nullable=False)
+    weight = Column(Float, nullable=False)
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+import asyncpg
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from evaluer.common.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+NotificationHandler = Callable[[str], Awaitable[None]]
+ReconnectHandler = Callable[[], Awaitable[None]]
+
+
+async def notify(db: AsyncSession, channel: str, payload: str) -> None:
+    await db.execute(select(func.pg_notify(channel, payload)))
+
+
+async def notify_many(db: AsyncSession, channel: str, payloads: Sequence[str]) -> None:
+    if len(payloads) == 1:
+        await notify(db, channel, payloads[0])
+    elif payloads:
+        await db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            [{"channel": channel, "payload": payload} for payload in payloads],
+        )
+
+
+class PostgresNotificationListener:
+    def __init__(self, database_url: str, reconnect_delay: float = 1.0):
+        self._dsn = (
+            make_url(database_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self._reconnect_delay = reconnect_delay
+        self._handlers: Dict[str, List[NotificationHandler]] = defaultdict(list)
+        self._reconnect_handlers: List[ReconnectHandler] = []
+        self._connection: Optional[asyncpg.Connection] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._handler_tasks: Set[asyncio.Task] = set()
+        self._stopped = False
+
+    def subscribe(self, channel: str, handler: NotificationHandler) -> None:
+        if self._connection is not None:
+            raise RuntimeError("Subscriptions must be registered before start()")
+        self._handlers[channel].append(handler)
+
+    def on_reconnect(self, handler: ReconnectHandler) -> None:
+        self._reconnect_handlers.append(handler)
+
+    async def start(self) -> None:
+        self._stopped = False
+        await self._connect()
+
+    async def stop(self) -> None:
+        self._stopped = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        if self._connection and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    async def _connect(self) -> None:
+        connection = await asyncpg.connect(self._dsn)
+        connection.add_termination_listener(self._on_termination)
+        for channel in self._handlers:
+            await connection.add_listener(channel, self._on_notification)
+        self._connection = connection
+
+    def _on_notification(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        for handler in self._handlers.get(channel, ()):
+            self._run_handler(handler(payload))
+
+    def _run_handler(self, handler_call: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(handler_call)
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._on_handler_done)
+
+    def _on_handler_done(self, task: asyncio.Task) -> None:
+        self._handler_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(
+                "Notification handler failed", exc_info=task.exception()
+            )
+
+    def _on_termination(self, connection: asyncpg.Connection) -> None:
+        if self._stopped:
+            return
+        logger.warning("Notification connection lost, reconnecting")
+        self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while not self._stopped:
+            await asyncio.sleep(self._reconnect_delay)
+            try:
+                await self._connect()
+            except (OSError, asyncpg.PostgresError):
+                logger.warning("Notification reconnect failed, retrying")
+                continue
+
+            for handler in self._reconnect_handlers:
+                self._run_handler(handler())
+            return
+
+
+@lru_cache
+def get_notification_listener() -> PostgresNotificationListener:
+    return PostgresNotificationListener(get_settings().database.url)
@@ -0,0 +1,297 @@
+import asyncio
+import logging
+import re
+from datetime import date
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from evaluer.common.database.locks import lock_schema
+
+logger = logging.getLogger(__name__)
+
+HASH_PARTITIONED_TABLES = (
+    "response_grades",
+    "assignment_grades",
+    "module_grades",
+    "subject_grades",
+    "overall_grades",
+)
+MONTHLY_PARTITIONED_TABLES = ("grade_changes",)
+MONTHLY_PARTITION_KEYS = {"grade_changes": "changed_at"}
+PARTITION_NAME_PATTERN = re.compile(r"(?P<table>\w+?)_(p\d+|y\d{4}m\d{2}|default)")
+
+_PARTITIONS_QUERY = text(
+    """
+    SELECT child.relname AS name,
+           pg_get_expr(child.relpartbound, child.oid) AS bound,
+           pg_total_relation_size(child.oid) AS size_bytes
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :table
+    ORDER BY child.relname
+    """
+)
+
+
+class Partition(NamedTuple):
+    table: str
+    name: str
+    bound: str
+    size_bytes: int
+    range_end: Optional[date]
+
+
+def month_start(day: date, offset: int = 0) -> date:
+    month = day.year * 12 + day.month - 1 + offset
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def monthly_partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+def is_partition_name(name: str) -> bool:
+    match = PARTITION_NAME_PATTERN.fullmatch(name)
+    return match is not None and match.group("table") in (
+        *HASH_PARTITIONED_TABLES,
+        *MONTHLY_PARTITIONED_TABLES,
+    )
+
+
+def _range_end(bound: str) -> Optional[date]:
+    _, separator, upper = bound.partition(" TO ('")
+    if not separator:
+        return None
+    return date.fromisoformat(upper[:10])
+
+
+async def is_partitioned(connection: AsyncConnection, table: str) -> bool:
+    result = await connection.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table "
+            "JOIN pg_class ON pg_class.oid = pg_partitioned_table.partrelid "
+            "WHERE pg_class.relname = :table"
+        ),
+        {"table": table},
+    )
+    return result.scalar_one_or_none() is not None
+
+
+async def list_partitions(connection: AsyncConnection, table: str) -> List[Partition]:
+    result = await connection.execute(_PARTITIONS_QUERY, {"table": table})
+    return [
+        Partition(
+            table=table,
+            name=row.name,
+            bound=row.bound,
+            size_bytes=row.size_bytes,
+            range_end=_range_end(row.bound),
+        )
+        for row in result
+    ]
+
+
+async def create_hash_partitions(
+    connection: AsyncConnection, table: str, modulus: int
+) -> List[str]:
+    if not await is_partitioned(connection, table):
+        return []
+    if await list_partitions(connection, table):
+        return []
+    created = []
+    for remainder in range(modulus):
+        name = f"{table}_p{remainder}"
+        await connection.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def create_monthly_partitions(
+    connection: AsyncConnection, table: str, first_month: date, last_month: date
+) -> List[str]:
+    if not await is_partitioned(connection, table):
+        return []
+    existing = {partition.name for partition in await list_partitions(connection, table)}
+    default_name = f"{table}_default"
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        name = monthly_partition_name(table, month)
+        if name not in existing:
+            if default_name in existing and await _default_holds_month(
+                connection, table, month
+            ):
+                await _create_month_from_default(connection, table, month)
+            else:
+                await connection.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF {table} "
+                        f"{_month_bounds(month)}"
+                    )
+                )
+            created.append(name)
+        month = month_start(month, 1)
+    if default_name not in existing:
+        await connection.execute(
+            text(f"CREATE TABLE {default_name} PARTITION OF {table} DEFAULT")
+        )
+        created.append(default_name)
+    return created
+
+
+def _month_bounds(month: date) -> str:
+    return (
+        f"FOR VALUES FROM ('{month.isoformat()}') "
+        f"TO ('{month_start(month, 1).isoformat()}')"
+    )
+
+
+def _month_filter(table: str, month: date) -> str:
+    key = MONTHLY_PARTITION_KEYS[table]
+    return (
+        f"{key} >= '{month.isoformat()}' "
+        f"AND {key} < '{month_start(month, 1).isoformat()}'"
+    )
+
+
+async def _default_holds_month(
+    connection: AsyncConnection, table: str, month: date
+) -> bool:
+    result = await connection.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {table}_default "
+            f"WHERE {_month_filter(table, month)})"
+        )
+    )
+    return result.scalar_one()
+
+
+async def _create_month_from_default(
+    connection: AsyncConnection, table: str, month: date
+) -> None:
+    # Postgres refuses to attach a range that rows in the default partition
+    # already cover, so those rows move into the new month first.
+    name = monthly_partition_name(table, month)
+    default_name = f"{table}_default"
+    rows_filter = _month_filter(table, month)
+    await connection.execute(
+        text(f"ALTER TABLE {table} DETACH PARTITION {default_name}")
+    )
+    await connection.execute(
+        text(f"CREATE TABLE {name} PARTITION OF {table} {_month_bounds(month)}")
+    )
+    moved = await connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {default_name} WHERE {rows_filter} "
+            f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+        )
+    )
+    await connection.execute(
+        text(f"ALTER TABLE {table} ATTACH PARTITION {default_name} DEFAULT")
+    )
+    logger.warning(
+        "Moved %s rows of %s from %s into %s",
+        moved.rowcount,
+        table,
+        default_name,
+        name,
+    )
+
+
+async def ensure_partitions(
+    connection: AsyncConnection,
+    hash_partitions: int,
+    months_ahead: int,
+    today: Optional[date] = None,
+) -> List[str]:
+    today = today or date.today()
+    await lock_schema(connection)
+    created = []
+    for table in HASH_PARTITIONED_TABLES:
+        created += await create_hash_partitions(connection, table, hash_partitions)
+    for table in MONTHLY_PARTITIONED_TABLES:
+        created += await create_monthly_partitions(
+            connection,
+            table,
+            month_start(today),
+            month_start(today, months_ahead),
+        )
+    return created
+
+
+async def archive_partitions(
+    connection: AsyncConnection,
+    before: date,
+    schema: str,
+    dry_run: bool = False,
+) -> List[Tuple[str, int]]:
+    archived = []
+    if not dry_run:
+        await lock_schema(connection)
+        await connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+    for table in MONTHLY_PARTITIONED_TABLES:
+        for partition in await list_partitions(connection, table):
+            if partition.range_end is None or partition.range_end > before:
+                continue
+            if not dry_run:
+                await connection.execute(
+                    text(f"ALTER TABLE {table} DETACH PARTITION {partition.name}")
+                )
+                await connection.execute(
+                    text(f"ALTER TABLE {partition.name} SET SCHEMA {schema}")
+                )
+            archived.append((partition.name, partition.size_bytes))
+    return archived
+
+
+class PartitionMaintainer:
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        hash_partitions: int,
+        months_ahead: int,
+        check_interval: float = 3600.0,
+    ):
+        self._engine = engine
+        self._hash_partitions = hash_partitions
+        self._months_ahead = months_ahead
+        self._check_interval = check_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def ensure(self) -> List[str]:
+        async with self._engine.begin() as connection:
+            return await ensure_partitions(
+                connection, self._hash_partitions, self._months_ahead
+            )
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._check_interval)
+            try:
+                created = await self.ensure()
+            except Exception:
+                logger.exception("Failed to create upcoming partitions")
+                continue
+            if created:
+                logger.info("Created partitions %s", ", ".join(created))
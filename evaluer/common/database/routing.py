@@ -0,0 +1,39 @@
+import time
+from functools import lru_cache
+from typing import Dict, Iterable
+
+from evaluer.common.settings import get_settings
+
+
+class RecentWrites:
+    def __init__(self, window_seconds: float):
+        self._window_seconds = window_seconds
+        self._written_at: Dict[int, float] = {}
+        self._pruned_at = time.monotonic()
+
+    def record(self, student_ids: Iterable[int]) -> None:
+        now = time.monotonic()
+        for student_id in student_ids:
+            self._written_at[student_id] = now
+        if now - self._pruned_at >= self._window_seconds:
+            self._prune(now)
+
+    def is_recent(self, student_id: int) -> bool:
+        written_at = self._written_at.get(student_id)
+        return (
+            written_at is not None
+            and time.monotonic() - written_at < self._window_seconds
+        )
+
+    def _prune(self, now: float) -> None:
+        self._written_at = {
+            student_id: written_at
+            for student_id, written_at in self._written_at.items()
+            if now - written_at < self._window_seconds
+        }
+        self._pruned_at = now
+
+
+@lru_cache
+def get_recent_writes() -> RecentWrites:
+    return RecentWrites(get_settings().database.read_your_writes_seconds)
@@ -1,5 +1,5 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 from evaluer.common.settings import get_settings
 
@@ -10,7 +10,37 @@ AsyncSessionLocal = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+replica_engine = (
+    create_async_engine(
+        settings.database.replica_url,
+        echo=False,
+        pool_pre_ping=True,
+        execution_options={"postgresql_readonly": True},
+    )
+    if settings.database.replica_url
+    else None
+)
+ReplicaSessionLocal = (
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_replica_db_session() -> AsyncGenerator[Optional[AsyncSession], None]:
+    if ReplicaSessionLocal is None:
+        yield None
+        return
+    async with ReplicaSessionLocal() as session:
+        yield session
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
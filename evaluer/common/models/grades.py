@@ -0,0 +1,43 @@
+import json
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+
+class GradeLevel(str, Enum):
+    RESPONSE = "response"
+    ASSIGNMENT = "assignment"
+    MODULE = "module"
+    SUBJECT = "subject"
+    OVERALL = "overall"
+
+
+class GradeChange(NamedTuple):
+    level: GradeLevel
+    item_column: Optional[str]
+    rows: List[Dict[str, Any]]
+    changed_at: float
+
+    def to_payload(self, columns: Sequence[str]) -> str:
+        return json.dumps(
+            {
+                "level": self.level.value,
+                "item_column": self.item_column,
+                "columns": list(columns),
+                "rows": [[row[column] for column in columns] for row in self.rows],
+                "at": self.changed_at,
+            }
+        )
+
+    @classmethod
+    def from_payload(cls, payload: str) -> "GradeChange":
+        change = json.loads(payload)
+        columns = change["columns"]
+        return cls(
+            level=GradeLevel(change["level"]),
+            item_column=change["item_column"],
+            rows=[dict(zip(columns, values)) for values in change["rows"]],
+            changed_at=change["at"],
+        )
+
+    def item_id(self, row: Dict[str, Any]) -> Optional[int]:
+        return row[self.item_column] if self.item_column else None
@@ -37,6 +37,11 @@ class AssignmentResponseType(str, Enum):
     DONE = "Done"
 
 
+class HiveEventType(str, Enum):
+    RESPONSE_CREATED = "response.created"
+    ASSIGNMENT_STATUS_CHANGED = "assignment.status_changed"
+
+
 class ClearanceLevel(int, Enum):
     HANICH = 1
     CHECKER = 2
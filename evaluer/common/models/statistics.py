@@ -0,0 +1,62 @@
+import math
+from typing import List, NamedTuple, Optional, Sequence
+
+MAX_GRADE = 10.0
+HISTOGRAM_BUCKETS = 20
+BUCKET_WIDTH = MAX_GRADE / HISTOGRAM_BUCKETS
+
+
+def histogram_bucket(grade: float) -> int:
+    return min(max(int(grade / BUCKET_WIDTH), 0), HISTOGRAM_BUCKETS - 1)
+
+
+class GradeDistribution(NamedTuple):
+    count: int
+    total: float
+    total_squares: float
+    histogram: List[int]
+
+    @classmethod
+    def empty(cls) -> "GradeDistribution":
+        return cls(
+            count=0, total=0.0, total_squares=0.0, histogram=[0] * HISTOGRAM_BUCKETS
+        )
+
+    @classmethod
+    def combine(
+        cls, distributions: Sequence["GradeDistribution"]
+    ) -> "GradeDistribution":
+        histogram = [0] * HISTOGRAM_BUCKETS
+        for distribution in distributions:
+            for bucket, count in enumerate(distribution.histogram):
+                histogram[bucket] += count
+        return cls(
+            count=sum(distribution.count for distribution in distributions),
+            total=sum(distribution.total for distribution in distributions),
+            total_squares=sum(
+                distribution.total_squares for distribution in distributions
+            ),
+            histogram=histogram,
+        )
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count > 0 else None
+
+    @property
+    def stddev(self) -> Optional[float]:
+        mean = self.mean
+        if mean is None:
+            return None
+        return math.sqrt(max(self.total_squares / self.count - mean * mean, 0.0))
+
+    def percentile(self, percent: float) -> Optional[float]:
+        if self.count <= 0:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            if count > 0 and seen + count >= rank:
+                return (bucket + (rank - seen) / count) * BUCKET_WIDTH
+            seen += count
+        return MAX_GRADE
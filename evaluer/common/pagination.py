@@ -0,0 +1,21 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, Sequence, Tuple
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(
+    cursor: str, parsers: Sequence[Callable[[Any], Any]]
+) -> Tuple[Any, ...]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("Unexpected cursor shape")
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (binascii.Error, TypeError, ValueError) as error:
+        raise ValueError("Invalid pagination cursor") from error
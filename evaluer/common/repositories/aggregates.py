@@ -0,0 +1,161 @@
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from evaluer.common.database.models import GradeAggregate
+from evaluer.common.models.grades import GradeLevel
+from evaluer.common.models.statistics import (
+    BUCKET_WIDTH,
+    HISTOGRAM_BUCKETS,
+    GradeDistribution,
+    histogram_bucket,
+)
+
+AggregateKey = Tuple[str, int, int]
+
+_APPLY_STATEMENT = text(
+    """
+    INSERT INTO grade_aggregates
+        (level, item_id, shard, count, total, total_squares, histogram, updated_at)
+    VALUES
+        (:level, :item_id, :shard, :count, :total, :total_squares, :histogram, now())
+    ON CONFLICT (level, item_id, shard) DO UPDATE SET
+        count = grade_aggregates.count + EXCLUDED.count,
+        total = grade_aggregates.total + EXCLUDED.total,
+        total_squares = grade_aggregates.total_squares + EXCLUDED.total_squares,
+        histogram = (
+            SELECT array_agg(stored + delta ORDER BY position)
+            FROM unnest(grade_aggregates.histogram, EXCLUDED.histogram)
+                WITH ORDINALITY AS buckets(stored, delta, position)
+        ),
+        updated_at = now()
+    """
+)
+
+_REBUILD_STATEMENT = """
+    INSERT INTO grade_aggregates
+        (level, item_id, shard, count, total, total_squares, histogram, updated_at)
+    SELECT :level, item_id, shard, count, total, total_squares,
+           ARRAY(
+               SELECT coalesce((buckets ->> bucket::text)::int, 0)
+               FROM generate_series(0, {last_bucket}) AS bucket
+               ORDER BY bucket
+           ),
+           now()
+    FROM (
+        SELECT item_id, shard,
+               sum(count) AS count,
+               sum(total) AS total,
+               sum(total_squares) AS total_squares,
+               jsonb_object_agg(bucket, count) AS buckets
+        FROM (
+            SELECT {item_column} AS item_id,
+                   student_id % :shards AS shard,
+                   least(
+                       greatest(floor(grade / {bucket_width})::int, 0), {last_bucket}
+                   ) AS bucket,
+                   count(*) AS count,
+                   sum(grade) AS total,
+                   sum(grade * grade) AS total_squares
+            FROM {table}
+            GROUP BY 1, 2, 3
+        ) AS bucketed
+        GROUP BY item_id, shard
+    ) AS cells
+"""
+
+
+class GradeAggregateRepository:
+    def __init__(
+        self,
+        db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
+        shards: int = 16,
+    ) -> None:
+        self.db = db
+        self.read_db = read_db or db
+        self.shards = shards
+        self._pending: Dict[AggregateKey, GradeDistribution] = {}
+
+    def record(
+        self,
+        level: GradeLevel,
+        item_id: Optional[int],
+        student_id: int,
+        previous_grade: Optional[float],
+        grade: float,
+    ) -> None:
+        if previous_grade == grade:
+            return
+        key = (level.value, item_id or 0, student_id % self.shards)
+        delta = self._pending.get(key) or GradeDistribution.empty()
+        histogram = list(delta.histogram)
+        histogram[histogram_bucket(grade)] += 1
+        count = delta.count + 1
+        total = delta.total + grade
+        total_squares = delta.total_squares + grade * grade
+        if previous_grade is not None:
+            histogram[histogram_bucket(previous_grade)] -= 1
+            count -= 1
+            total -= previous_grade
+            total_squares -= previous_grade * previous_grade
+        self._pending[key] = GradeDistribution(
+            count=count, total=total, total_squares=total_squares, histogram=histogram
+        )
+
+    def discard(self) -> None:
+        self._pending = {}
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        rows = [
+            {
+                "level": level,
+                "item_id": item_id,
+                "shard": shard,
+                **self._pending[level, item_id, shard]._asdict(),
+            }
+            for level, item_id, shard in sorted(self._pending)
+        ]
+        self._pending = {}
+        await self.db.execute(_APPLY_STATEMENT, rows)
+
+    async def get_distribution(
+        self, level: GradeLevel, item_id: Optional[int] = None
+    ) -> GradeDistribution:
+        stmt = select(
+            GradeAggregate.count,
+            GradeAggregate.total,
+            GradeAggregate.total_squares,
+            GradeAggregate.histogram,
+        ).where(
+            GradeAggregate.level == level.value,
+            GradeAggregate.item_id == (item_id or 0),
+        )
+        result = await self.read_db.execute(stmt)
+        return GradeDistribution.combine(
+            [GradeDistribution(*row) for row in result.all()]
+        )
+
+    async def rebuild(
+        self, level: GradeLevel, table: str, item_column: Optional[str]
+    ) -> int:
+        await self.db.execute(text("LOCK TABLE grade_aggregates IN EXCLUSIVE MODE"))
+        await self.db.execute(
+            text("DELETE FROM grade_aggregates WHERE level = :level"),
+            {"level": level.value},
+        )
+        result = await self.db.execute(
+            text(
+                _REBUILD_STATEMENT.format(
+                    item_column=item_column or "0",
+                    table=table,
+                    bucket_width=BUCKET_WIDTH,
+                    last_bucket=HISTOGRAM_BUCKETS - 1,
+                )
+            ),
+            {"level": level.value, "shards": self.shards},
+        )
+        return result.rowcount
@@ -1,137 +1,829 @@
-from typing import List, Type, Union
-from sqlalchemy import select
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+from sqlalchemy import (
+    Executable,
+    Row,
+    Select,
+    bindparam,
+    func,
+    literal,
+    null,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 from evaluer.common.database.models import (
+    GradeChangeEntry,
     ResponseGrade,
     AssignmentGrade,
     ModuleGrade,
     SubjectGrade,
     OverallGrade,
 )
+from evaluer.common.database.notifications import notify_many
+from evaluer.common.database.routing import RecentWrites
+from evaluer.common.models.grades import GradeChange, GradeLevel
+from evaluer.common.repositories.aggregates import GradeAggregateRepository
+
+GRADE_CHANGES_CHANNEL = "grade_changes"
+
+
+@dataclass(frozen=True)
+class GradeListFilters:
+    equals: Dict[str, int] = field(default_factory=dict)
+    min_grade: Optional[float] = None
+    max_grade: Optional[float] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
 
 
 class GradingRepository:
+    level: GradeLevel
+    value_columns: Tuple[str, ...]
+    item_column: Optional[str] = None
+    running_total_columns: Tuple[str, ...] = ()
+    insert_batch_size = 5000
+    notify_batch_size = 100
+    copy_threshold = 20000
+    _statement_cache: Dict[Tuple[Any, ...], Executable] = {}
+
     def __init__(
         self,
         db: AsyncSession,
         model: Type[DeclarativeBase],
         conflict_columns: List[str],
+        read_db: Optional[AsyncSession] = None,
+        recent_writes: Optional[RecentWrites] = None,
+        aggregates: Optional[GradeAggregateRepository] = None,
     ) -> None:
         self.db = db
+        self.read_db = read_db or db
+        self.recent_writes = recent_writes
+        self.aggregates = aggregates
         self.model = model
         self.conflict_columns = conflict_columns
 
-    async def upsert(self, grade: float, **values: Union[int, str, float]) -> None:
-        stmt = (
-            insert(self.model)
-            .values(grade=grade, **values)
-            .on_conflict_do_update(
-                index_elements=self.conflict_columns,
-                set_={"grade": grade},
+    def reader_for(self, student_id: Optional[int] = None) -> AsyncSession:
+        if (
+            student_id is not None
+            and self.recent_writes is not None
+            and self.recent_writes.is_recent(student_id)
+        ):
+            return self.db
+        return self.read_db
+
+    def _record_writes(self, student_ids: Iterable[int]) -> None:
+        if self.recent_writes is not None:
+            self.recent_writes.record(student_ids)
+
+    async def _notify_changes(self, rows: Sequence[Dict[str, Any]]) -> None:
+        columns = [*self.value_columns, "grade"]
+        changed_at = time.time()
+        await notify_many(
+            self.db,
+            GRADE_CHANGES_CHANNEL,
+            [
+                GradeChange(
+                    level=self.level,
+                    item_column=self.item_column,
+                    rows=rows[start : start + self.notify_batch_size],
+                    changed_at=changed_at,
+                ).to_payload(columns)
+                for start in range(0, len(rows), self.notify_batch_size)
+            ],
+        )
+
+    def _cached_statement(
+        self, kind: str, columns: Tuple[str, ...], build: Callable[[], Executable]
+    ) -> Executable:
+        key = (self.model, kind, columns)
+        stmt = self._statement_cache.get(key)
+        if stmt is None:
+            stmt = self._statement_cache[key] = build()
+        return stmt
+
+    def _filtered_by(self, stmt: Select, columns: Tuple[str, ...]) -> Select:
+        for column in columns:
+            stmt = stmt.where(getattr(self.model, column) == bindparam(column))
+        return stmt
+
+    def _upsert_statement(self, extra_columns: Tuple[str, ...] = ()) -> Executable:
+        stmt = insert(self.model).values(
+            **{
+                column: bindparam(column)
+                for column in (*self.value_columns, *extra_columns)
+            },
+            grade=bindparam("grade"),
+            updated_at=func.now(),
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=self.conflict_columns,
+            set_={
+                "grade": stmt.excluded.grade,
+                **{
+                    column: null()
+                    for column in self.running_total_columns
+                    if column not in extra_columns
+                },
+                **{column: stmt.excluded[column] for column in extra_columns},
+                "updated_at": func.now(),
+            },
+        )
+
+    def _upsert_with_history_statement(
+        self, extra_columns: Tuple[str, ...] = ()
+    ) -> Executable:
+        previous = self._filtered_by(
+            select(self.model.grade), tuple(self.conflict_columns)
+        ).cte("previous")
+        upserted = (
+            self._upsert_statement(extra_columns)
+            .returning(*(getattr(self.model, column) for column in self.value_columns))
+            .returning(self.model.grade)
+            .cte("upserted")
+        )
+        item_id = upserted.c[self.item_column] if self.item_column else null()
+        history = (
+            insert(GradeChangeEntry.__table__)
+            .from_select(
+                ["level", "student_id", "item_id", "grade"],
+                select(
+                    literal(self.level.value),
+                    upserted.c.student_id,
+                    item_id,
+                    upserted.c.grade,
+                ),
             )
+            .cte("history")
         )
-        await self.db.execute(stmt)
+        return select(previous.c.grade).add_cte(history)
+
+    def _history_rows(self, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "level": self.level.value,
+                "student_id": row["student_id"],
+                "item_id": row[self.item_column] if self.item_column else None,
+                "grade": row["grade"],
+            }
+            for row in rows
+        ]
+
+    async def upsert(
+        self, grade: float, commit: bool = True, **values: Union[int, str, float]
+    ) -> None:
+        extra_columns = tuple(sorted(set(values) - set(self.value_columns)))
+        stmt = self._cached_statement(
+            "upsert",
+            extra_columns,
+            lambda: self._upsert_with_history_statement(extra_columns),
+        )
+        result = await self.db.execute(stmt, {**values, "grade": grade})
+        self._record_aggregate(values, result.scalar_one_or_none(), grade)
+        await self._notify_changes([{**values, "grade": grade}])
+        if commit:
+            await self._commit()
+        self._record_writes((values["student_id"],))
+
+    def _record_aggregate(
+        self,
+        row: Dict[str, Any],
+        previous_grade: Optional[float],
+        grade: float,
+    ) -> None:
+        if self.aggregates is not None:
+            self.aggregates.record(
+                self.level,
+                row[self.item_column] if self.item_column else None,
+                row["student_id"],
+                previous_grade,
+                grade,
+            )
+
+    async def _commit(self) -> None:
+        if self.aggregates is not None:
+            await self.aggregates.flush()
         await self.db.commit()
 
+    async def bulk_upsert(
+        self, rows: Sequence[Dict[str, Union[int, float]]]
+    ) -> List[Tuple[int, ...]]:
+        rows_by_key = {
+            tuple(row[column] for column in self.conflict_columns): row
+            for row in rows
+        }
+        if not rows_by_key:
+            return []
+
+        unique_rows = list(rows_by_key.values())
+        if len(unique_rows) >= self.copy_threshold:
+            keys = await self._copy_upsert(unique_rows)
+        else:
+            keys = await self._insert_upsert(unique_rows)
+        await self._reset_parent_totals(unique_rows)
+        await self._notify_changes([rows_by_key[tuple(key)] for key in keys])
+        await self._commit()
+        self._record_writes({row["student_id"] for row in unique_rows})
+        return keys
+
+    async def _reset_parent_totals(
+        self, rows: List[Dict[str, Union[int, float]]]
+    ) -> None:
+        pass
+
+    async def _insert_upsert(
+        self, rows: List[Dict[str, Union[int, float]]]
+    ) -> List[Tuple[int, ...]]:
+        stmt = self._cached_statement(
+            "bulk_upsert",
+            (),
+            lambda: self._upsert_statement().returning(
+                *(getattr(self.model, column) for column in self.conflict_columns)
+            ),
+        )
+
+        keys = []
+        for start in range(0, len(rows), self.insert_batch_size):
+            batch = [
+                {
+                    **{column: row[column] for column in self.value_columns},
+                    "grade": row["grade"],
+                }
+                for row in rows[start : start + self.insert_batch_size]
+            ]
+            await self._record_batch_aggregates(batch)
+            result = await self.db.execute(stmt, batch)
+            keys.extend(tuple(key) for key in result.all())
+            await self.db.execute(insert(GradeChangeEntry), self._history_rows(batch))
+        return keys
+
+    async def _record_batch_aggregates(self, batch: List[Dict[str, Any]]) -> None:
+        if self.aggregates is None:
+            return
+        conflict_columns = tuple(self.conflict_columns)
+        stmt = self._cached_statement(
+            "previous_grades",
+            (),
+            lambda: select(
+                *(getattr(self.model, column) for column in conflict_columns),
+                self.model.grade,
+            ).where(
+                tuple_(
+                    *(getattr(self.model, column) for column in conflict_columns)
+                ).in_(bindparam("keys", expanding=True))
+            ),
+        )
+        result = await self.db.execute(
+            stmt,
+            {
+                "keys": [
+                    tuple(row[column] for column in conflict_columns)
+                    for row in batch
+                ]
+            },
+        )
+        previous_grades = {tuple(key): grade for *key, grade in result.all()}
+        for row in batch:
+            self._record_aggregate(
+                row,
+                previous_grades.get(
+                    tuple(row[column] for column in conflict_columns)
+                ),
+                row["grade"],
+            )
+
+    async def _copy_upsert(
+        self, rows: List[Dict[str, Union[int, float]]]
+    ) -> List[Tuple[int, ...]]:
+        table_name = self.model.__tablename__
+        staging_table = f"{table_name}_staging_{uuid.uuid4().hex[:12]}"
+        columns = [*self.value_columns, "grade"]
+        column_list = ", ".join(columns)
+        conflict_list = ", ".join(self.conflict_columns)
+
+        connection = await self.db.connection()
+        await connection.execute(
+            text(
+                f"CREATE TEMPORARY TABLE {staging_table} "
+                f"(LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+        )
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging_table,
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+        )
+        if self.aggregates is not None:
+            previous = await connection.execute(
+                text(
+                    f"SELECT staging.*, target.grade AS previous_grade "
+                    f"FROM {staging_table} AS staging "
+                    f"LEFT JOIN {table_name} AS target USING ({conflict_list})"
+                )
+            )
+            for row in previous.mappings():
+                self._record_aggregate(row, row["previous_grade"], row["grade"])
+        reset_totals = "".join(
+            f"{column} = NULL, " for column in self.running_total_columns
+        )
+        result = await connection.execute(
+            text(
+                f"INSERT INTO {table_name} ({column_list}, updated_at) "
+                f"SELECT {column_list}, now() FROM {staging_table} "
+                f"ON CONFLICT ({conflict_list}) DO UPDATE "
+                f"SET grade = EXCLUDED.grade, {reset_totals}updated_at = now() "
+                f"RETURNING {conflict_list}"
+            )
+        )
+        keys = [tuple(key) for key in result.all()]
+        item_column = self.item_column or "NULL"
+        await connection.execute(
+            text(
+                f"INSERT INTO {GradeChangeEntry.__tablename__} "
+                f"(level, student_id, item_id, grade) "
+                f"SELECT :level, student_id, {item_column}, grade "
+                f"FROM {staging_table}"
+            ),
+            {"level": self.level.value},
+        )
+        return keys
+
     async def get_by_filters(
         self, **filters: Union[int, str, float]
     ) -> List[DeclarativeBase]:
-        stmt = select(self.model)
-        for column, value in filters.items():
-            stmt = stmt.where(getattr(self.model, column) == value)
-        result = await self.db.execute(stmt)
+        columns = tuple(sorted(filters))
+        stmt = self._cached_statement(
+            "rows", columns, lambda: self._filtered_by(select(self.model), columns)
+        )
+        reader = self.reader_for(filters.get("student_id"))
+        result = await reader.execute(stmt, filters)
         return result.scalars().all()
 
+    async def get_item_grades(
+        self, item_column: str, **filters: Union[int, str, float]
+    ) -> List[Row]:
+        columns = tuple(sorted(filters))
+
+        def build() -> Select:
+            item = getattr(self.model, item_column)
+            stmt = select(item, self.model.grade).order_by(item)
+            return self._filtered_by(stmt, columns)
+
+        stmt = self._cached_statement(f"item_grades:{item_column}", columns, build)
+        result = await self.db.execute(stmt, filters)
+        return result.all()
+
     async def get_grade(self, **filters: Union[int, str, float]) -> float:
-        stmt = select(self.model.grade)
-        for column, value in filters.items():
-            stmt = stmt.where(getattr(self.model, column) == value)
-        result = await self.db.execute(stmt)
+        columns = tuple(sorted(filters))
+        stmt = self._cached_statement(
+            "grade",
+            columns,
+            lambda: self._filtered_by(select(self.model.grade), columns),
+        )
+        reader = self.reader_for(filters.get("student_id"))
+        result = await reader.execute(stmt, filters)
         grade = result.scalar_one_or_none()
         return grade if grade else 0
 
+    async def get_updated_at(
+        self, **filters: Union[int, str, float]
+    ) -> Optional[datetime]:
+        columns = tuple(sorted(filters))
+        stmt = self._cached_statement(
+            "updated_at",
+            columns,
+            lambda: self._filtered_by(select(self.model.updated_at), columns),
+        )
+        reader = self.reader_for(filters.get("student_id"))
+        result = await reader.execute(stmt, filters)
+        return result.scalar_one_or_none()
+
+    async def get_student_grades(self, student_id: int) -> List[Row]:
+        def build() -> Select:
+            stmt = select(
+                *(getattr(self.model, column) for column in self.value_columns),
+                self.model.grade,
+            )
+            if self.item_column:
+                stmt = stmt.order_by(getattr(self.model, self.item_column))
+            return self._filtered_by(stmt, ("student_id",))
+
+        stmt = self._cached_statement("student_grades", (), build)
+        reader = self.reader_for(student_id)
+        result = await reader.execute(stmt, {"student_id": student_id})
+        return result.all()
+
+    async def get_top_grades(
+        self, limit: int, item_id: Optional[int] = None
+    ) -> List[Row]:
+        columns = (self.item_column,) if self.item_column else ()
+
+        def build() -> Select:
+            stmt = (
+                select(self.model.student_id, self.model.grade)
+                .order_by(self.model.grade.desc(), self.model.student_id.desc())
+                .limit(bindparam("limit"))
+            )
+            return self._filtered_by(stmt, columns)
+
+        stmt = self._cached_statement("top_grades", columns, build)
+        parameters = {"limit": limit}
+        if self.item_column:
+            parameters[self.item_column] = item_id
+        result = await self.read_db.execute(stmt, parameters)
+        return result.all()
+
+    async def get_student_ids(self, **filters: Union[int, str, float]) -> List[int]:
+        columns = tuple(sorted(filters))
+        stmt = self._cached_statement(
+            "student_ids",
+            columns,
+            lambda: self._filtered_by(
+                select(self.model.student_id).distinct(), columns
+            ),
+        )
+        result = await self.db.execute(stmt, filters)
+        return list(result.scalars().all())
+
+    async def iter_batches(
+        self, batch_size: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        columns = self.model.__table__.columns
+        last_id = 0
+        while True:
+            stmt = (
+                select(*columns)
+                .where(self.model.id > last_id)
+                .order_by(self.model.id)
+                .limit(batch_size)
+            )
+            result = await self.read_db.execute(stmt)
+            rows = [dict(row) for row in result.mappings()]
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1]["id"]
+
+    async def list_page(
+        self,
+        filters: GradeListFilters,
+        limit: int,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        stmt = self._filtered_select(filters)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(self.model.student_id, self.model.id) > tuple_(*after)
+            )
+        stmt = stmt.order_by(self.model.student_id, self.model.id).limit(limit)
+        reader = self.reader_for(filters.equals.get("student_id"))
+        result = await reader.execute(stmt)
+        return [dict(row) for row in result.mappings()]
+
+    async def estimate_count(self, filters: GradeListFilters) -> int:
+        compiled = self._filtered_select(filters).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+        reader = self.reader_for(filters.equals.get("student_id"))
+        connection = await reader.connection()
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _filtered_select(self, filters: GradeListFilters) -> Select:
+        columns = self.model.__table__.columns
+        stmt = select(*columns)
+        for column, value in filters.equals.items():
+            if column not in columns:
+                raise ValueError(
+                    f"Filter '{column}' is not supported for {self.level.value} grades"
+                )
+            stmt = stmt.where(columns[column] == value)
+        if filters.min_grade is not None:
+            stmt = stmt.where(self.model.grade >= filters.min_grade)
+        if filters.max_grade is not None:
+            stmt = stmt.where(self.model.grade <= filters.max_grade)
+        if filters.updated_after is not None:
+            stmt = stmt.where(self.model.updated_at >= filters.updated_after)
+        if filters.updated_before is not None:
+            stmt = stmt.where(self.model.updated_at < filters.updated_before)
+        return stmt
+
 
 class ResponseGradeRepository(GradingRepository):
-    def __init__(self, db: AsyncSession) -> None:
-        super().__init__(db, ResponseGrade, ["response_id", "student_id"])
+    level = GradeLevel.RESPONSE
+    value_columns = ("student_id", "response_id", "assignment_id")
+    item_column = "response_id"
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
+        recent_writes: Optional[RecentWrites] = None,
+        aggregates: Optional[GradeAggregateRepository] = None,
+    ) -> None:
+        super().__init__(
+            db,
+            ResponseGrade,
+            ["response_id", "student_id"],
+            read_db,
+            recent_writes,
+            aggregates,
+        )
 
     async def upsert(
-        self, student_id: int, response_id: int, assignment_id: int, grade: float
+        self,
+        student_id: int,
+        response_id: int,
+        assignment_id: int,
+        grade: float,
+        commit: bool = True,
+        ordinal: Optional[int] = None,
     ) -> None:
+        values = {} if ordinal is None else {"ordinal": ordinal}
         await super().upsert(
             grade=grade,
+            commit=commit,
             student_id=student_id,
             response_id=response_id,
             assignment_id=assignment_id,
+            **values,
+        )
+
+    async def _reset_parent_totals(
+        self, rows: List[Dict[str, Union[int, float]]]
+    ) -> None:
+        keys = sorted({(row["student_id"], row["assignment_id"]) for row in rows})
+        stmt = self._cached_statement(
+            "reset_assignment_totals",
+            (),
+            lambda: update(AssignmentGrade)
+            .where(
+                tuple_(AssignmentGrade.student_id, AssignmentGrade.assignment_id).in_(
+                    bindparam("keys", expanding=True)
+                ),
+                AssignmentGrade.response_count.is_not(None),
+            )
+            .values(penalized_sum=None, response_count=None)
+            .execution_options(synchronize_session=False),
+        )
+        for start in range(0, len(keys), self.insert_batch_size):
+            await self.db.execute(
+                stmt, {"keys": keys[start : start + self.insert_batch_size]}
+            )
+
+    async def get_response(self, student_id: int, response_id: int) -> Optional[Row]:
+        stmt = self._cached_statement(
+            "response",
+            (),
+            lambda: self._filtered_by(
+                select(self.model.ordinal, self.model.grade),
+                ("student_id", "response_id"),
+            ),
+        )
+        result = await self.db.execute(
+            stmt, {"student_id": student_id, "response_id": response_id}
+        )
+        return result.first()
+
+    async def get_last_response(
+        self, student_id: int, assignment_id: int
+    ) -> Optional[Row]:
+        stmt = self._cached_statement(
+            "last_response",
+            (),
+            lambda: self._filtered_by(
+                select(self.model.response_id, self.model.ordinal)
+                .order_by(self.model.response_id.desc())
+                .limit(1),
+                ("student_id", "assignment_id"),
+            ),
+        )
+        result = await self.db.execute(
+            stmt, {"student_id": student_id, "assignment_id": assignment_id}
+        )
+        return result.first()
+
+    async def renumber_ordinals(self, student_id: int, assignment_id: int) -> None:
+        table_name = self.model.__tablename__
+        stmt = self._cached_statement(
+            "renumber_ordinals",
+            (),
+            lambda: text(
+                f"UPDATE {table_name} SET ordinal = numbered.ordinal "
+                f"FROM (SELECT id, row_number() OVER (ORDER BY response_id) - 1 "
+                f"AS ordinal FROM {table_name} "
+                f"WHERE student_id = :student_id AND assignment_id = :assignment_id"
+                f") AS numbered "
+                f"WHERE {table_name}.student_id = :student_id "
+                f"AND {table_name}.assignment_id = :assignment_id "
+                f"AND {table_name}.id = numbered.id "
+                f"AND {table_name}.ordinal IS DISTINCT FROM numbered.ordinal"
+            ),
+        )
+        await self.db.execute(
+            stmt, {"student_id": student_id, "assignment_id": assignment_id}
         )
 
     async def get_all_for_assignment(
         self, assignment_id: int, student_id: int
-    ) -> List[ResponseGrade]:
-        return await self.get_by_filters(
-            assignment_id=assignment_id, student_id=student_id
+    ) -> List[Row]:
+        return await self.get_item_grades(
+            "response_id", student_id=student_id, assignment_id=assignment_id
         )
 
 
 class AssignmentGradeRepository(GradingRepository):
-    def __init__(self, db: AsyncSession) -> None:
-        super().__init__(db, AssignmentGrade, ["assignment_id", "student_id"])
+    level = GradeLevel.ASSIGNMENT
+    value_columns = ("student_id", "assignment_id", "module_id")
+    item_column = "assignment_id"
+    running_total_columns = ("penalized_sum", "response_count")
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
+        recent_writes: Optional[RecentWrites] = None,
+        aggregates: Optional[GradeAggregateRepository] = None,
+    ) -> None:
+        super().__init__(
+            db,
+            AssignmentGrade,
+            ["assignment_id", "student_id"],
+            read_db,
+            recent_writes,
+            aggregates,
+        )
 
     async def upsert(
-        self, student_id: int, assignment_id: int, module_id: int, grade: float
+        self,
+        student_id: int,
+        assignment_id: int,
+        module_id: int,
+        grade: float,
+        commit: bool = True,
+        penalized_sum: Optional[float] = None,
+        response_count: Optional[int] = None,
     ) -> None:
+        values = (
+            {}
+            if penalized_sum is None or response_count is None
+            else {"penalized_sum": penalized_sum, "response_count": response_count}
+        )
         await super().upsert(
             grade=grade,
+            commit=commit,
             student_id=student_id,
             assignment_id=assignment_id,
             module_id=module_id,
+            **values,
+        )
+
+    async def get_response_totals(
+        self, student_id: int, assignment_id: int
+    ) -> Optional[Row]:
+        stmt = self._cached_statement(
+            "response_totals",
+            (),
+            lambda: self._filtered_by(
+                select(self.model.penalized_sum, self.model.response_count),
+                ("student_id", "assignment_id"),
+            ),
         )
+        result = await self.db.execute(
+            stmt, {"student_id": student_id, "assignment_id": assignment_id}
+        )
+        return result.first()
 
-    async def get_all_for_module(
-        self, module_id: int, student_id: int
-    ) -> List[AssignmentGrade]:
-        return await self.get_by_filters(module_id=module_id, student_id=student_id)
+    async def get_all_for_module(self, module_id: int, student_id: int) -> List[Row]:
+        return await self.get_item_grades(
+            "assignment_id", student_id=student_id, module_id=module_id
+        )
 
 
 class ModuleGradeRepository(GradingRepository):
-    def __init__(self, db: AsyncSession) -> None:
-        super().__init__(db, ModuleGrade, ["module_id", "student_id"])
+    level = GradeLevel.MODULE
+    value_columns = ("student_id", "module_id", "subject_id")
+    item_column = "module_id"
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
+        recent_writes: Optional[RecentWrites] = None,
+        aggregates: Optional[GradeAggregateRepository] = None,
+    ) -> None:
+        super().__init__(
+            db,
+            ModuleGrade,
+            ["module_id", "student_id"],
+            read_db,
+            recent_writes,
+            aggregates,
+        )
 
     async def upsert(
-        self, student_id: int, module_id: int, subject_id: int, grade: float
+        self,
+        student_id: int,
+        module_id: int,
+        subject_id: int,
+        grade: float,
+        commit: bool = True,
     ) -> None:
         await super().upsert(
             grade=grade,
+            commit=commit,
             student_id=student_id,
             module_id=module_id,
             subject_id=subject_id,
         )
 
-    async def get_all_for_subject(
-        self, subject_id: int, student_id: int
-    ) -> List[ModuleGrade]:
-        return await self.get_by_filters(subject_id=subject_id, student_id=student_id)
+    async def get_all_for_subject(self, subject_id: int, student_id: int) -> List[Row]:
+        return await self.get_item_grades(
+            "module_id", student_id=student_id, subject_id=subject_id
+        )
 
 
 class SubjectGradeRepository(GradingRepository):
-    def __init__(self, db: AsyncSession) -> None:
-        super().__init__(db, SubjectGrade, ["subject_id", "student_id"])
+    level = GradeLevel.SUBJECT
+    value_columns = ("student_id", "subject_id")
+    item_column = "subject_id"
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
+        recent_writes: Optional[RecentWrites] = None,
+        aggregates: Optional[GradeAggregateRepository] = None,
+    ) -> None:
+        super().__init__(
+            db,
+            SubjectGrade,
+            ["subject_id", "student_id"],
+            read_db,
+            recent_writes,
+            aggregates,
+        )
 
-    async def upsert(self, student_id: int, subject_id: int, grade: float) -> None:
-        await super().upsert(grade=grade, student_id=student_id, subject_id=subject_id)
+    async def upsert(
+        self, student_id: int, subject_id: int, grade: float, commit: bool = True
+    ) -> None:
+        await super().upsert(
+            grade=grade, commit=commit, student_id=student_id, subject_id=subject_id
+        )
 
-    async def get_all_for_student(self, student_id: int) -> List[SubjectGrade]:
-        return await self.get_by_filters(student_id=student_id)
+    async def get_all_for_student(self, student_id: int) -> List[Row]:
+        return await self.get_item_grades("subject_id", student_id=student_id)
 
 
 class OverallGradeRepository(GradingRepository):
-    def __init__(self, db: AsyncSession) -> None:
-        super().__init__(db, OverallGrade, ["student_id"])
+    level = GradeLevel.OVERALL
+    value_columns = ("student_id",)
 
-    async def upsert(self, student_id: int, grade: float) -> None:
-        await super().upsert(grade=grade, student_id=student_id)
+    def __init__(
+        self,
+        db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
+        recent_writes: Optional[RecentWrites] = None,
+        aggregates: Optional[GradeAggregateRepository] = None,
+    ) -> None:
+        super().__init__(
+            db,
+            OverallGrade,
+            ["student_id"],
+            read_db,
+            recent_writes,
+            aggregates,
+        )
+
+    async def upsert(
+        self, student_id: int, grade: float, commit: bool = True
+    ) -> None:
+        await super().upsert(grade=grade, commit=commit, student_id=student_id)
 
     async def get(self, student_id: int) -> float:
         return await self.get_grade(student_id=student_id)
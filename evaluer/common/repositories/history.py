@@ -0,0 +1,115 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import Row, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from evaluer.common.database.models import GradeChangeEntry, GradeSnapshot
+
+
+class GradeHistoryRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_snapshot(
+        self, student_id: int, as_of: Optional[datetime] = None
+    ) -> Optional[Row]:
+        stmt = (
+            select(
+                GradeSnapshot.change_id, GradeSnapshot.taken_at, GradeSnapshot.grades
+            )
+            .where(GradeSnapshot.student_id == student_id)
+            .order_by(GradeSnapshot.taken_at.desc())
+            .limit(1)
+        )
+        if as_of is not None:
+            stmt = stmt.where(GradeSnapshot.taken_at <= as_of)
+        result = await self.db.execute(stmt)
+        return result.first()
+
+    async def get_changes(
+        self,
+        student_id: int,
+        after_id: int,
+        until_id: Optional[int] = None,
+        as_of: Optional[datetime] = None,
+    ) -> List[Row]:
+        stmt = (
+            select(
+                GradeChangeEntry.id,
+                GradeChangeEntry.level,
+                GradeChangeEntry.item_id,
+                GradeChangeEntry.grade,
+                GradeChangeEntry.changed_at,
+            )
+            .where(
+                GradeChangeEntry.student_id == student_id,
+                GradeChangeEntry.id > after_id,
+            )
+            .order_by(GradeChangeEntry.id)
+        )
+        if until_id is not None:
+            stmt = stmt.where(GradeChangeEntry.id <= until_id)
+        if as_of is not None:
+            stmt = stmt.where(GradeChangeEntry.changed_at <= as_of)
+        result = await self.db.execute(stmt)
+        return result.all()
+
+    async def get_last_change_id(
+        self, student_id: int, as_of: datetime
+    ) -> Optional[int]:
+        stmt = select(func.max(GradeChangeEntry.id)).where(
+            GradeChangeEntry.student_id == student_id,
+            GradeChangeEntry.changed_at <= as_of,
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_student_ids_with_changes(self, before: datetime) -> List[int]:
+        stmt = (
+            select(GradeChangeEntry.student_id)
+            .where(GradeChangeEntry.changed_at < before)
+            .distinct()
+            .order_by(GradeChangeEntry.student_id)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars())
+
+    async def get_snapshot_due_change_id(
+        self, student_id: int, snapshot_interval: int
+    ) -> Optional[int]:
+        last_snapshot_change_id = (
+            select(GradeSnapshot.change_id)
+            .where(GradeSnapshot.student_id == student_id)
+            .order_by(GradeSnapshot.taken_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(GradeChangeEntry.id)
+            .where(
+                GradeChangeEntry.student_id == student_id,
+                GradeChangeEntry.id > func.coalesce(last_snapshot_change_id, 0),
+            )
+            .order_by(GradeChangeEntry.id)
+            .offset(snapshot_interval - 1)
+            .limit(1)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def create_snapshot(
+        self,
+        student_id: int,
+        change_id: int,
+        taken_at: datetime,
+        grades: List[List[Any]],
+    ) -> None:
+        await self.db.execute(
+            insert(GradeSnapshot).values(
+                student_id=student_id,
+                change_id=change_id,
+                taken_at=taken_at,
+                grades=grades,
+            )
+        )
@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Exists,
+    and_,
+    exists,
+    func,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from evaluer.common.database.models import HiveResponse, ResponseGrade
+from evaluer.common.models.hive import AssignmentResponseType
+
+_PENDING_REDO = and_(
+    HiveResponse.response_type
+    == literal_column(f"'{AssignmentResponseType.REDO.value}'"),
+    HiveResponse.graded_at.is_(None),
+)
+
+
+class HiveResponseRepository:
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
+        self.db = db
+        self.read_db = read_db or db
+
+    async def mirror(self, rows: Sequence[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        stmt = insert(HiveResponse).on_conflict_do_nothing(
+            index_elements=[HiveResponse.response_id]
+        )
+        await self.db.execute(stmt, list(rows))
+
+    async def get_pending_redo(
+        self,
+        module_id: Optional[int] = None,
+        subject_id: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        stmt = select(
+            HiveResponse.response_id,
+            HiveResponse.assignment_id,
+            HiveResponse.student_id,
+            HiveResponse.module_id,
+            HiveResponse.subject_id,
+            HiveResponse.submitted_at,
+        ).where(_PENDING_REDO, ~self._graded())
+        if module_id is not None:
+            stmt = stmt.where(HiveResponse.module_id == module_id)
+        if subject_id is not None:
+            stmt = stmt.where(HiveResponse.subject_id == subject_id)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(HiveResponse.submitted_at, HiveResponse.response_id)
+                > tuple_(*after)
+            )
+        stmt = stmt.order_by(HiveResponse.submitted_at, HiveResponse.response_id)
+        result = await self.read_db.execute(stmt.limit(limit))
+        return [dict(row) for row in result.mappings()]
+
+    async def mark_graded(self) -> int:
+        stmt = (
+            update(HiveResponse)
+            .where(_PENDING_REDO, self._graded())
+            .values(graded_at=func.now())
+        )
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        return result.rowcount
+
+    def _graded(self) -> Exists:
+        return exists().where(
+            and_(
+                ResponseGrade.response_id == HiveResponse.response_id,
+                ResponseGrade.student_id == HiveResponse.student_id,
+            )
+        )
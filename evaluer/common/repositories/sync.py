@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import Select, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from evaluer.common.database.models import AssignmentSyncState
+
+
+class SyncState(NamedTuple):
+    assignment_id: int
+    student_id: int
+    check_count: int
+    redo_count: int
+    done_count: int
+    last_response_at: Optional[datetime]
+
+
+class AssignmentSyncStateRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_state(self, assignment_id: int) -> Optional[SyncState]:
+        stmt = self._select_states().where(
+            AssignmentSyncState.assignment_id == assignment_id
+        )
+        result = await self.db.execute(stmt)
+        row = result.first()
+        return SyncState(*row) if row is not None else None
+
+    async def get_states(
+        self, student_id: Optional[int] = None
+    ) -> Dict[int, SyncState]:
+        stmt = self._select_states()
+        if student_id is not None:
+            stmt = stmt.where(AssignmentSyncState.student_id == student_id)
+        result = await self.db.execute(stmt)
+        return {row.assignment_id: SyncState(*row) for row in result.all()}
+
+    def _select_states(self) -> Select:
+        return select(
+            AssignmentSyncState.assignment_id,
+            AssignmentSyncState.student_id,
+            AssignmentSyncState.check_count,
+            AssignmentSyncState.redo_count,
+            AssignmentSyncState.done_count,
+            AssignmentSyncState.last_response_at,
+        )
+
+    async def save_state(
+        self, state: SyncState, previous: Optional[SyncState] = None
+    ) -> bool:
+        stmt = insert(AssignmentSyncState).values(**state._asdict())
+        if previous is None:
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=[AssignmentSyncState.assignment_id]
+            )
+        else:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[AssignmentSyncState.assignment_id],
+                set_={
+                    "check_count": stmt.excluded.check_count,
+                    "redo_count": stmt.excluded.redo_count,
+                    "done_count": stmt.excluded.done_count,
+                    "last_response_at": stmt.excluded.last_response_at,
+                    "synced_at": stmt.excluded.synced_at,
+                },
+                where=AssignmentSyncState.last_response_at.is_not_distinct_from(
+                    previous.last_response_at
+                ),
+            )
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        return result.rowcount > 0
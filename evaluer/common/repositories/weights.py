@@ -0,0 +1,140 @@
+from typing import List, Optional, Sequence
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from evaluer.common.database.models import (
+    ExerciseWeight,
+    ModuleWeight,
+    SubjectWeight,
+    WeightsVersion,
+)
+from evaluer.common.database.notifications import notify
+from evaluer.common.services.weights import (
+    ExerciseWeightConfig,
+    ModuleWeightConfig,
+    SubjectWeightConfig,
+    WeightsConfiguration,
+)
+
+WEIGHTS_CHANGED_CHANNEL = "weights_changed"
+
+
+class WeightsRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_latest_version(self) -> Optional[int]:
+        result = await self.db.execute(select(func.max(WeightsVersion.id)))
+        return result.scalar_one_or_none()
+
+    async def get_previous_version(self, version_id: int) -> Optional[int]:
+        result = await self.db.execute(
+            select(func.max(WeightsVersion.id)).where(WeightsVersion.id < version_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def claim_pending_versions(self) -> List[int]:
+        result = await self.db.execute(
+            select(WeightsVersion.id)
+            .where(WeightsVersion.recalculated_at.is_(None))
+            .order_by(WeightsVersion.id)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars())
+
+    async def mark_recalculated(self, version_ids: Sequence[int]) -> None:
+        await self.db.execute(
+            update(WeightsVersion)
+            .where(WeightsVersion.id.in_(version_ids))
+            .values(recalculated_at=func.now())
+        )
+
+    async def load(self, version_id: int) -> WeightsConfiguration:
+        subjects = await self.db.execute(
+            select(SubjectWeight).where(SubjectWeight.version_id == version_id)
+        )
+        modules = await self.db.execute(
+            select(ModuleWeight).where(ModuleWeight.version_id == version_id)
+        )
+        exercises = await self.db.execute(
+            select(ExerciseWeight).where(ExerciseWeight.version_id == version_id)
+        )
+
+        subject_configs = {
+            subject.subject_id: SubjectWeightConfig(
+                name=subject.name, weight=subject.weight
+            )
+            for subject in subjects.scalars()
+        }
+        module_configs = {}
+        for module in modules.scalars():
+            module_config = ModuleWeightConfig(name=module.name, weight=module.weight)
+            module_configs[module.module_id] = module_config
+            subject_config = subject_configs.get(module.subject_id)
+            if subject_config is not None:
+                subject_config.modules[module.module_id] = module_config
+        for exercise in exercises.scalars():
+            module_config = module_configs.get(exercise.module_id)
+            if module_config is not None:
+                module_config.exercises[exercise.exercise_id] = ExerciseWeightConfig(
+                    name=exercise.name, weight=exercise.weight
+                )
+
+        return WeightsConfiguration(subjects=subject_configs)
+
+    async def create_version(
+        self,
+        weights_configuration: WeightsConfiguration,
+        description: Optional[str] = None,
+        recalculated: bool = False,
+    ) -> int:
+        version = WeightsVersion(
+            description=description,
+            recalculated_at=func.now() if recalculated else None,
+        )
+        self.db.add(version)
+        await self.db.flush()
+
+        subject_rows, module_rows, exercise_rows = [], [], []
+        for subject_id, subject in weights_configuration.subjects.items():
+            subject_rows.append(
+                {
+                    "version_id": version.id,
+                    "subject_id": subject_id,
+                    "name": subject.name,
+                    "weight": subject.weight,
+                }
+            )
+            for module_id, module in subject.modules.items():
+                module_rows.append(
+                    {
+                        "version_id": version.id,
+                        "module_id": module_id,
+                        "subject_id": subject_id,
+                        "name": module.name,
+                        "weight": module.weight,
+                    }
+                )
+                for exercise_id, exercise in module.exercises.items():
+                    exercise_rows.append(
+                        {
+                            "version_id": version.id,
+                            "exercise_id": exercise_id,
+                            "module_id": module_id,
+                            "name": exercise.name,
+                            "weight": exercise.weight,
+                        }
+                    )
+
+        for model, rows in (
+            (SubjectWeight, subject_rows),
+            (ModuleWeight, module_rows),
+            (ExerciseWeight, exercise_rows),
+        ):
+            if rows:
+                await self.db.execute(insert(model), rows)
+
+        await notify(self.db, WEIGHTS_CHANGED_CHANNEL, str(version.id))
+        await self.db.commit()
+        return version.id
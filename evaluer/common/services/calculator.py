@@ -1,5 +1,5 @@
 import math
-from typing import Dict, Sequence, Protocol
+from typing import Mapping, Sequence, Protocol
 
 
 class HasGrade(Protocol):
@@ -20,15 +20,25 @@ class GradingCalculator:
             return 0.0
 
         redo_grades = [
-            # First index is 0, log(1) = 1, so we start at 2
-            max(response.grade - math.log(index + 2), self._minimum_score)
-            for index, response in enumerate(response_grades)
+            self.penalize_response_grade(response.grade, ordinal)
+            for ordinal, response in enumerate(response_grades)
         ]
         weighted_grade = 0 if not redo_grades else sum(redo_grades) / len(redo_grades)
         return weighted_grade
 
+    def penalize_response_grade(self, grade: float, ordinal: int) -> float:
+        # First index is 0, log(1) = 1, so we start at 2
+        return max(grade - math.log(ordinal + 2), self._minimum_score)
+
+    def calculate_assignment_grade_from_total(
+        self, penalized_sum: float, response_count: int
+    ) -> float:
+        if response_count <= 0:
+            return 0.0
+        return penalized_sum / response_count
+
     def calculate_weighted_average(
-        self, grades_by_id: Dict[int, float], weights_by_id: Dict[int, float]
+        self, grades_by_id: Mapping[int, float], weights_by_id: Mapping[int, float]
     ) -> float:
         if not grades_by_id:
             return 0.0
@@ -0,0 +1,304 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import requests
+
+from evaluer.common.clients.hive import HiveClient
+from evaluer.common.models.hive import Assignment, Exercise, Module, Subject
+from evaluer.common.services.weights import WeightProvider
+
+CourseComponents = Tuple[List[Subject], List[Module], List[Exercise]]
+
+
+class CourseAncestry(NamedTuple):
+    assignment_id: int
+    exercise_id: int
+    module_id: int
+    subject_id: int
+
+
+class CourseHierarchy:
+    __slots__ = ("_exercise_by_assignment", "_module_by_exercise", "_subject_by_module")
+
+    def __init__(
+        self,
+        exercise_by_assignment: Dict[int, int],
+        module_by_exercise: Dict[int, int],
+        subject_by_module: Dict[int, int],
+    ):
+        self._exercise_by_assignment = exercise_by_assignment
+        self._module_by_exercise = module_by_exercise
+        self._subject_by_module = subject_by_module
+
+    @classmethod
+    def build(
+        cls,
+        assignments: Iterable[Assignment],
+        exercises: Iterable[Exercise],
+        modules: Iterable[Module],
+    ) -> "CourseHierarchy":
+        return cls(
+            exercise_by_assignment={
+                assignment.id: assignment.exercise_id for assignment in assignments
+            },
+            module_by_exercise={
+                exercise.id: exercise.module_id for exercise in exercises
+            },
+            subject_by_module={module.id: module.subject_id for module in modules},
+        )
+
+    def resolve(self, assignment_id: int) -> Optional[CourseAncestry]:
+        exercise_id = self._exercise_by_assignment.get(assignment_id)
+        if exercise_id is None:
+            return None
+        module_id = self._module_by_exercise.get(exercise_id)
+        if module_id is None:
+            return None
+        subject_id = self._subject_by_module.get(module_id)
+        if subject_id is None:
+            return None
+        return CourseAncestry(
+            assignment_id=assignment_id,
+            exercise_id=exercise_id,
+            module_id=module_id,
+            subject_id=subject_id,
+        )
+
+    def add_assignment(self, assignment: Assignment) -> None:
+        self._exercise_by_assignment[assignment.id] = assignment.exercise_id
+
+    def add_exercise(self, exercise: Exercise) -> None:
+        self._module_by_exercise[exercise.id] = exercise.module_id
+
+    def add_module(self, module: Module) -> None:
+        self._subject_by_module[module.id] = module.subject_id
+
+    def exercise_for(self, assignment_id: Optional[int]) -> Optional[int]:
+        return self._exercise_by_assignment.get(assignment_id)
+
+    def module_for(self, exercise_id: int) -> Optional[int]:
+        return self._module_by_exercise.get(exercise_id)
+
+
+class CourseHierarchyResolver:
+    def __init__(self, refresh_interval: float = 300.0):
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._hierarchy: Optional[CourseHierarchy] = None
+        self._loaded_at = 0.0
+
+    def resolve(
+        self, assignment_id: int, hive_client: HiveClient
+    ) -> Optional[CourseAncestry]:
+        hierarchy = self.get_hierarchy(hive_client)
+        ancestry = hierarchy.resolve(assignment_id)
+        if ancestry is None:
+            ancestry = self._resolve_missing(hierarchy, assignment_id, hive_client)
+        return ancestry
+
+    def get_hierarchy(self, hive_client: HiveClient) -> CourseHierarchy:
+        hierarchy = self._hierarchy
+        if (
+            hierarchy is None
+            or time.monotonic() - self._loaded_at >= self._refresh_interval
+        ):
+            hierarchy = self._reload(hive_client)
+        return hierarchy
+
+    def peek_hierarchy(self) -> Optional[CourseHierarchy]:
+        return self._hierarchy
+
+    def invalidate(self) -> None:
+        self._loaded_at = 0.0
+
+    def _reload(self, hive_client: HiveClient) -> CourseHierarchy:
+        with self._lock:
+            if (
+                self._hierarchy is not None
+                and time.monotonic() - self._loaded_at < self._refresh_interval
+            ):
+                return self._hierarchy
+            self._hierarchy = CourseHierarchy.build(
+                assignments=hive_client.get_assignments(),
+                exercises=hive_client.get_exercises(),
+                modules=hive_client.get_modules(),
+            )
+            self._loaded_at = time.monotonic()
+            return self._hierarchy
+
+    def _resolve_missing(
+        self, hierarchy: CourseHierarchy, assignment_id: int, hive_client: HiveClient
+    ) -> Optional[CourseAncestry]:
+        try:
+            assignment = hive_client.get_assignment_by_id(assignment_id)
+        except requests.HTTPError as error:
+            if error.response is not None and error.response.status_code == 404:
+                return None
+            raise
+        hierarchy.add_assignment(assignment)
+        module_id = hierarchy.module_for(assignment.exercise_id)
+        if module_id is None:
+            exercise = hive_client.get_exercise_by_id(assignment.exercise_id)
+            hierarchy.add_exercise(exercise)
+            module_id = exercise.module_id
+        ancestry = hierarchy.resolve(assignment_id)
+        if ancestry is None:
+            hierarchy.add_module(hive_client.get_module_by_id(module_id))
+            ancestry = hierarchy.resolve(assignment_id)
+        return ancestry
+
+
+class CourseTree(NamedTuple):
+    version: str
+    subjects: List[Dict[str, Any]]
+
+
+def build_course_tree(
+    subjects: Sequence[Subject],
+    modules: Sequence[Module],
+    exercises: Sequence[Exercise],
+    weight_provider: WeightProvider,
+) -> List[Dict[str, Any]]:
+    exercises_by_module: Dict[int, List[Exercise]] = {}
+    for exercise in sorted(exercises, key=lambda exercise: exercise.id):
+        exercises_by_module.setdefault(exercise.module_id, []).append(exercise)
+    modules_by_subject: Dict[int, List[Module]] = {}
+    for module in sorted(modules, key=lambda module: module.id):
+        modules_by_subject.setdefault(module.subject_id, []).append(module)
+
+    subject_weights = weight_provider.get_subject_weights()
+    tree = []
+    for subject in sorted(subjects, key=lambda subject: subject.id):
+        module_weights = weight_provider.get_module_weights_for_subject(subject.id)
+        subject_modules = []
+        for module in modules_by_subject.get(subject.id, []):
+            exercise_weights = weight_provider.get_exercise_weights_for_module(
+                module.id
+            )
+            subject_modules.append(
+                {
+                    "id": module.id,
+                    "name": module.name,
+                    "weight": module_weights.get(module.id),
+                    "exercises": [
+                        {
+                            "id": exercise.id,
+                            "name": exercise.name,
+                            "weight": exercise_weights.get(exercise.id),
+                        }
+                        for exercise in exercises_by_module.get(module.id, [])
+                    ],
+                }
+            )
+        tree.append(
+            {
+                "id": subject.id,
+                "name": subject.name,
+                "weight": subject_weights.get(subject.id),
+                "modules": subject_modules,
+            }
+        )
+    return tree
+
+
+def course_tree_digest(subjects: List[Dict[str, Any]]) -> str:
+    payload = json.dumps(subjects, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def course_components_digest(components: CourseComponents) -> str:
+    return course_tree_digest(
+        [
+            [component.model_dump(mode="json") for component in group]
+            for group in components
+        ]
+    )
+
+
+class CourseTreeCache:
+    def __init__(self, refresh_interval: float = 300.0):
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._components: Optional[CourseComponents] = None
+        self._components_version: Optional[str] = None
+        self._generation = 0
+        self._loaded_at = 0.0
+        self._tree: Optional[CourseTree] = None
+        self._tree_key: Optional[Tuple[int, int]] = None
+
+    def get_tree(
+        self, hive_client: HiveClient, weight_provider: WeightProvider
+    ) -> CourseTree:
+        components, _, generation = self._get_components(hive_client)
+        return self._build_tree(components, generation, weight_provider)
+
+    def peek_tree(self, weight_provider: WeightProvider) -> Optional[CourseTree]:
+        with self._lock:
+            if not self._is_fresh():
+                return None
+            components, generation = self._components, self._generation
+        return self._build_tree(components, generation, weight_provider)
+
+    def get_components(self, hive_client: HiveClient) -> CourseComponents:
+        components, _, _ = self._get_components(hive_client)
+        return components
+
+    def get_versioned_components(
+        self, hive_client: HiveClient
+    ) -> Tuple[CourseComponents, str]:
+        components, version, _ = self._get_components(hive_client)
+        return components, version
+
+    def peek_components(self) -> Optional[Tuple[CourseComponents, str]]:
+        with self._lock:
+            if not self._is_fresh():
+                return None
+            return self._components, self._components_version
+
+    def invalidate(self) -> None:
+        self._loaded_at = 0.0
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._components is not None
+            and time.monotonic() - self._loaded_at < self._refresh_interval
+        )
+
+    def _build_tree(
+        self,
+        components: CourseComponents,
+        generation: int,
+        weight_provider: WeightProvider,
+    ) -> CourseTree:
+        key = (generation, weight_provider.version)
+        tree = self._tree
+        if tree is None or self._tree_key != key:
+            subjects = build_course_tree(*components, weight_provider)
+            tree = CourseTree(version=course_tree_digest(subjects), subjects=subjects)
+            self._tree = tree
+            self._tree_key = key
+        return tree
+
+    def _get_components(
+        self, hive_client: HiveClient
+    ) -> Tuple[CourseComponents, str, int]:
+        with self._lock:
+            if not self._is_fresh():
+                components = self._fetch_components(hive_client)
+                if components != self._components:
+                    self._components = components
+                    self._components_version = course_components_digest(components)
+                    self._generation += 1
+                self._loaded_at = time.monotonic()
+            return self._components, self._components_version, self._generation
+
+    def _fetch_components(self, hive_client: HiveClient) -> CourseComponents:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            subjects = executor.submit(hive_client.get_subjects)
+            modules = executor.submit(hive_client.get_modules)
+            exercises = executor.submit(hive_client.get_exercises)
+            return subjects.result(), modules.result(), exercises.result()
@@ -0,0 +1,276 @@
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from evaluer.common.clients.hive import HiveClient
+from evaluer.common.models.grades import GradeLevel
+from evaluer.common.repositories.grading import GradingRepository
+from evaluer.common.services.course import CourseComponents, CourseHierarchy
+
+EXPORT_COLUMNS = (
+    "level",
+    "student_id",
+    "subject_id",
+    "subject_name",
+    "module_id",
+    "module_name",
+    "assignment_id",
+    "exercise_name",
+    "response_id",
+    "grade",
+    "updated_at",
+)
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    JSONL = "jsonl"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+    @property
+    def media_type(self) -> str:
+        return {
+            ExportFormat.CSV: "text/csv",
+            ExportFormat.JSONL: "application/x-ndjson",
+            ExportFormat.PARQUET: "application/vnd.apache.parquet",
+            ExportFormat.ARROW: "application/vnd.apache.arrow.stream",
+        }[self]
+
+
+class CourseNameIndex:
+    def __init__(
+        self,
+        subject_names: Dict[int, str],
+        module_names: Dict[int, str],
+        module_subjects: Dict[int, int],
+        exercise_names: Dict[int, str],
+        exercise_modules: Dict[int, int],
+        hierarchy: CourseHierarchy,
+    ):
+        self._subject_names = subject_names
+        self._module_names = module_names
+        self._module_subjects = module_subjects
+        self._exercise_names = exercise_names
+        self._exercise_modules = exercise_modules
+        self._hierarchy = hierarchy
+
+    @classmethod
+    def from_course(
+        cls, components: CourseComponents, hierarchy: CourseHierarchy
+    ) -> "CourseNameIndex":
+        subjects, modules, exercises = components
+        return cls(
+            subject_names={subject.id: subject.name for subject in subjects},
+            module_names={module.id: module.name for module in modules},
+            module_subjects={module.id: module.subject_id for module in modules},
+            exercise_names={exercise.id: exercise.name for exercise in exercises},
+            exercise_modules={exercise.id: exercise.module_id for exercise in exercises},
+            hierarchy=hierarchy,
+        )
+
+    @classmethod
+    def from_hive(cls, hive_client: HiveClient) -> "CourseNameIndex":
+        subjects = hive_client.get_subjects()
+        modules = hive_client.get_modules()
+        exercises = hive_client.get_exercises()
+        assignments = hive_client.get_assignments()
+        return cls.from_course(
+            (subjects, modules, exercises),
+            CourseHierarchy.build(assignments, exercises, modules),
+        )
+
+    def describe(self, level: GradeLevel, row: Dict[str, Any]) -> Dict[str, Any]:
+        assignment_id = row.get("assignment_id")
+        exercise_id = self._hierarchy.exercise_for(assignment_id)
+        module_id = row.get("module_id") or self._exercise_modules.get(exercise_id)
+        subject_id = row.get("subject_id") or self._module_subjects.get(module_id)
+        updated_at: Optional[datetime] = row.get("updated_at") or row.get("created_at")
+        return {
+            "level": level.value,
+            "student_id": row.get("student_id"),
+            "subject_id": subject_id,
+            "subject_name": self._subject_names.get(subject_id),
+            "module_id": module_id,
+            "module_name": self._module_names.get(module_id),
+            "assignment_id": assignment_id,
+            "exercise_name": self._exercise_names.get(exercise_id),
+            "response_id": row.get("response_id"),
+            "grade": row.get("grade"),
+            "updated_at": updated_at.isoformat() if updated_at else None,
+        }
+
+
+class GradebookEncoder(ABC):
+    def begin(self) -> bytes:
+        return b""
+
+    @abstractmethod
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        pass
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class CsvGradebookEncoder(GradebookEncoder):
+    def begin(self) -> bytes:
+        return self._write_rows([EXPORT_COLUMNS])
+
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        return self._write_rows(
+            [[row.get(column) for column in EXPORT_COLUMNS] for row in rows]
+        )
+
+    def _write_rows(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+
+class JsonLinesGradebookEncoder(GradebookEncoder):
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        return "".join(f"{json.dumps(row)}\n" for row in rows).encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _ArrowGradebookEncoder(GradebookEncoder):
+    def __init__(self, row_group_size: int):
+        try:
+            import pyarrow
+        except ImportError as error:
+            raise RuntimeError(
+                "Parquet and Arrow exports require the 'pyarrow' package"
+            ) from error
+
+        self._pyarrow = pyarrow
+        self._row_group_size = row_group_size
+        self._pending: List[Dict[str, Any]] = []
+        self._sink = _DrainableSink()
+        self._schema = pyarrow.schema(
+            [
+                ("level", pyarrow.string()),
+                ("student_id", pyarrow.int64()),
+                ("subject_id", pyarrow.int64()),
+                ("subject_name", pyarrow.string()),
+                ("module_id", pyarrow.int64()),
+                ("module_name", pyarrow.string()),
+                ("assignment_id", pyarrow.int64()),
+                ("exercise_name", pyarrow.string()),
+                ("response_id", pyarrow.int64()),
+                ("grade", pyarrow.float64()),
+                ("updated_at", pyarrow.string()),
+            ]
+        )
+        self._writer = self._open_writer(self._sink, self._schema)
+
+    @abstractmethod
+    def _open_writer(self, sink: _DrainableSink, schema):
+        pass
+
+    def _write_table(self, table) -> None:
+        self._writer.write_table(table)
+
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        self._pending.extend(rows)
+        while len(self._pending) >= self._row_group_size:
+            self._flush_row_group(self._pending[: self._row_group_size])
+            del self._pending[: self._row_group_size]
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        if self._pending:
+            self._flush_row_group(self._pending)
+            self._pending.clear()
+        self._writer.close()
+        return self._sink.drain()
+
+    def _flush_row_group(self, rows: List[Dict[str, Any]]) -> None:
+        table = self._pyarrow.Table.from_pylist(rows, schema=self._schema)
+        self._write_table(table)
+
+
+class ParquetGradebookEncoder(_ArrowGradebookEncoder):
+    def _open_writer(self, sink: _DrainableSink, schema):
+        import pyarrow.parquet
+
+        return pyarrow.parquet.ParquetWriter(sink, schema)
+
+    def _write_table(self, table) -> None:
+        self._writer.write_table(table, row_group_size=self._row_group_size)
+
+
+class ArrowGradebookEncoder(_ArrowGradebookEncoder):
+    def _open_writer(self, sink: _DrainableSink, schema):
+        import pyarrow.ipc
+
+        return pyarrow.ipc.new_stream(sink, schema)
+
+
+def create_gradebook_encoder(
+    export_format: ExportFormat, row_group_size: int = 65536
+) -> GradebookEncoder:
+    if export_format == ExportFormat.CSV:
+        return CsvGradebookEncoder()
+    if export_format == ExportFormat.JSONL:
+        return JsonLinesGradebookEncoder()
+    if export_format == ExportFormat.PARQUET:
+        return ParquetGradebookEncoder(row_group_size)
+    return ArrowGradebookEncoder(row_group_size)
+
+
+class GradebookExporter:
+    def __init__(
+        self,
+        repositories: Sequence[GradingRepository],
+        course_names: CourseNameIndex,
+        batch_size: int = 1000,
+    ):
+        self._repositories = repositories
+        self._course_names = course_names
+        self._batch_size = batch_size
+
+    async def iter_rows(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        for repository in self._repositories:
+            async for batch in repository.iter_batches(self._batch_size):
+                yield [
+                    self._course_names.describe(repository.level, row) for row in batch
+                ]
+
+    async def stream(self, encoder: GradebookEncoder) -> AsyncIterator[bytes]:
+        header = encoder.begin()
+        if header:
+            yield header
+        async for rows in self.iter_rows():
+            chunk = encoder.encode(rows)
+            if chunk:
+                yield chunk
+        trailer = encoder.finish()
+        if trailer:
+            yield trailer
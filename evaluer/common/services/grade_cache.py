@@ -0,0 +1,122 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from evaluer.common.database.routing import RecentWrites
+from evaluer.common.models.grades import GradeChange, GradeLevel
+
+GradeCacheKey = Tuple[GradeLevel, int, Optional[int]]
+
+
+class GradeCache:
+    def __init__(self, max_entries: int, ttl_seconds: float = 30.0):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[GradeCacheKey, Tuple[float, float]]" = (
+            OrderedDict()
+        )
+        self._invalidated: "OrderedDict[GradeCacheKey, int]" = OrderedDict()
+        self._generation = 0
+        self._forgotten_generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._lag_count = 0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+        self._lag_last = 0.0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: GradeCacheKey) -> Optional[float]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        grade, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self._expirations += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return grade
+
+    def set(self, key: GradeCacheKey, grade: float, generation: int) -> None:
+        if (
+            generation < self._forgotten_generation
+            or self._invalidated.get(key, -1) > generation
+        ):
+            return
+        self._entries[key] = (grade, time.monotonic() + self._ttl_seconds)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(
+        self, keys: Iterable[GradeCacheKey], changed_at: Optional[float] = None
+    ) -> None:
+        self._generation += 1
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self._invalidations += 1
+            self._invalidated[key] = self._generation
+            self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self._max_entries:
+            _, generation = self._invalidated.popitem(last=False)
+            self._forgotten_generation = max(self._forgotten_generation, generation)
+
+        if changed_at is not None:
+            lag = max(time.time() - changed_at, 0.0)
+            self._lag_count += 1
+            self._lag_total += lag
+            self._lag_max = max(self._lag_max, lag)
+            self._lag_last = lag
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._forgotten_generation = self._generation
+        self._entries.clear()
+        self._invalidated.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "invalidations": self._invalidations,
+            "invalidation_notifications": self._lag_count,
+            "invalidation_lag_last_ms": self._lag_last * 1000,
+            "invalidation_lag_avg_ms": (
+                self._lag_total / self._lag_count * 1000 if self._lag_count else 0.0
+            ),
+            "invalidation_lag_max_ms": self._lag_max * 1000,
+        }
+
+
+class GradeChangeSubscriber:
+    def __init__(self, grade_cache: GradeCache, recent_writes: RecentWrites):
+        self._grade_cache = grade_cache
+        self._recent_writes = recent_writes
+
+    async def handle_grade_changes(self, payload: str) -> None:
+        change = GradeChange.from_payload(payload)
+        keys = [
+            (change.level, row["student_id"], change.item_id(row)) for row in change.rows
+        ]
+        self._grade_cache.invalidate(keys, changed_at=change.changed_at)
+        self._recent_writes.record(student_id for _, student_id, _ in keys)
+
+    async def handle_reconnect(self) -> None:
+        self._grade_cache.clear()
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import logging
+import secrets
+from collections import deque
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from evaluer.common.clients.hive import HiveClient
+from evaluer.common.models.grades import GradeChange
+from evaluer.common.services.course import CourseAncestry, CourseHierarchyResolver
+from evaluer.common.services.weights import WeightsRegistry
+
+logger = logging.getLogger(__name__)
+
+RESET_EVENT = "reset"
+GRADE_EVENT = "grade"
+
+
+class GradeStreamFilters(NamedTuple):
+    student_id: Optional[int] = None
+    subject_id: Optional[int] = None
+    module_id: Optional[int] = None
+    assignment_id: Optional[int] = None
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        for column, expected in self._asdict().items():
+            if expected is not None and event.get(column) != expected:
+                return False
+        return True
+
+
+class GradeStreamEvent(NamedTuple):
+    id: str
+    event: str
+    data: Dict[str, Any]
+
+
+class GradeStreamSubscription:
+    def __init__(self, filters: GradeStreamFilters, queue_size: int):
+        self.filters = filters
+        self._queue: "asyncio.Queue[GradeStreamEvent]" = asyncio.Queue(queue_size)
+
+    def offer(self, event: GradeStreamEvent) -> None:
+        if event.event == GRADE_EVENT and not self.filters.matches(event.data):
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._drain()
+            self._queue.put_nowait(event._replace(event=RESET_EVENT, data={}))
+
+    async def get(self, timeout: float) -> Optional[GradeStreamEvent]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def _drain(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+
+class GradeChangeBroadcaster:
+    def __init__(
+        self,
+        weights_registry: WeightsRegistry,
+        buffer_size: int = 1000,
+        queue_size: int = 256,
+        course_hierarchy: Optional[CourseHierarchyResolver] = None,
+        hive_client_factory: Optional[Callable[[], HiveClient]] = None,
+    ):
+        self._weights_registry = weights_registry
+        self._course_hierarchy = course_hierarchy
+        self._hive_client_factory = hive_client_factory
+        self._publish_lock = asyncio.Lock()
+        self._queue_size = queue_size
+        self._epoch = secrets.token_hex(4)
+        self._sequence = 0
+        self._buffer: Deque[Tuple[int, GradeStreamEvent]] = deque(maxlen=buffer_size)
+        self._subscriptions: Set[GradeStreamSubscription] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(
+        self, filters: GradeStreamFilters, last_event_id: Optional[str] = None
+    ) -> GradeStreamSubscription:
+        subscription = GradeStreamSubscription(filters, self._queue_size)
+        if last_event_id:
+            for event in self._replay(last_event_id):
+                subscription.offer(event)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: GradeStreamSubscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    async def handle_grade_changes(self, payload: str) -> None:
+        change = GradeChange.from_payload(payload)
+        changed_at = datetime.fromtimestamp(change.changed_at, tz=timezone.utc)
+        async with self._publish_lock:
+            for row in change.rows:
+                row = await self._with_module(row)
+                self._publish(
+                    GRADE_EVENT,
+                    {
+                        **self._with_subject(row),
+                        "level": change.level.value,
+                        "changed_at": changed_at.isoformat(),
+                    },
+                )
+
+    async def handle_reconnect(self) -> None:
+        self._publish(RESET_EVENT, {})
+
+    def _publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        self._sequence += 1
+        event = GradeStreamEvent(
+            id=f"{self._epoch}:{self._sequence}", event=event_type, data=data
+        )
+        self._buffer.append((self._sequence, event))
+        for subscription in self._subscriptions:
+            subscription.offer(event)
+
+    def _replay(self, last_event_id: str) -> List[GradeStreamEvent]:
+        epoch, _, sequence = last_event_id.partition(":")
+        oldest = self._buffer[0][0] if self._buffer else self._sequence + 1
+        if (
+            epoch != self._epoch
+            or not sequence.isdigit()
+            or int(sequence) > self._sequence
+            or int(sequence) < oldest - 1
+        ):
+            return [
+                GradeStreamEvent(
+                    id=f"{self._epoch}:{self._sequence}", event=RESET_EVENT, data={}
+                )
+            ]
+        return [event for number, event in self._buffer if number > int(sequence)]
+
+    async def _with_module(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if (
+            "module_id" in row
+            or "assignment_id" not in row
+            or self._course_hierarchy is None
+        ):
+            return row
+        ancestry = await self._resolve(row["assignment_id"])
+        if ancestry is None:
+            return row
+        return {
+            **row,
+            "module_id": ancestry.module_id,
+            "subject_id": ancestry.subject_id,
+        }
+
+    async def _resolve(self, assignment_id: int) -> Optional[CourseAncestry]:
+        hierarchy = self._course_hierarchy.peek_hierarchy()
+        ancestry = hierarchy.resolve(assignment_id) if hierarchy else None
+        if ancestry is not None or self._hive_client_factory is None:
+            return ancestry
+        try:
+            return await asyncio.to_thread(self._resolve_from_hive, assignment_id)
+        except Exception:
+            logger.exception(
+                "Failed to resolve the module of assignment %s", assignment_id
+            )
+            return None
+
+    def _resolve_from_hive(self, assignment_id: int) -> Optional[CourseAncestry]:
+        return self._course_hierarchy.resolve(
+            assignment_id, self._hive_client_factory()
+        )
+
+    def _with_subject(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if "subject_id" in row or "module_id" not in row:
+            return row
+        subject_id = self._weights_registry.get_provider().get_subject_for_module(
+            row["module_id"]
+        )
+        return {**row, "subject_id": subject_id}
+
+
+def format_server_sent_event(event: GradeStreamEvent) -> str:
+    return f"id: {event.id}\nevent: {event.event}\ndata: {json.dumps(event.data)}\n\n"
@@ -1,17 +1,48 @@
-from typing import Protocol
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+)
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from evaluer.common.database.locks import lock_student
+
+from evaluer.common.repositories.aggregates import GradeAggregateRepository
 from evaluer.common.repositories.grading import (
     AssignmentGradeRepository,
+    GradeListFilters,
+    GradingRepository,
     ModuleGradeRepository,
     OverallGradeRepository,
     ResponseGradeRepository,
     SubjectGradeRepository,
 )
 from evaluer.common.services.calculator import GradingCalculator
-from evaluer.common.services.weights import WeightProvider
+from evaluer.common.services.course import CourseAncestry, CourseHierarchyResolver
+from evaluer.common.services.grade_cache import GradeCache
+from evaluer.common.services.history import GradeHistoryService
+from evaluer.common.services.simulation import (
+    GradeScenario,
+    GradeSimulator,
+    ScenarioOutcome,
+    StudentGradeTree,
+)
+from evaluer.common.services.weights import WeightChanges, WeightProvider
 from evaluer.common.clients.hive import HiveClient
+from evaluer.common.models.grades import GradeLevel
+from evaluer.common.models.statistics import GradeDistribution
 from evaluer.common.models.hive import AssignmentResponseType
 
 
@@ -26,6 +57,23 @@ class WeightedGradeProtocol(Protocol):
     assignment_id: int | None = None
 
 
+class ResponseSlot(NamedTuple):
+    ordinal: int
+    penalized_sum: float
+    response_count: int
+
+
+class GradePage(NamedTuple):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[Tuple[int, int]]
+    estimated_total: int
+
+
+class GradeSimulation(NamedTuple):
+    current_overall: float
+    outcomes: List[ScenarioOutcome]
+
+
 class GradeService:
     def __init__(
         self,
@@ -37,6 +85,10 @@ class GradeService:
         module_grade_repo: ModuleGradeRepository,
         subject_grade_repo: SubjectGradeRepository,
         overall_grade_repo: OverallGradeRepository,
+        grade_cache: Optional[GradeCache] = None,
+        grade_history: Optional[GradeHistoryService] = None,
+        grade_aggregates: Optional[GradeAggregateRepository] = None,
+        course_hierarchy: Optional[CourseHierarchyResolver] = None,
     ):
         self.db = db
         self._weight_provider = weight_provider
@@ -46,6 +98,54 @@ class GradeService:
         self._module_grade_repo = module_grade_repo
         self._subject_grade_repo = subject_grade_repo
         self._overall_grade_repo = overall_grade_repo
+        self._grade_cache = grade_cache
+        self._grade_history = grade_history
+        self._grade_aggregates = grade_aggregates
+        self._course_hierarchy = course_hierarchy
+        self._locked_students: Set[int] = set()
+        self._pending_invalidations: List[Tuple[GradeLevel, int, Optional[int]]] = []
+        self._repositories_by_level: Dict[GradeLevel, GradingRepository] = {
+            repository.level: repository
+            for repository in (
+                response_grade_repo,
+                assignment_grade_repo,
+                module_grade_repo,
+                subject_grade_repo,
+                overall_grade_repo,
+            )
+        }
+
+    @classmethod
+    def create(
+        cls,
+        db: AsyncSession,
+        weight_provider: WeightProvider,
+        grading_calculator: GradingCalculator,
+        grade_history: Optional[GradeHistoryService] = None,
+        course_hierarchy: Optional[CourseHierarchyResolver] = None,
+    ) -> "GradeService":
+        grade_aggregates = GradeAggregateRepository(db)
+        return cls(
+            db=db,
+            weight_provider=weight_provider,
+            grading_calculator=grading_calculator,
+            response_grade_repo=ResponseGradeRepository(
+                db, aggregates=grade_aggregates
+            ),
+            assignment_grade_repo=AssignmentGradeRepository(
+                db, aggregates=grade_aggregates
+            ),
+            module_grade_repo=ModuleGradeRepository(db, aggregates=grade_aggregates),
+            subject_grade_repo=SubjectGradeRepository(
+                db, aggregates=grade_aggregates
+            ),
+            overall_grade_repo=OverallGradeRepository(
+                db, aggregates=grade_aggregates
+            ),
+            grade_history=grade_history,
+            grade_aggregates=grade_aggregates,
+            course_hierarchy=course_hierarchy,
+        )
 
     async def update_response_grade(
         self,
@@ -56,168 +156,518 @@ class GradeService:
         subject_id: int,
         new_grade: float,
     ):
-        await self._response_grade_repo.upsert(
-            student_id=student_id,
-            response_id=response_id,
-            assignment_id=assignment_id,
-            grade=new_grade,
-        )
-        await self.recalculate_assignment_grade(
-            student_id=student_id,
-            assignment_id=assignment_id,
-            module_id=module_id,
-            subject_id=subject_id,
-        )
+        async with self._student_transaction(student_id):
+            slot = await self._find_response_slot(
+                student_id, assignment_id, response_id
+            )
+            await self._response_grade_repo.upsert(
+                student_id=student_id,
+                response_id=response_id,
+                assignment_id=assignment_id,
+                grade=new_grade,
+                commit=False,
+                ordinal=slot.ordinal if slot else None,
+            )
+            self._invalidate_cached_grade(GradeLevel.RESPONSE, student_id, response_id)
+            if slot is None:
+                await self.recalculate_assignment_grade(
+                    student_id=student_id,
+                    assignment_id=assignment_id,
+                    module_id=module_id,
+                    subject_id=subject_id,
+                )
+                return
+
+            await self._save_assignment_totals(
+                student_id=student_id,
+                assignment_id=assignment_id,
+                module_id=module_id,
+                penalized_sum=slot.penalized_sum
+                + self._grading_calculator.penalize_response_grade(
+                    new_grade, slot.ordinal
+                ),
+                response_count=slot.response_count,
+            )
+            await self.recalculate_module_grade(student_id, module_id, subject_id)
 
     async def recalculate_assignment_grade(
         self, student_id: int, assignment_id: int, module_id: int, subject_id: int
     ):
-        response_grades = await self._response_grade_repo.get_all_for_assignment(
+        async with self._student_transaction(student_id):
+            await self._response_grade_repo.renumber_ordinals(
+                student_id=student_id, assignment_id=assignment_id
+            )
+            response_grades = await self._response_grade_repo.get_all_for_assignment(
+                student_id=student_id, assignment_id=assignment_id
+            )
+            await self._save_assignment_totals(
+                student_id=student_id,
+                assignment_id=assignment_id,
+                module_id=module_id,
+                penalized_sum=sum(
+                    self._grading_calculator.penalize_response_grade(
+                        response.grade, ordinal
+                    )
+                    for ordinal, response in enumerate(response_grades)
+                ),
+                response_count=len(response_grades),
+            )
+            await self.recalculate_module_grade(student_id, module_id, subject_id)
+
+    async def _find_response_slot(
+        self, student_id: int, assignment_id: int, response_id: int
+    ) -> Optional[ResponseSlot]:
+        existing = await self._response_grade_repo.get_response(
+            student_id=student_id, response_id=response_id
+        )
+        totals = await self._assignment_grade_repo.get_response_totals(
             student_id=student_id, assignment_id=assignment_id
         )
-        grade = self._grading_calculator.calculate_assignment_grade(
-            response_grades=response_grades
+        penalized_sum, response_count = totals if totals else (0.0, 0)
+        if penalized_sum is None or response_count is None:
+            return None
+
+        if existing is not None:
+            if existing.ordinal is None or totals is None:
+                return None
+            return ResponseSlot(
+                ordinal=existing.ordinal,
+                penalized_sum=penalized_sum
+                - self._grading_calculator.penalize_response_grade(
+                    existing.grade, existing.ordinal
+                ),
+                response_count=response_count,
+            )
+
+        last_response = await self._response_grade_repo.get_last_response(
+            student_id=student_id, assignment_id=assignment_id
+        )
+        if last_response is None:
+            in_order = response_count == 0
+        else:
+            in_order = (
+                last_response.response_id < response_id
+                and last_response.ordinal == response_count - 1
+            )
+        if not in_order:
+            return None
+        return ResponseSlot(
+            ordinal=response_count,
+            penalized_sum=penalized_sum,
+            response_count=response_count + 1,
         )
+
+    async def _save_assignment_totals(
+        self,
+        student_id: int,
+        assignment_id: int,
+        module_id: int,
+        penalized_sum: float,
+        response_count: int,
+    ) -> None:
         await self._assignment_grade_repo.upsert(
             student_id=student_id,
             assignment_id=assignment_id,
             module_id=module_id,
-            grade=grade,
+            grade=self._grading_calculator.calculate_assignment_grade_from_total(
+                penalized_sum, response_count
+            ),
+            commit=False,
+            penalized_sum=penalized_sum,
+            response_count=response_count,
         )
-        await self.recalculate_module_grade(student_id, module_id, subject_id)
+        self._invalidate_cached_grade(GradeLevel.ASSIGNMENT, student_id, assignment_id)
 
     async def recalculate_module_grade(
         self, student_id: int, module_id: int, subject_id: int
     ):
-        assignments = await self._assignment_grade_repo.get_all_for_module(
-            module_id=module_id, student_id=student_id
-        )
-        assignment_grades = {
-            assignment.assignment_id: assignment.grade for assignment in assignments
-        }
-        weights = self._weight_provider.get_exercise_weights_for_module(
-            module_id=module_id
-        )
-        grade = self._grading_calculator.calculate_weighted_average(
-            grades_by_id=assignment_grades, weights_by_id=weights
-        )
-        await self._module_grade_repo.upsert(
-            student_id=student_id,
-            module_id=module_id,
-            subject_id=subject_id,
-            grade=grade,
-        )
-        await self.recalculate_subject_grade(student_id, subject_id)
+        async with self._student_transaction(student_id):
+            assignments = await self._assignment_grade_repo.get_all_for_module(
+                module_id=module_id, student_id=student_id
+            )
+            assignment_grades = {
+                assignment.assignment_id: assignment.grade for assignment in assignments
+            }
+            weights = self._weight_provider.get_exercise_weights_for_module(
+                module_id=module_id
+            )
+            grade = self._grading_calculator.calculate_weighted_average(
+                grades_by_id=assignment_grades, weights_by_id=weights
+            )
+            await self._module_grade_repo.upsert(
+                student_id=student_id,
+                module_id=module_id,
+                subject_id=subject_id,
+                grade=grade,
+                commit=False,
+            )
+            self._invalidate_cached_grade(GradeLevel.MODULE, student_id, module_id)
+            await self.recalculate_subject_grade(student_id, subject_id)
 
     async def recalculate_subject_grade(self, student_id: int, subject_id: int):
-        modules = await self._module_grade_repo.get_all_for_subject(
-            subject_id=subject_id, student_id=student_id
-        )
-        module_grades = {module.module_id: module.grade for module in modules}
-        weights = self._weight_provider.get_module_weights_for_subject(
-            subject_id=subject_id
-        )
-        grade = self._grading_calculator.calculate_weighted_average(
-            grades_by_id=module_grades, weights_by_id=weights
+        async with self._student_transaction(student_id):
+            modules = await self._module_grade_repo.get_all_for_subject(
+                subject_id=subject_id, student_id=student_id
+            )
+            module_grades = {module.module_id: module.grade for module in modules}
+            weights = self._weight_provider.get_module_weights_for_subject(
+                subject_id=subject_id
+            )
+            grade = self._grading_calculator.calculate_weighted_average(
+                grades_by_id=module_grades, weights_by_id=weights
+            )
+            await self._subject_grade_repo.upsert(
+                student_id=student_id, subject_id=subject_id, grade=grade, commit=False
+            )
+            self._invalidate_cached_grade(GradeLevel.SUBJECT, student_id, subject_id)
+            await self.recalculate_overall_grade(student_id)
+
+    async def recalculate_overall_grade(self, student_id: int):
+        async with self._student_transaction(student_id):
+            subjects = await self._subject_grade_repo.get_all_for_student(
+                student_id=student_id
+            )
+            subject_grades = {
+                subject.subject_id: subject.grade for subject in subjects
+            }
+            weights = self._weight_provider.get_subject_weights()
+            grade = self._grading_calculator.calculate_weighted_average(
+                grades_by_id=subject_grades, weights_by_id=weights
+            )
+            await self._overall_grade_repo.upsert(
+                student_id=student_id, grade=grade, commit=False
+            )
+            self._invalidate_cached_grade(GradeLevel.OVERALL, student_id)
+            if self._grade_history is not None:
+                await self._grade_history.maybe_snapshot(student_id)
+
+    async def recalculate_for_weight_changes(self, changes: WeightChanges) -> None:
+        recalculated_students: Dict[int, set] = {}
+
+        for module_id in changes.module_ids:
+            subject_id = self._weight_provider.get_subject_for_module(module_id)
+            if subject_id is None:
+                continue
+            for student_id in await self._assignment_grade_repo.get_student_ids(
+                module_id=module_id
+            ):
+                await self.recalculate_module_grade(student_id, module_id, subject_id)
+                recalculated_students.setdefault(student_id, set()).add(subject_id)
+
+        for subject_id in changes.subject_ids:
+            for student_id in await self._module_grade_repo.get_student_ids(
+                subject_id=subject_id
+            ):
+                if subject_id in recalculated_students.get(student_id, ()):
+                    continue
+                await self.recalculate_subject_grade(student_id, subject_id)
+                recalculated_students.setdefault(student_id, set()).add(subject_id)
+
+        if changes.subjects_changed:
+            for student_id in await self._subject_grade_repo.get_student_ids():
+                if student_id in recalculated_students:
+                    continue
+                await self.recalculate_overall_grade(student_id)
+
+    @asynccontextmanager
+    async def _student_transaction(self, student_id: int) -> AsyncIterator[None]:
+        if student_id in self._locked_students:
+            yield
+            return
+
+        self._locked_students.add(student_id)
+        try:
+            await lock_student(self.db, student_id)
+            yield
+            await self._commit()
+        except BaseException:
+            self._pending_invalidations.clear()
+            if self._grade_aggregates is not None:
+                self._grade_aggregates.discard()
+            await self.db.rollback()
+            raise
+        finally:
+            self._locked_students.discard(student_id)
+        self._flush_invalidations()
+
+    async def _commit(self) -> None:
+        if self._grade_aggregates is not None:
+            await self._grade_aggregates.flush()
+        await self.db.commit()
+
+    def _invalidate_cached_grade(
+        self, level: GradeLevel, student_id: int, item_id: Optional[int] = None
+    ) -> None:
+        if self._grade_cache is not None:
+            self._pending_invalidations.append((level, student_id, item_id))
+
+    def _flush_invalidations(self) -> None:
+        if self._grade_cache is not None and self._pending_invalidations:
+            self._grade_cache.invalidate(self._pending_invalidations)
+        self._pending_invalidations = []
+
+    async def _read_grade(
+        self,
+        level: GradeLevel,
+        student_id: int,
+        item_id: Optional[int],
+        load: Callable[[], Awaitable[float]],
+        as_of: Optional[datetime] = None,
+    ) -> float:
+        if as_of is not None:
+            grades = await self.get_grades_as_of(student_id, as_of)
+            return grades.get((level, item_id), 0.0)
+        if self._grade_cache is None:
+            return await load()
+
+        key = (level, student_id, item_id)
+        grade = self._grade_cache.get(key)
+        if grade is not None:
+            return grade
+        generation = self._grade_cache.generation
+        grade = await load()
+        self._grade_cache.set(key, grade, generation)
+        return grade
+
+    async def get_grade_version(
+        self, level: GradeLevel, student_id: int, item_id: Optional[int] = None
+    ) -> Optional[datetime]:
+        repository = self._repositories_by_level[level]
+        filters = {"student_id": student_id}
+        if repository.item_column is not None:
+            filters[repository.item_column] = item_id
+        return await repository.get_updated_at(**filters)
+
+    async def get_assignment_response_grade(
+        self,
+        student_id: int,
+        assignment_id: int,
+        response_id: int,
+        as_of: Optional[datetime] = None,
+    ) -> float:
+        return await self._read_grade(
+            GradeLevel.RESPONSE,
+            student_id,
+            response_id,
+            lambda: self._response_grade_repo.get_grade(
+                student_id=student_id,
+                assignment_id=assignment_id,
+                response_id=response_id,
+            ),
+            as_of=as_of,
         )
-        await self._subject_grade_repo.upsert(
-            student_id=student_id, subject_id=subject_id, grade=grade
+
+    async def get_assignment_grade(
+        self, student_id: int, assignment_id: int, as_of: Optional[datetime] = None
+    ) -> float:
+        result = await self._read_grade(
+            GradeLevel.ASSIGNMENT,
+            student_id,
+            assignment_id,
+            lambda: self._assignment_grade_repo.get_grade(
+                student_id=student_id, assignment_id=assignment_id
+            ),
+            as_of=as_of,
         )
-        await self.recalculate_overall_grade(student_id)
+        return result if result is not None else 0.0
 
-    async def recalculate_overall_grade(self, student_id: int):
-        subjects = await self._subject_grade_repo.get_all_for_student(
-            student_id=student_id
+    async def get_module_grade(
+        self, student_id: int, module_id: int, as_of: Optional[datetime] = None
+    ) -> float:
+        return await self._read_grade(
+            GradeLevel.MODULE,
+            student_id,
+            module_id,
+            lambda: self._module_grade_repo.get_grade(
+                student_id=student_id, module_id=module_id
+            ),
+            as_of=as_of,
         )
-        subject_grades = {subject.subject_id: subject.grade for subject in subjects}
-        weights = self._weight_provider.get_subject_weights()
-        grade = self._grading_calculator.calculate_weighted_average(
-            grades_by_id=subject_grades, weights_by_id=weights
+
+    async def get_subject_grade(
+        self, student_id: int, subject_id: int, as_of: Optional[datetime] = None
+    ) -> float:
+        return await self._read_grade(
+            GradeLevel.SUBJECT,
+            student_id,
+            subject_id,
+            lambda: self._subject_grade_repo.get_grade(
+                student_id=student_id, subject_id=subject_id
+            ),
+            as_of=as_of,
         )
-        await self._overall_grade_repo.upsert(student_id=student_id, grade=grade)
 
-    async def get_assignment_response_grade(
-        self, student_id: int, assignment_id: int, response_id: int
+    async def get_overall_grade(
+        self, student_id: int, as_of: Optional[datetime] = None
     ) -> float:
-        return await self._response_grade_repo.get_grade(
-            student_id=student_id, assignment_id=assignment_id, response_id=response_id
+        return await self._read_grade(
+            GradeLevel.OVERALL,
+            student_id,
+            None,
+            lambda: self._overall_grade_repo.get(student_id=student_id),
+            as_of=as_of,
         )
 
-    async def get_assignment_grade(self, student_id: int, assignment_id: int) -> float:
-        result = await self._assignment_grade_repo.get_grade(
-            student_id=student_id, assignment_id=assignment_id
+    async def get_grades_as_of(
+        self, student_id: int, as_of: datetime
+    ) -> Dict[Tuple[GradeLevel, Optional[int]], float]:
+        if self._grade_history is None:
+            raise RuntimeError("Grade history is not configured")
+        return await self._grade_history.get_grades_as_of(student_id, as_of)
+
+    async def list_grades(
+        self,
+        level: GradeLevel,
+        filters: GradeListFilters,
+        limit: int,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> GradePage:
+        repository = self._repositories_by_level[level]
+        items = await repository.list_page(filters=filters, limit=limit, after=after)
+        estimated_total = await repository.estimate_count(filters)
+        next_cursor = (
+            (items[-1]["student_id"], items[-1]["id"]) if len(items) == limit else None
+        )
+        return GradePage(
+            items=items, next_cursor=next_cursor, estimated_total=estimated_total
         )
-        return result if result is not None else 0.0
 
-    async def get_module_grade(self, student_id: int, module_id: int) -> float:
-        return await self._module_grade_repo.get_grade(
-            student_id=student_id, module_id=module_id
+    async def get_grade_distribution(
+        self, level: GradeLevel, item_id: Optional[int] = None
+    ) -> GradeDistribution:
+        if self._grade_aggregates is None:
+            raise RuntimeError("Grade aggregates are not configured")
+        self._require_item_id(level, item_id)
+        return await self._grade_aggregates.get_distribution(level, item_id)
+
+    async def get_top_grades(
+        self, level: GradeLevel, limit: int, item_id: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        self._require_item_id(level, item_id)
+        rows = await self._repositories_by_level[level].get_top_grades(
+            limit=limit, item_id=item_id
         )
+        return [(row.student_id, row.grade) for row in rows]
+
+    def _require_item_id(self, level: GradeLevel, item_id: Optional[int]) -> None:
+        item_column = self._repositories_by_level[level].item_column
+        if item_column is not None and item_id is None:
+            raise ValueError(f"{item_column} is required for {level.value} grades")
 
-    async def get_subject_grade(self, student_id: int, subject_id: int) -> float:
-        return await self._subject_grade_repo.get_grade(
-            student_id=student_id, subject_id=subject_id
+    async def load_grade_tree(self, student_id: int) -> StudentGradeTree:
+        responses: Dict[int, Dict[int, float]] = {}
+        for row in await self._response_grade_repo.get_student_grades(student_id):
+            responses.setdefault(row.assignment_id, {})[row.response_id] = row.grade
+        assignment_rows = await self._assignment_grade_repo.get_student_grades(
+            student_id
+        )
+        module_rows = await self._module_grade_repo.get_student_grades(student_id)
+        subject_rows = await self._subject_grade_repo.get_student_grades(student_id)
+        return StudentGradeTree(
+            responses=responses,
+            assignments={row.assignment_id: row.grade for row in assignment_rows},
+            modules={row.module_id: row.grade for row in module_rows},
+            subjects={row.subject_id: row.grade for row in subject_rows},
+            overall=await self._overall_grade_repo.get(student_id=student_id),
+            module_by_assignment={
+                row.assignment_id: row.module_id for row in assignment_rows
+            },
+            subject_by_module={row.module_id: row.subject_id for row in module_rows},
         )
 
-    async def get_overall_grade(self, student_id: int) -> float:
-        return await self._overall_grade_repo.get(student_id=student_id)
+    async def simulate_grades(
+        self, student_id: int, scenarios: List[GradeScenario]
+    ) -> GradeSimulation:
+        tree = await self.load_grade_tree(student_id)
+        simulator = GradeSimulator(
+            tree, self._weight_provider, self._grading_calculator
+        )
+        return GradeSimulation(
+            current_overall=tree.overall, outcomes=simulator.simulate_all(scenarios)
+        )
 
     async def set_assignment_grade(
         self, student_id: int, assignment_id: int, module_id: int, grade: float
     ) -> None:
-        await self._assignment_grade_repo.upsert(
-            student_id=student_id,
+        async with self._student_transaction(student_id):
+            await self._assignment_grade_repo.upsert(
+                student_id=student_id,
+                assignment_id=assignment_id,
+                module_id=module_id,
+                grade=grade,
+                commit=False,
+            )
+            self._invalidate_cached_grade(
+                GradeLevel.ASSIGNMENT, student_id, assignment_id
+            )
+
+    def resolve_assignment(
+        self, assignment_id: int, hive_client: HiveClient
+    ) -> Optional[CourseAncestry]:
+        if self._course_hierarchy is not None:
+            return self._course_hierarchy.resolve(assignment_id, hive_client)
+        assignment = hive_client.get_assignment_by_id(assignment_id)
+        exercise = hive_client.get_exercise_by_id(assignment.exercise_id)
+        module = hive_client.get_module_by_id(exercise.module_id)
+        return CourseAncestry(
             assignment_id=assignment_id,
-            module_id=module_id,
-            grade=grade,
+            exercise_id=exercise.id,
+            module_id=module.id,
+            subject_id=module.subject_id,
         )
 
     async def ensure_assignment_auto_grade(
         self, student_id: int, assignment_id: int, hive_client: HiveClient
     ) -> float:
-        current_grade = await self.get_assignment_grade(
-            student_id=student_id, assignment_id=assignment_id
+        responses = hive_client.get_assignment_responses(
+            assignment_id=assignment_id,
+            user_id=student_id,
+            response_types=(AssignmentResponseType.REDO, AssignmentResponseType.DONE),
         )
-
-        responses = [
-            r
-            for r in hive_client.get_assignment_responses(assignment_id=assignment_id)
-            if r.user == student_id
-        ]
-        redo_count = sum(
-            1 for r in responses if r.response_type == AssignmentResponseType.REDO
+        return await self.apply_auto_grade(
+            student_id=student_id,
+            assignment_id=assignment_id,
+            redo_count=sum(
+                1 for r in responses if r.response_type == AssignmentResponseType.REDO
+            ),
+            done_count=sum(
+                1 for r in responses if r.response_type == AssignmentResponseType.DONE
+            ),
+            hive_client=hive_client,
         )
-        done_count = sum(
-            1 for r in responses if r.response_type == AssignmentResponseType.DONE
+
+    async def apply_auto_grade(
+        self,
+        student_id: int,
+        assignment_id: int,
+        redo_count: int,
+        done_count: int,
+        hive_client: HiveClient,
+    ) -> float:
+        current_grade = await self.get_assignment_grade(
+            student_id=student_id, assignment_id=assignment_id
         )
         if redo_count == 0 and done_count == 1:
             if current_grade != 10.0:
-                assignment = hive_client.get_assignment_by_id(assignment_id)
-                exercise = hive_client.get_exercise_by_id(assignment.exercise_id)
-                module = hive_client.get_module_by_id(exercise.module_id)
-                await self.set_assignment_grade(
-                    student_id=student_id,
-                    assignment_id=assignment_id,
-                    module_id=exercise.module_id,
-                    grade=10.0,
-                )
-                await self.recalculate_module_grade(
-                    student_id=student_id,
-                    module_id=exercise.module_id,
-                    subject_id=module.subject_id,
+                ancestry = await asyncio.to_thread(
+                    self.resolve_assignment, assignment_id, hive_client
                 )
+                if ancestry is None:
+                    raise ValueError(
+                        f"Assignment {assignment_id} does not belong to the course"
+                    )
+                async with self._student_transaction(student_id):
+                    await self.set_assignment_grade(
+                        student_id=student_id,
+                        assignment_id=assignment_id,
+                        module_id=ancestry.module_id,
+                        grade=10.0,
+                    )
+                    await self.recalculate_module_grade(
+                        student_id=student_id,
+                        module_id=ancestry.module_id,
+                        subject_id=ancestry.subject_id,
+                    )
             return 10.0
 
         return current_grade
-
-    async def ensure_overall_auto_grades(
-        self, student_id: int, hive_client: HiveClient
-    ) -> float:
-        assignments = hive_client.get_assignments()
-        for assignment in assignments:
-            await self.ensure_assignment_auto_grade(
-                student_id=student_id,
-                assignment_id=assignment.id,
-                hive_client=hive_client,
-            )
-        return await self.get_overall_grade(student_id)
@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Row
+
+from evaluer.common.models.grades import GradeLevel
+from evaluer.common.repositories.history import GradeHistoryRepository
+
+GradeTreeKey = Tuple[GradeLevel, Optional[int]]
+
+
+class GradeHistoryService:
+    def __init__(
+        self, history_repository: GradeHistoryRepository, snapshot_interval: int = 50
+    ):
+        self._history_repository = history_repository
+        self._snapshot_interval = snapshot_interval
+
+    async def get_grades_as_of(
+        self, student_id: int, as_of: datetime
+    ) -> Dict[GradeTreeKey, float]:
+        snapshot = await self._history_repository.get_snapshot(student_id, as_of)
+        grades = self._from_snapshot(snapshot)
+        changes = await self._history_repository.get_changes(
+            student_id,
+            after_id=snapshot.change_id if snapshot else 0,
+            as_of=as_of,
+        )
+        for change in changes:
+            grades[(GradeLevel(change.level), change.item_id)] = change.grade
+        return grades
+
+    async def maybe_snapshot(self, student_id: int) -> bool:
+        due_change_id = await self._history_repository.get_snapshot_due_change_id(
+            student_id, self._snapshot_interval
+        )
+        if due_change_id is None:
+            return False
+
+        snapshot = await self._history_repository.get_snapshot(student_id)
+        grades = self._from_snapshot(snapshot)
+        changes = await self._history_repository.get_changes(
+            student_id,
+            after_id=snapshot.change_id if snapshot else 0,
+            until_id=due_change_id,
+        )
+        for change in changes:
+            grades[(GradeLevel(change.level), change.item_id)] = change.grade
+        taken_at = max(
+            [change.changed_at for change in changes]
+            + ([snapshot.taken_at] if snapshot else [])
+        )
+
+        await self._history_repository.create_snapshot(
+            student_id=student_id,
+            change_id=due_change_id,
+            taken_at=taken_at,
+            grades=[
+                [level.value, item_id, grade]
+                for (level, item_id), grade in grades.items()
+            ],
+        )
+        return True
+
+    async def snapshot_as_of(self, student_id: int, as_of: datetime) -> bool:
+        change_id = await self._history_repository.get_last_change_id(
+            student_id, as_of
+        )
+        if change_id is None:
+            return False
+
+        grades = await self.get_grades_as_of(student_id, as_of)
+        await self._history_repository.create_snapshot(
+            student_id=student_id,
+            change_id=change_id,
+            taken_at=as_of,
+            grades=[
+                [level.value, item_id, grade]
+                for (level, item_id), grade in grades.items()
+            ],
+        )
+        return True
+
+    def _from_snapshot(self, snapshot: Optional[Row]) -> Dict[GradeTreeKey, float]:
+        if snapshot is None:
+            return {}
+        return {
+            (GradeLevel(level), item_id): grade
+            for level, item_id, grade in snapshot.grades
+        }
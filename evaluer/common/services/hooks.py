@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from evaluer.common.clients.hive import HiveClient
+from evaluer.common.repositories.history import GradeHistoryRepository
+from evaluer.common.repositories.responses import HiveResponseRepository
+from evaluer.common.repositories.sync import AssignmentSyncStateRepository
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.course import CourseHierarchyResolver
+from evaluer.common.services.grades import GradeService
+from evaluer.common.services.history import GradeHistoryService
+from evaluer.common.services.sync import AutoGradeSync
+from evaluer.common.services.weights import WeightsRegistry
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_PREFIX = "sha256="
+
+AutoGradeJob = Tuple[int, int]
+JobProcessor = Callable[[List[AutoGradeJob]], Awaitable[None]]
+
+
+def sign_payload(secret: str, body: bytes) -> str:
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"{SIGNATURE_PREFIX}{digest}"
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    if not signature:
+        return False
+    return hmac.compare_digest(sign_payload(secret, body), signature)
+
+
+class HiveEventQueue:
+    def __init__(
+        self,
+        process: JobProcessor,
+        max_pending: int = 10_000,
+        debounce_seconds: float = 1.0,
+    ):
+        self._process = process
+        self._max_pending = max_pending
+        self._debounce_seconds = debounce_seconds
+        self._pending: Dict[AutoGradeJob, None] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, student_id: int, assignment_id: int) -> bool:
+        job = (student_id, assignment_id)
+        if job not in self._pending:
+            if len(self._pending) >= self._max_pending:
+                return False
+            self._pending[job] = None
+        self._wakeup.set()
+        return True
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(self._debounce_seconds)
+            self._wakeup.clear()
+            jobs = list(self._pending)
+            self._pending = {}
+            try:
+                await self._process(jobs)
+            except Exception:
+                logger.exception("Failed to process %s Hive events", len(jobs))
+
+
+class AutoGradeWorker:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        weights_registry: WeightsRegistry,
+        grading_calculator: GradingCalculator,
+        hive_client_factory: Callable[[], HiveClient],
+        course_hierarchy: Optional[CourseHierarchyResolver] = None,
+        history_snapshot_interval: int = 50,
+    ):
+        self._session_factory = session_factory
+        self._weights_registry = weights_registry
+        self._grading_calculator = grading_calculator
+        self._hive_client_factory = hive_client_factory
+        self._course_hierarchy = course_hierarchy
+        self._history_snapshot_interval = history_snapshot_interval
+
+    async def process(self, jobs: List[AutoGradeJob]) -> None:
+        hive_client = await asyncio.to_thread(self._hive_client_factory)
+        async with self._session_factory() as db:
+            grade_service = GradeService.create(
+                db=db,
+                weight_provider=self._weights_registry.get_provider(),
+                grading_calculator=self._grading_calculator,
+                grade_history=GradeHistoryService(
+                    GradeHistoryRepository(db), self._history_snapshot_interval
+                ),
+                course_hierarchy=self._course_hierarchy,
+            )
+            auto_grade_sync = AutoGradeSync(
+                grade_service,
+                AssignmentSyncStateRepository(db),
+                HiveResponseRepository(db),
+            )
+            for student_id, assignment_id in jobs:
+                try:
+                    await auto_grade_sync.sync_assignment(
+                        student_id, assignment_id, hive_client
+                    )
+                except Exception:
+                    await db.rollback()
+                    logger.exception(
+                        "Failed to auto grade assignment %s of student %s",
+                        assignment_id,
+                        student_id,
+                    )
+            await auto_grade_sync.mark_graded_responses()
+        logger.info("Processed %s Hive events", len(jobs))
@@ -0,0 +1,155 @@
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.weights import WeightProvider
+
+
+class HypotheticalResponseGrade(NamedTuple):
+    assignment_id: int
+    grade: float
+    response_id: Optional[int] = None
+
+
+class HypotheticalAssignmentGrade(NamedTuple):
+    assignment_id: int
+    grade: float
+
+
+class GradeScenario(NamedTuple):
+    responses: Sequence[HypotheticalResponseGrade] = ()
+    assignments: Sequence[HypotheticalAssignmentGrade] = ()
+
+
+class ScenarioOutcome(NamedTuple):
+    overall: float
+    subjects: Dict[int, float]
+    modules: Dict[int, float]
+    assignments: Dict[int, float]
+
+
+class StudentGradeTree(NamedTuple):
+    responses: Dict[int, Dict[int, float]]
+    assignments: Dict[int, float]
+    modules: Dict[int, float]
+    subjects: Dict[int, float]
+    overall: float
+    module_by_assignment: Dict[int, int]
+    subject_by_module: Dict[int, int]
+
+
+class GradeSimulator:
+    def __init__(
+        self,
+        tree: StudentGradeTree,
+        weight_provider: WeightProvider,
+        grading_calculator: GradingCalculator,
+    ):
+        self._tree = tree
+        self._weight_provider = weight_provider
+        self._grading_calculator = grading_calculator
+        self._assignments_by_module: Dict[int, Dict[int, float]] = {}
+        for assignment_id, grade in tree.assignments.items():
+            module_id = self._module_for(assignment_id)
+            self._assignments_by_module.setdefault(module_id, {})[assignment_id] = grade
+        self._modules_by_subject: Dict[int, Dict[int, float]] = {}
+        for module_id, grade in tree.modules.items():
+            subject_id = self._subject_for(module_id)
+            self._modules_by_subject.setdefault(subject_id, {})[module_id] = grade
+
+    def simulate(self, scenario: GradeScenario) -> ScenarioOutcome:
+        assignments = self._simulate_assignments(scenario)
+
+        modules = self._recalculate_parents(
+            assignments,
+            self._module_for,
+            self._assignments_by_module,
+            self._weight_provider.get_exercise_weights_for_module,
+        )
+        subjects = self._recalculate_parents(
+            modules,
+            self._subject_for,
+            self._modules_by_subject,
+            self._weight_provider.get_module_weights_for_subject,
+        )
+
+        overall = self._tree.overall
+        if subjects:
+            overall = self._grading_calculator.calculate_weighted_average(
+                grades_by_id={**self._tree.subjects, **subjects},
+                weights_by_id=self._weight_provider.get_subject_weights(),
+            )
+        return ScenarioOutcome(
+            overall=overall,
+            subjects=subjects,
+            modules=modules,
+            assignments=assignments,
+        )
+
+    def simulate_all(
+        self, scenarios: Sequence[GradeScenario]
+    ) -> List[ScenarioOutcome]:
+        return [self.simulate(scenario) for scenario in scenarios]
+
+    def _simulate_assignments(self, scenario: GradeScenario) -> Dict[int, float]:
+        responses: Dict[int, Dict[int, float]] = {}
+        for response in scenario.responses:
+            grades = responses.get(response.assignment_id)
+            if grades is None:
+                grades = responses[response.assignment_id] = dict(
+                    self._tree.responses.get(response.assignment_id, {})
+                )
+            response_id = response.response_id
+            if response_id is None:
+                response_id = max(grades, default=0) + 1
+            grades[response_id] = response.grade
+
+        calculator = self._grading_calculator
+        assignments = {
+            assignment_id: calculator.calculate_assignment_grade_from_total(
+                sum(
+                    calculator.penalize_response_grade(grade, ordinal)
+                    for ordinal, (_, grade) in enumerate(sorted(grades.items()))
+                ),
+                len(grades),
+            )
+            for assignment_id, grades in responses.items()
+        }
+        assignments.update(
+            (assignment.assignment_id, assignment.grade)
+            for assignment in scenario.assignments
+        )
+        return assignments
+
+    def _recalculate_parents(
+        self,
+        changed: Dict[int, float],
+        parent_for: Callable[[int], int],
+        stored_by_parent: Dict[int, Dict[int, float]],
+        weights_for: Callable[[int], Mapping[int, float]],
+    ) -> Dict[int, float]:
+        changed_by_parent: Dict[int, Dict[int, float]] = {}
+        for item_id, grade in changed.items():
+            changed_by_parent.setdefault(parent_for(item_id), {})[item_id] = grade
+        return {
+            parent_id: self._grading_calculator.calculate_weighted_average(
+                grades_by_id={**stored_by_parent.get(parent_id, {}), **grades},
+                weights_by_id=weights_for(parent_id),
+            )
+            for parent_id, grades in changed_by_parent.items()
+        }
+
+    def _module_for(self, assignment_id: int) -> int:
+        module_id = self._tree.module_by_assignment.get(assignment_id)
+        if module_id is None:
+            module_id = self._weight_provider.get_module_for_exercise(assignment_id)
+        if module_id is None:
+            raise ValueError(f"Assignment {assignment_id} does not belong to a module")
+        return module_id
+
+    def _subject_for(self, module_id: int) -> int:
+        subject_id = self._tree.subject_by_module.get(module_id)
+        if subject_id is None:
+            subject_id = self._weight_provider.get_subject_for_module(module_id)
+        if subject_id is None:
+            raise ValueError(f"Module {module_id} does not belong to a subject")
+        return subject_id
@@ -0,0 +1,167 @@
+import bisect
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from evaluer.common.clients.hive import HiveClient
+from evaluer.common.models.hive import ClearanceLevel, CourseUser
+
+
+class StudentRecord:
+    __slots__ = ("id", "name", "username", "first_name", "last_name", "search_text")
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        username: str,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+    ):
+        self.id = id
+        self.name = name
+        self.username = username
+        self.first_name = first_name
+        self.last_name = last_name
+        self.search_text = "\x1f".join(
+            part.casefold()
+            for part in (name, username, first_name, last_name)
+            if part
+        )
+
+    @classmethod
+    def from_user(cls, user: CourseUser) -> "StudentRecord":
+        return cls(
+            id=user.id,
+            name=user.name,
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "username": self.username,
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+        }
+
+
+class StudentPage(NamedTuple):
+    items: List[StudentRecord]
+    next_cursor: Optional[int]
+    total: int
+
+
+class StudentIndex:
+    __slots__ = (
+        "version",
+        "_records",
+        "_ids",
+        "_by_id",
+        "_by_username",
+        "_known_ids",
+    )
+
+    def __init__(self, records: Iterable[StudentRecord]):
+        self._records = sorted(records, key=lambda record: record.id)
+        self.version = hashlib.sha256(
+            json.dumps(
+                [record.to_dict() for record in self._records],
+                separators=(",", ":"),
+            ).encode("utf-8")
+        ).hexdigest()
+        self._ids = [record.id for record in self._records]
+        self._by_id = {record.id: record for record in self._records}
+        self._by_username = {record.username: record for record in self._records}
+        self._known_ids: Set[int] = set()
+
+    def get(self, student_id: int) -> Optional[StudentRecord]:
+        return self._by_id.get(student_id)
+
+    def get_by_username(self, username: str) -> Optional[StudentRecord]:
+        return self._by_username.get(username)
+
+    def contains(self, student_id: int) -> bool:
+        return student_id in self._by_id or student_id in self._known_ids
+
+    def remember(self, student_id: int) -> None:
+        self._known_ids.add(student_id)
+
+    def page(
+        self,
+        search: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: int = 50,
+    ) -> StudentPage:
+        records = self._records
+        if search:
+            needle = search.casefold()
+            records = [record for record in records if needle in record.search_text]
+            ids = [record.id for record in records]
+        else:
+            ids = self._ids
+        start = bisect.bisect_right(ids, after_id) if after_id is not None else 0
+        items = records[start : start + limit]
+        has_more = start + limit < len(records)
+        return StudentPage(
+            items=items,
+            next_cursor=items[-1].id if has_more else None,
+            total=len(records),
+        )
+
+
+class StudentDirectory:
+    def __init__(self, refresh_interval: float = 300.0):
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._index: Optional[StudentIndex] = None
+        self._loaded_at = 0.0
+
+    def get_index(self, hive_client: HiveClient) -> StudentIndex:
+        index = self._index
+        if (
+            index is None
+            or time.monotonic() - self._loaded_at >= self._refresh_interval
+        ):
+            index = self._reload(hive_client)
+        return index
+
+    def peek_index(self) -> Optional[StudentIndex]:
+        index = self._index
+        if (
+            index is None
+            or time.monotonic() - self._loaded_at >= self._refresh_interval
+        ):
+            return None
+        return index
+
+    def exists(self, student_id: int, hive_client: HiveClient) -> bool:
+        index = self.get_index(hive_client)
+        if index.contains(student_id):
+            return True
+        if hive_client.is_resource_exist("user", student_id):
+            index.remember(student_id)
+            return True
+        return False
+
+    def invalidate(self) -> None:
+        self._loaded_at = 0.0
+
+    def _reload(self, hive_client: HiveClient) -> StudentIndex:
+        with self._lock:
+            if (
+                self._index is not None
+                and time.monotonic() - self._loaded_at < self._refresh_interval
+            ):
+                return self._index
+            self._index = StudentIndex(
+                StudentRecord.from_user(user)
+                for user in hive_client.get_users_by_clearance(ClearanceLevel.HANICH)
+            )
+            self._loaded_at = time.monotonic()
+            return self._index
@@ -0,0 +1,156 @@
+import asyncio
+from typing import List, NamedTuple, Optional
+
+from evaluer.common.clients.hive import HiveClient
+from evaluer.common.models.hive import (
+    Assignment,
+    AssignmentResponse,
+    AssignmentResponseType,
+)
+from evaluer.common.repositories.responses import HiveResponseRepository
+from evaluer.common.repositories.sync import AssignmentSyncStateRepository, SyncState
+from evaluer.common.services.grades import GradeService
+
+
+class SyncReport(NamedTuple):
+    assignments: int
+    changed: int
+    responses: int
+
+
+class AutoGradeSync:
+    def __init__(
+        self,
+        grade_service: GradeService,
+        sync_states: AssignmentSyncStateRepository,
+        hive_responses: Optional[HiveResponseRepository] = None,
+    ):
+        self._grade_service = grade_service
+        self._sync_states = sync_states
+        self._hive_responses = hive_responses
+
+    async def run(
+        self,
+        hive_client: HiveClient,
+        student_id: Optional[int] = None,
+        full: bool = False,
+    ) -> SyncReport:
+        assignments = await asyncio.to_thread(
+            hive_client.get_assignments, user_id=student_id
+        )
+        states = await self._sync_states.get_states(student_id)
+        changed = responses = 0
+        for assignment in assignments:
+            previous = states.get(assignment.id)
+            if (
+                not full
+                and previous is not None
+                and previous.check_count == assignment.total_check_count
+            ):
+                continue
+            changed += 1
+            responses += await self._sync_assignment(
+                assignment, None if full else previous, previous, hive_client
+            )
+        await self.mark_graded_responses()
+        return SyncReport(
+            assignments=len(assignments), changed=changed, responses=responses
+        )
+
+    async def sync_assignment(
+        self, student_id: int, assignment_id: int, hive_client: HiveClient
+    ) -> int:
+        assignment = await asyncio.to_thread(
+            hive_client.get_assignment_by_id, assignment_id
+        )
+        if assignment.user != student_id:
+            raise ValueError(
+                f"Assignment {assignment_id} does not belong to student {student_id}"
+            )
+        previous = await self._sync_states.get_state(assignment_id)
+        return await self._sync_assignment(
+            assignment, previous, previous, hive_client
+        )
+
+    async def mark_graded_responses(self) -> None:
+        if self._hive_responses is not None:
+            await self._hive_responses.mark_graded()
+
+    async def _sync_assignment(
+        self,
+        assignment: Assignment,
+        base: Optional[SyncState],
+        previous: Optional[SyncState],
+        hive_client: HiveClient,
+    ) -> int:
+        since = base.last_response_at if base is not None else None
+        fetched_responses = await asyncio.to_thread(
+            hive_client.get_assignment_responses,
+            assignment_id=assignment.id,
+            user_id=assignment.user,
+            response_types=(AssignmentResponseType.REDO, AssignmentResponseType.DONE),
+            since=since,
+        )
+        new_responses = [
+            response
+            for response in fetched_responses
+            if since is None or response.date > since
+        ]
+        state = SyncState(
+            assignment_id=assignment.id,
+            student_id=assignment.user,
+            check_count=assignment.total_check_count,
+            redo_count=(base.redo_count if base is not None else 0)
+            + sum(
+                1
+                for response in new_responses
+                if response.response_type == AssignmentResponseType.REDO
+            ),
+            done_count=(base.done_count if base is not None else 0)
+            + sum(
+                1
+                for response in new_responses
+                if response.response_type == AssignmentResponseType.DONE
+            ),
+            last_response_at=max(
+                (response.date for response in new_responses), default=since
+            ),
+        )
+        if new_responses:
+            await self._grade_service.apply_auto_grade(
+                student_id=state.student_id,
+                assignment_id=state.assignment_id,
+                redo_count=state.redo_count,
+                done_count=state.done_count,
+                hive_client=hive_client,
+            )
+        if new_responses and self._hive_responses is not None:
+            await self._mirror_responses(assignment, new_responses, hive_client)
+        await self._sync_states.save_state(state, previous)
+        return len(new_responses)
+
+    async def _mirror_responses(
+        self,
+        assignment: Assignment,
+        responses: List[AssignmentResponse],
+        hive_client: HiveClient,
+    ) -> None:
+        ancestry = await asyncio.to_thread(
+            self._grade_service.resolve_assignment, assignment.id, hive_client
+        )
+        if ancestry is None:
+            return
+        await self._hive_responses.mirror(
+            [
+                {
+                    "response_id": response.id,
+                    "assignment_id": assignment.id,
+                    "student_id": assignment.user,
+                    "module_id": ancestry.module_id,
+                    "subject_id": ancestry.subject_id,
+                    "response_type": response.response_type.value,
+                    "submitted_at": response.date,
+                }
+                for response in responses
+            ]
+        )
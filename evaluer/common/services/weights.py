@@ -1,8 +1,22 @@
+import hashlib
+import logging
+import marshal
+import os
+import sys
+import threading
+import time
 from pathlib import Path
-from typing import Dict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Set
 import yaml
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"EVWS2"
+SNAPSHOT_INTERPRETER = bytes((*sys.version_info[:2], marshal.version))
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class WeightConfig(BaseModel):
     name: str
@@ -30,37 +44,223 @@ class WeightsConfiguration(BaseModel):
         if not weights_file.exists():
             return cls()
 
-        with weights_file.open("r", encoding="utf-8") as file:
-            data = yaml.safe_load(file)
+        source = weights_file.read_bytes()
+        digest = hashlib.sha256(source).digest()
+        snapshot_file = snapshot_path_for(weights_file)
+
+        data = _read_snapshot(snapshot_file, digest)
+        if data is None:
+            data = yaml.load(source, Loader=YamlLoader) or {}
+            _write_snapshot(snapshot_file, digest, data)
 
         return cls(**data)
 
+    @classmethod
+    def compile_snapshot(cls, config_path: Path) -> Path:
+        source = config_path.read_bytes()
+        data = yaml.load(source, Loader=YamlLoader) or {}
+        cls(**data)
+        snapshot_file = snapshot_path_for(config_path)
+        _write_snapshot(snapshot_file, hashlib.sha256(source).digest(), data)
+        return snapshot_file
+
+
+def snapshot_path_for(config_path: Path) -> Path:
+    return config_path.with_name(f".{config_path.name}.snapshot")
+
+
+def _snapshot_header(digest: bytes) -> bytes:
+    return SNAPSHOT_MAGIC + SNAPSHOT_INTERPRETER + digest
+
+
+def _read_snapshot(snapshot_file: Path, digest: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        payload = snapshot_file.read_bytes()
+    except OSError:
+        return None
+
+    header = _snapshot_header(digest)
+    if not payload.startswith(header):
+        return None
+
+    try:
+        return marshal.loads(payload[len(header) :])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_snapshot(snapshot_file: Path, digest: bytes, data: Dict[str, Any]) -> None:
+    temporary_file = snapshot_file.with_name(f"{snapshot_file.name}.{os.getpid()}.tmp")
+    try:
+        temporary_file.write_bytes(_snapshot_header(digest) + marshal.dumps(data))
+        os.replace(temporary_file, snapshot_file)
+    except (OSError, ValueError) as error:
+        logger.warning("Could not write weights snapshot %s: %s", snapshot_file, error)
+        temporary_file.unlink(missing_ok=True)
+
 
 class WeightProvider:
-    def __init__(self, weights_configuration: WeightsConfiguration):
+    def __init__(self, weights_configuration: WeightsConfiguration, version: int = 0):
         self._weights_configuration = weights_configuration
+        self._version = version
+
+        subjects = weights_configuration.subjects
+        self._subject_weights = MappingProxyType(
+            {subject_id: subject.weight for subject_id, subject in subjects.items()}
+        )
+        self._module_weights_by_subject: Dict[int, Mapping[int, float]] = {}
+        self._exercise_weights_by_module: Dict[int, Mapping[int, float]] = {}
+        self._subject_by_module: Dict[int, int] = {}
+        self._module_by_exercise: Dict[int, int] = {}
+
+        for subject_id, subject in subjects.items():
+            self._module_weights_by_subject[subject_id] = MappingProxyType(
+                {module_id: module.weight for module_id, module in subject.modules.items()}
+            )
+            for module_id, module in subject.modules.items():
+                self._subject_by_module[module_id] = subject_id
+                self._exercise_weights_by_module[module_id] = MappingProxyType(
+                    {
+                        exercise_id: exercise.weight
+                        for exercise_id, exercise in module.exercises.items()
+                    }
+                )
+                for exercise_id in module.exercises:
+                    self._module_by_exercise[exercise_id] = module_id
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def configuration(self) -> WeightsConfiguration:
+        return self._weights_configuration
+
+    def get_exercise_weights_for_module(self, module_id: int) -> Mapping[int, float]:
+        return self._exercise_weights_by_module.get(module_id, MappingProxyType({}))
+
+    def get_module_weights_for_subject(self, subject_id: int) -> Mapping[int, float]:
+        return self._module_weights_by_subject.get(subject_id, MappingProxyType({}))
 
-    def get_exercise_weights_for_module(self, module_id: int) -> Dict[int, float]:
-        for subject in self._weights_configuration.subjects.values():
-            if module_id in subject.modules:
-                module_config = subject.modules[module_id]
-                return {
-                    exercise_id: exercise_config.weight
-                    for exercise_id, exercise_config in module_config.exercises.items()
-                }
-        return {}
-
-    def get_module_weights_for_subject(self, subject_id: int) -> Dict[int, float]:
-        if subject_id in self._weights_configuration.subjects:
-            subject_config = self._weights_configuration.subjects[subject_id]
-            return {
-                module_id: module_config.weight
-                for module_id, module_config in subject_config.modules.items()
-            }
-        return {}
-
-    def get_subject_weights(self) -> Dict[int, float]:
-        return {
-            subject_id: subject_config.weight
-            for subject_id, subject_config in self._weights_configuration.subjects.items()
+    def get_subject_weights(self) -> Mapping[int, float]:
+        return self._subject_weights
+
+    def get_module_ids(self) -> Set[int]:
+        return set(self._subject_by_module)
+
+    def get_subject_for_module(self, module_id: int) -> Optional[int]:
+        return self._subject_by_module.get(module_id)
+
+    def get_module_for_exercise(self, exercise_id: int) -> Optional[int]:
+        return self._module_by_exercise.get(exercise_id)
+
+
+class WeightChanges(NamedTuple):
+    module_ids: Set[int]
+    subject_ids: Set[int]
+    subjects_changed: bool
+
+    @classmethod
+    def between(cls, previous: WeightProvider, current: WeightProvider) -> "WeightChanges":
+        previous_subjects = previous.configuration.subjects
+        current_subjects = current.configuration.subjects
+        module_ids = {
+            module_id
+            for module_id in previous.get_module_ids() | current.get_module_ids()
+            if previous.get_exercise_weights_for_module(module_id)
+            != current.get_exercise_weights_for_module(module_id)
+        }
+        subject_ids = {
+            subject_id
+            for subject_id in previous_subjects.keys() | current_subjects.keys()
+            if previous.get_module_weights_for_subject(subject_id)
+            != current.get_module_weights_for_subject(subject_id)
         }
+        subjects_changed = previous.get_subject_weights() != current.get_subject_weights()
+        return cls(
+            module_ids=module_ids,
+            subject_ids=subject_ids,
+            subjects_changed=subjects_changed,
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.module_ids or self.subject_ids or self.subjects_changed)
+
+
+class WeightsRegistry:
+    def __init__(self, config_path: Optional[Path], check_interval: float = 1.0):
+        self._config_path = Path(config_path) if config_path else None
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self._provider: Optional[WeightProvider] = None
+        self._loaded_mtime_ns: Optional[int] = None
+        self._checked_at = 0.0
+
+    @property
+    def version(self) -> int:
+        return self.get_provider().version
+
+    def get_provider(self) -> WeightProvider:
+        provider = self._provider
+        if self._config_path is None:
+            if provider is None:
+                raise RuntimeError("No weights have been published yet")
+            return provider
+
+        if (
+            provider is None
+            or time.monotonic() - self._checked_at >= self._check_interval
+        ):
+            provider = self._reload_if_changed()
+        return provider
+
+    def publish(
+        self,
+        weights_configuration: WeightsConfiguration,
+        version: Optional[int] = None,
+    ) -> WeightProvider:
+        with self._lock:
+            return self._swap(weights_configuration, version)
+
+    def _reload_if_changed(self) -> WeightProvider:
+        with self._lock:
+            self._checked_at = time.monotonic()
+            mtime_ns = self._current_mtime_ns()
+            if self._provider is not None and mtime_ns == self._loaded_mtime_ns:
+                return self._provider
+
+            try:
+                weights_configuration = WeightsConfiguration.from_yaml(
+                    str(self._config_path)
+                )
+            except Exception:
+                if self._provider is None:
+                    raise
+                self._loaded_mtime_ns = mtime_ns
+                logger.exception(
+                    "Failed to reload weights from %s, keeping version %s",
+                    self._config_path,
+                    self._provider.version,
+                )
+                return self._provider
+
+            self._loaded_mtime_ns = mtime_ns
+            return self._swap(weights_configuration)
+
+    def _swap(
+        self,
+        weights_configuration: WeightsConfiguration,
+        version: Optional[int] = None,
+    ) -> WeightProvider:
+        if version is None:
+            version = self._provider.version + 1 if self._provider else 1
+        elif self._provider is not None and version < self._provider.version:
+            return self._provider
+        self._provider = WeightProvider(weights_configuration, version=version)
+        return self._provider
+
+    def _current_mtime_ns(self) -> Optional[int]:
+        try:
+            return self._config_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,141 @@
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from evaluer.common.database.locks import lock_weights
+from evaluer.common.repositories.history import GradeHistoryRepository
+from evaluer.common.repositories.weights import WeightsRepository
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.grades import GradeService
+from evaluer.common.services.history import GradeHistoryService
+from evaluer.common.services.weights import (
+    WeightChanges,
+    WeightProvider,
+    WeightsConfiguration,
+    WeightsRegistry,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseWeightsStore:
+    def __init__(
+        self,
+        registry: WeightsRegistry,
+        session_factory: async_sessionmaker[AsyncSession],
+        grading_calculator: GradingCalculator,
+        seed_config_path: Optional[Path] = None,
+        history_snapshot_interval: int = 50,
+    ):
+        self._registry = registry
+        self._session_factory = session_factory
+        self._grading_calculator = grading_calculator
+        self._seed_config_path = seed_config_path
+        self._history_snapshot_interval = history_snapshot_interval
+
+    async def load_latest(self) -> WeightProvider:
+        async with self._session_factory() as db:
+            repository = WeightsRepository(db)
+            version = await repository.get_latest_version()
+            if version is None:
+                await lock_weights(db)
+                version = await repository.get_latest_version()
+            if version is None:
+                weights_configuration = WeightsConfiguration.from_yaml(
+                    str(self._seed_config_path)
+                )
+                version = await repository.create_version(
+                    weights_configuration,
+                    description="Seeded from weights file",
+                    recalculated=True,
+                )
+            else:
+                weights_configuration = await repository.load(version)
+
+        return self._registry.publish(weights_configuration, version=version)
+
+    async def handle_weights_changed(self, payload: str) -> None:
+        current = self._registry.get_provider()
+        if int(payload) <= current.version:
+            return
+        provider = await self.load_latest()
+        logger.info(
+            "Weights updated from version %s to %s", current.version, provider.version
+        )
+
+    async def handle_reconnect(self) -> None:
+        await self.load_latest()
+
+    async def update(
+        self,
+        weights_configuration: WeightsConfiguration,
+        description: Optional[str] = None,
+    ) -> Tuple[int, WeightChanges]:
+        async with self._session_factory() as db:
+            repository = WeightsRepository(db)
+            await lock_weights(db)
+            previous = await self._load_provider(
+                repository, await repository.get_latest_version()
+            )
+            version = await repository.create_version(
+                weights_configuration, description=description
+            )
+        self._registry.publish(weights_configuration, version=version)
+        current = WeightProvider(weights_configuration, version=version)
+        return version, WeightChanges.between(previous, current)
+
+    async def recalculate_pending(self) -> WeightChanges:
+        async with self._session_factory() as db:
+            repository = WeightsRepository(db)
+            pending = await repository.claim_pending_versions()
+            if not pending:
+                return WeightChanges(set(), set(), False)
+            previous = await self._load_provider(
+                repository, await repository.get_previous_version(pending[0])
+            )
+            current = await self._load_provider(repository, pending[-1])
+            changes = WeightChanges.between(previous, current)
+            latest = await self._load_provider(
+                repository, await repository.get_latest_version()
+            )
+            await self._recalculate(changes, latest)
+            await repository.mark_recalculated(pending)
+            await db.commit()
+        return changes
+
+    async def resume_recalculations(self) -> None:
+        try:
+            await self.recalculate_pending()
+        except Exception:
+            logger.exception("Failed to resume pending weight recalculations")
+
+    async def _load_provider(
+        self, repository: WeightsRepository, version: Optional[int]
+    ) -> WeightProvider:
+        if version is None:
+            return WeightProvider(WeightsConfiguration(), version=0)
+        return WeightProvider(await repository.load(version), version=version)
+
+    async def _recalculate(
+        self, changes: WeightChanges, weight_provider: WeightProvider
+    ) -> None:
+        if not changes:
+            return
+        async with self._session_factory() as db:
+            grade_service = GradeService.create(
+                db=db,
+                weight_provider=weight_provider,
+                grading_calculator=self._grading_calculator,
+                grade_history=GradeHistoryService(
+                    GradeHistoryRepository(db), self._history_snapshot_interval
+                ),
+            )
+            await grade_service.recalculate_for_weight_changes(changes)
+        logger.info(
+            "Recalculated grades for modules %s, subjects %s, overall=%s",
+            sorted(changes.module_ids),
+            sorted(changes.subject_ids),
+            changes.subjects_changed,
+        )
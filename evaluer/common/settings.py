@@ -1,5 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal, Optional
 
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -9,14 +10,34 @@ class HiveSettings(BaseModel):
     base_url: str
     username: str
     password: str
+    course_refresh_seconds: float = 300.0
+    student_refresh_seconds: float = 300.0
+    webhook_secret: Optional[str] = None
+    webhook_debounce_seconds: float = 1.0
+    webhook_queue_size: int = 10_000
 
 
 class DatabaseSettings(BaseModel):
     url: str
+    replica_url: Optional[str] = None
+    read_your_writes_seconds: float = 5.0
+    grade_hash_partitions: int = 8
+    history_months_ahead: int = 3
+    partition_check_seconds: float = 3600.0
+    archive_schema: str = "archive"
 
 
 class GradingSettings(BaseModel):
     weights_config_path: Path = Path("config/weights.yaml")
+    weights_reload_interval_seconds: float = 1.0
+    weights_source: Literal["file", "database"] = "file"
+    grade_cache_size: int = 100_000
+    grade_cache_ttl_seconds: float = 30.0
+    grade_stream_buffer_size: int = 1000
+    grade_stream_queue_size: int = 256
+    grade_stream_heartbeat_seconds: float = 15.0
+    history_snapshot_interval: int = 50
+    aggregate_shards: int = 16
 
 
 class Settings(BaseSettings):
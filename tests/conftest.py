@@ -0,0 +1,58 @@
+import os
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+TEST_DATABASE_URL = os.environ.get("EVALUER_TEST_DATABASE_URL")
+
+# The settings are read at import time, so they must be in place before any
+# evaluer module is imported. The test database always wins over .env.
+if TEST_DATABASE_URL:
+    os.environ["DATABASE__URL"] = TEST_DATABASE_URL
+os.environ.setdefault("DATABASE__URL", "postgresql+asyncpg://evaluer@localhost/test")
+os.environ.setdefault("HIVE__BASE_URL", "http://hive.invalid")
+os.environ.setdefault("HIVE__USERNAME", "test")
+os.environ.setdefault("HIVE__PASSWORD", "test")
+
+from evaluer.common.database.models import Base  # noqa: E402
+from evaluer.common.database.partitions import ensure_partitions  # noqa: E402
+
+_schema_ready = False
+
+
+@pytest.fixture
+def database_url() -> str:
+    if not TEST_DATABASE_URL:
+        pytest.skip("EVALUER_TEST_DATABASE_URL is not set")
+    return TEST_DATABASE_URL
+
+
+@pytest_asyncio.fixture
+async def engine(database_url):
+    global _schema_ready
+    engine = create_async_engine(database_url, poolclass=NullPool)
+    if not _schema_ready:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+            await ensure_partitions(connection, hash_partitions=4, months_ahead=1)
+        _schema_ready = True
+    try:
+        yield engine
+    finally:
+        async with engine.begin() as connection:
+            tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+            await connection.execute(text(f"TRUNCATE {tables} RESTART IDENTITY"))
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(engine):
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with session_factory() as session:
+        yield session
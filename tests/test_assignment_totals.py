@@ -0,0 +1,118 @@
+import pytest
+
+from evaluer.common.repositories.grading import (
+    AssignmentGradeRepository,
+    ResponseGradeRepository,
+)
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.grades import GradeService
+from evaluer.common.services.weights import WeightProvider, WeightsConfiguration
+
+STUDENT_ID, SUBJECT_ID, MODULE_ID, ASSIGNMENT_ID = 7, 1, 10, 100
+
+
+@pytest.fixture
+def grade_service(db) -> GradeService:
+    weight_provider = WeightProvider(
+        WeightsConfiguration(
+            subjects={
+                SUBJECT_ID: {
+                    "name": "Python",
+                    "modules": {
+                        MODULE_ID: {
+                            "name": "Basics",
+                            "exercises": {ASSIGNMENT_ID: {"name": "Loops"}},
+                        }
+                    },
+                }
+            }
+        )
+    )
+    return GradeService.create(db, weight_provider, GradingCalculator())
+
+
+async def update_response(grade_service: GradeService, response_id: int, grade: float):
+    await grade_service.update_response_grade(
+        student_id=STUDENT_ID,
+        response_id=response_id,
+        assignment_id=ASSIGNMENT_ID,
+        module_id=MODULE_ID,
+        subject_id=SUBJECT_ID,
+        new_grade=grade,
+    )
+
+
+async def assert_assignment_grade(db, expected_grades):
+    calculator = GradingCalculator()
+    expected = sum(
+        calculator.penalize_response_grade(grade, ordinal)
+        for ordinal, grade in enumerate(expected_grades)
+    ) / len(expected_grades)
+    stored = await AssignmentGradeRepository(db).get_grade(
+        student_id=STUDENT_ID, assignment_id=ASSIGNMENT_ID
+    )
+    assert stored == pytest.approx(expected)
+
+
+@pytest.mark.asyncio
+async def test_incremental_updates_match_full_recompute(db, grade_service):
+    await update_response(grade_service, 1, 9.0)
+    await update_response(grade_service, 2, 6.0)
+    await update_response(grade_service, 3, 8.0)
+    await update_response(grade_service, 2, 10.0)
+    await update_response(grade_service, 5, 7.0)
+    await update_response(grade_service, 4, 4.0)
+
+    await assert_assignment_grade(db, [9.0, 10.0, 8.0, 4.0, 7.0])
+    totals = await AssignmentGradeRepository(db).get_response_totals(
+        student_id=STUDENT_ID, assignment_id=ASSIGNMENT_ID
+    )
+    assert totals.response_count == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("copy_threshold", [1, 20000], ids=["copy", "insert"])
+async def test_bulk_regrade_resets_running_totals(db, grade_service, copy_threshold):
+    await update_response(grade_service, 1, 9.0)
+    await update_response(grade_service, 2, 6.0)
+    await update_response(grade_service, 3, 8.0)
+
+    response_grade_repo = ResponseGradeRepository(db)
+    response_grade_repo.copy_threshold = copy_threshold
+    await response_grade_repo.bulk_upsert(
+        [
+            {
+                "student_id": STUDENT_ID,
+                "response_id": 1,
+                "assignment_id": ASSIGNMENT_ID,
+                "grade": 3.0,
+            }
+        ]
+    )
+    totals = await AssignmentGradeRepository(db).get_response_totals(
+        student_id=STUDENT_ID, assignment_id=ASSIGNMENT_ID
+    )
+    assert totals == (None, None)
+
+    await update_response(grade_service, 3, 5.0)
+    await assert_assignment_grade(db, [3.0, 6.0, 5.0])
+
+
+@pytest.mark.asyncio
+async def test_assignment_override_resets_running_totals(db, grade_service):
+    await update_response(grade_service, 1, 9.0)
+    await update_response(grade_service, 2, 6.0)
+
+    await grade_service.set_assignment_grade(
+        student_id=STUDENT_ID,
+        assignment_id=ASSIGNMENT_ID,
+        module_id=MODULE_ID,
+        grade=10.0,
+    )
+    totals = await AssignmentGradeRepository(db).get_response_totals(
+        student_id=STUDENT_ID, assignment_id=ASSIGNMENT_ID
+    )
+    assert totals == (None, None)
+
+    await update_response(grade_service, 3, 8.0)
+    await assert_assignment_grade(db, [9.0, 6.0, 8.0])
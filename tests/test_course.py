@@ -0,0 +1,119 @@
+import json
+from http import HTTPStatus
+
+from starlette.requests import Request
+
+from evaluer.api.routers import course
+from evaluer.common.models.hive import CourseUser, Exercise, Module, Subject
+from evaluer.common.services.course import CourseTreeCache
+from evaluer.common.services.students import StudentDirectory
+from evaluer.common.services.weights import WeightProvider, WeightsConfiguration
+
+
+class CourseHiveClient:
+    def __init__(self, subject_name: str = "Python"):
+        self.subject_name = subject_name
+
+    def get_subjects(self):
+        return [Subject(id=1, name=self.subject_name)]
+
+    def get_modules(self):
+        return [Module(id=10, name="Basics", parent_subject=1)]
+
+    def get_exercises(self):
+        return [Exercise(id=100, name="Loops", parent_module=10)]
+
+    def get_users_by_clearance(self, clearance):
+        return [CourseUser(id=7, display_name="Ada", username="ada")]
+
+
+def build_provider(subject_weight: float = 1.0) -> WeightProvider:
+    return WeightProvider(
+        WeightsConfiguration(
+            subjects={1: {"name": "Python", "weight": subject_weight}}
+        ),
+        version=1,
+    )
+
+
+def test_tree_version_follows_the_course_content():
+    first = CourseTreeCache().get_tree(CourseHiveClient(), build_provider())
+    same = CourseTreeCache().get_tree(CourseHiveClient(), build_provider())
+    renamed = CourseTreeCache().get_tree(
+        CourseHiveClient(subject_name="Python 3"), build_provider()
+    )
+    reweighted = CourseTreeCache().get_tree(
+        CourseHiveClient(), build_provider(subject_weight=2.0)
+    )
+
+    assert first.version == same.version
+    assert renamed.version != first.version
+    assert reweighted.version != first.version
+
+
+def build_request(if_none_match=None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def refuse_hive_client():
+    raise AssertionError("Hive was called while the course cache was fresh")
+
+
+def test_course_endpoints_revalidate_without_calling_hive():
+    course_tree_cache = CourseTreeCache(refresh_interval=300)
+    first = course.get_course_modules_by_subject(
+        build_request(),
+        subject_id=1,
+        hive_client_factory=CourseHiveClient,
+        course_tree_cache=course_tree_cache,
+    )
+
+    revalidated = course.get_course_modules_by_subject(
+        build_request(first.headers["etag"]),
+        subject_id=1,
+        hive_client_factory=refuse_hive_client,
+        course_tree_cache=course_tree_cache,
+    )
+    other_subject = course.get_course_modules_by_subject(
+        build_request(first.headers["etag"]),
+        subject_id=2,
+        hive_client_factory=refuse_hive_client,
+        course_tree_cache=course_tree_cache,
+    )
+
+    assert first.status_code == HTTPStatus.OK
+    assert json.loads(first.body) == [
+        {"id": 10, "name": "Basics", "parent_subject": 1}
+    ]
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+    assert other_subject.status_code == HTTPStatus.OK
+    assert json.loads(other_subject.body) == []
+
+
+def test_student_pages_revalidate_without_calling_hive():
+    student_directory = StudentDirectory(refresh_interval=300)
+    first = course.get_course_students(
+        build_request(),
+        search="ad",
+        username=None,
+        cursor=None,
+        limit=50,
+        hive_client_factory=CourseHiveClient,
+        student_directory=student_directory,
+    )
+
+    revalidated = course.get_course_students(
+        build_request(first.headers["etag"]),
+        search="ad",
+        username=None,
+        cursor=None,
+        limit=50,
+        hive_client_factory=refuse_hive_client,
+        student_directory=student_directory,
+    )
+
+    assert json.loads(first.body)["total"] == 1
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
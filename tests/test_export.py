@@ -0,0 +1,89 @@
+from collections import Counter
+
+import pytest
+
+from evaluer.common.models.grades import GradeLevel
+from evaluer.common.models.hive import Assignment, Exercise, Module, Subject
+from evaluer.common.services.course import CourseHierarchyResolver, CourseTreeCache
+from evaluer.common.services.export import (
+    EXPORT_COLUMNS,
+    CourseNameIndex,
+    CsvGradebookEncoder,
+    GradebookEncoder,
+)
+
+
+class CountingHiveClient:
+    def __init__(self):
+        self.calls = Counter()
+
+    def get_subjects(self):
+        self.calls["subjects"] += 1
+        return [Subject(id=1, name="Python")]
+
+    def get_modules(self):
+        self.calls["modules"] += 1
+        return [Module(id=10, name="Basics", parent_subject=1)]
+
+    def get_exercises(self):
+        self.calls["exercises"] += 1
+        return [Exercise(id=100, name="Loops", parent_module=10)]
+
+    def get_assignments(self):
+        self.calls["assignments"] += 1
+        return [Assignment(id=1000, user=7, exercise=100)]
+
+
+def build_course_names(hive_client, course_tree_cache, course_hierarchy):
+    return CourseNameIndex.from_course(
+        course_tree_cache.get_components(hive_client),
+        course_hierarchy.get_hierarchy(hive_client),
+    )
+
+
+def test_course_names_come_from_the_course_caches():
+    hive_client = CountingHiveClient()
+    course_tree_cache = CourseTreeCache(refresh_interval=300)
+    course_hierarchy = CourseHierarchyResolver(refresh_interval=300)
+
+    build_course_names(hive_client, course_tree_cache, course_hierarchy)
+    calls_after_first_export = Counter(hive_client.calls)
+    course_names = build_course_names(
+        hive_client, course_tree_cache, course_hierarchy
+    )
+
+    assert course_names.describe(
+        GradeLevel.ASSIGNMENT,
+        {"student_id": 7, "assignment_id": 1000, "grade": 9.5},
+    ) == {
+        "level": GradeLevel.ASSIGNMENT.value,
+        "student_id": 7,
+        "subject_id": 1,
+        "subject_name": "Python",
+        "module_id": 10,
+        "module_name": "Basics",
+        "assignment_id": 1000,
+        "exercise_name": "Loops",
+        "response_id": None,
+        "grade": 9.5,
+        "updated_at": None,
+    }
+    assert hive_client.calls == calls_after_first_export
+
+
+def test_encoders_must_implement_encode():
+    with pytest.raises(TypeError):
+        GradebookEncoder()
+
+
+def test_csv_encoder_writes_header_and_rows():
+    encoder = CsvGradebookEncoder()
+    row = dict.fromkeys(EXPORT_COLUMNS)
+    row.update(level="overall", student_id=7, grade=8.0)
+
+    output = encoder.begin() + encoder.encode([row]) + encoder.finish()
+
+    assert output.decode().splitlines() == [
+        ",".join(EXPORT_COLUMNS),
+        "overall,7,,,,,,,,8.0,",
+    ]
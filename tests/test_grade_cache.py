@@ -0,0 +1,37 @@
+from evaluer.common.models.grades import GradeLevel
+from evaluer.common.services import grade_cache
+from evaluer.common.services.grade_cache import GradeCache
+
+KEY = (GradeLevel.MODULE, 7, 10)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(grade_cache.time, "monotonic", clock)
+    cache = GradeCache(max_entries=10, ttl_seconds=30.0)
+
+    cache.set(KEY, 8.5, cache.generation)
+    clock.now += 29.0
+    assert cache.get(KEY) == 8.5
+
+    clock.now += 1.0
+    assert cache.get(KEY) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidated_fill_is_not_cached():
+    cache = GradeCache(max_entries=10)
+    generation = cache.generation
+
+    cache.invalidate([KEY])
+    cache.set(KEY, 8.5, generation)
+
+    assert cache.get(KEY) is None
@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from evaluer.common.database.models import GradeSnapshot
+from evaluer.common.models.grades import GradeLevel
+from evaluer.common.repositories.history import GradeHistoryRepository
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.grades import GradeService
+from evaluer.common.services.history import GradeHistoryService
+from evaluer.common.services.weights import WeightProvider, WeightsConfiguration
+
+STUDENT_ID, SUBJECT_ID, MODULE_ID = 5, 1, 10
+ASSIGNMENT_IDS = (100, 101)
+
+
+def build_grade_service(db, snapshot_interval: int) -> GradeService:
+    weight_provider = WeightProvider(
+        WeightsConfiguration(
+            subjects={
+                SUBJECT_ID: {
+                    "name": "Python",
+                    "modules": {
+                        MODULE_ID: {
+                            "name": "Basics",
+                            "exercises": {
+                                100: {"name": "Loops", "weight": 2.0},
+                                101: {"name": "Functions"},
+                            },
+                        }
+                    },
+                }
+            }
+        )
+    )
+    return GradeService.create(
+        db,
+        weight_provider,
+        GradingCalculator(),
+        grade_history=GradeHistoryService(
+            GradeHistoryRepository(db), snapshot_interval
+        ),
+    )
+
+
+async def record_updates(grade_service: GradeService, count: int):
+    marks = []
+    for index in range(count):
+        assignment_id = ASSIGNMENT_IDS[index % 2]
+        await grade_service.update_response_grade(
+            student_id=STUDENT_ID,
+            response_id=assignment_id * 10 + index % 3,
+            assignment_id=assignment_id,
+            module_id=MODULE_ID,
+            subject_id=SUBJECT_ID,
+            new_grade=1.0 + index % 9,
+        )
+        marks.append(
+            (
+                datetime.now(timezone.utc),
+                await grade_service.get_overall_grade(STUDENT_ID),
+                await grade_service.get_assignment_grade(STUDENT_ID, assignment_id),
+                assignment_id,
+            )
+        )
+    return marks
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("snapshot_interval", [4, 1000], ids=["snapshots", "ledger"])
+async def test_as_of_reads_replay_past_grades(db, snapshot_interval):
+    grade_service = build_grade_service(db, snapshot_interval)
+    marks = await record_updates(grade_service, 24)
+
+    snapshots = await db.scalar(select(func.count()).select_from(GradeSnapshot))
+    assert (snapshots > 0) == (snapshot_interval < 24)
+
+    for as_of, overall, assignment, assignment_id in marks:
+        assert await grade_service.get_overall_grade(
+            STUDENT_ID, as_of=as_of
+        ) == pytest.approx(overall)
+        assert await grade_service.get_assignment_grade(
+            STUDENT_ID, assignment_id, as_of=as_of
+        ) == pytest.approx(assignment)
+
+
+@pytest.mark.asyncio
+async def test_grade_tree_as_of_matches_the_grades_at_that_time(db):
+    grade_service = build_grade_service(db, snapshot_interval=3)
+    marks = await record_updates(grade_service, 6)
+    as_of = marks[2][0]
+    await record_updates(grade_service, 6)
+
+    tree = await grade_service.get_grades_as_of(STUDENT_ID, as_of)
+
+    assert tree[(GradeLevel.OVERALL, None)] == pytest.approx(marks[2][1])
+    assert tree[(GradeLevel.ASSIGNMENT, 100)] == pytest.approx(marks[2][2])
+    assert tree[(GradeLevel.ASSIGNMENT, 101)] == pytest.approx(marks[1][2])
@@ -0,0 +1,81 @@
+import pytest
+
+from evaluer.common.models.grades import GradeChange, GradeLevel
+from evaluer.common.models.hive import Assignment, Exercise, Module
+from evaluer.common.services.course import CourseHierarchyResolver
+from evaluer.common.services.grade_stream import (
+    GRADE_EVENT,
+    GradeChangeBroadcaster,
+    GradeStreamFilters,
+)
+from evaluer.common.services.weights import WeightsConfiguration, WeightsRegistry
+
+STUDENT_ID, SUBJECT_ID, MODULE_ID = 7, 1, 10
+
+
+class CourseHiveClient:
+    def get_assignments(self):
+        return [Assignment(id=1000, user=STUDENT_ID, exercise=100)]
+
+    def get_exercises(self):
+        return [Exercise(id=100, name="Loops", parent_module=MODULE_ID)]
+
+    def get_modules(self):
+        return [Module(id=MODULE_ID, name="Basics", parent_subject=SUBJECT_ID)]
+
+    def get_assignment_by_id(self, assignment_id):
+        return Assignment(id=assignment_id, user=STUDENT_ID, exercise=100)
+
+
+def build_broadcaster():
+    weights_registry = WeightsRegistry(None)
+    weights_registry.publish(WeightsConfiguration())
+    course_hierarchy = CourseHierarchyResolver(refresh_interval=300)
+    course_hierarchy.get_hierarchy(CourseHiveClient())
+    return GradeChangeBroadcaster(
+        weights_registry=weights_registry,
+        course_hierarchy=course_hierarchy,
+        hive_client_factory=CourseHiveClient,
+    )
+
+
+def response_change(*assignment_ids):
+    return GradeChange(
+        level=GradeLevel.RESPONSE,
+        item_column="response_id",
+        rows=[
+            {
+                "student_id": STUDENT_ID,
+                "response_id": assignment_id * 10,
+                "assignment_id": assignment_id,
+                "grade": 9.0,
+            }
+            for assignment_id in assignment_ids
+        ],
+        changed_at=0.0,
+    ).to_payload(["student_id", "response_id", "assignment_id", "grade"])
+
+
+@pytest.mark.asyncio
+async def test_response_events_reach_module_subscribers():
+    broadcaster = build_broadcaster()
+    module_subscription = broadcaster.subscribe(
+        GradeStreamFilters(module_id=MODULE_ID)
+    )
+    subject_subscription = broadcaster.subscribe(
+        GradeStreamFilters(subject_id=SUBJECT_ID)
+    )
+    other_subscription = broadcaster.subscribe(GradeStreamFilters(module_id=11))
+
+    await broadcaster.handle_grade_changes(response_change(1000, 1001))
+
+    for subscription in (module_subscription, subject_subscription):
+        events = [await subscription.get(timeout=0.1) for _ in range(2)]
+        assert [event.event for event in events] == [GRADE_EVENT, GRADE_EVENT]
+        assert [event.data["assignment_id"] for event in events] == [1000, 1001]
+        assert all(
+            event.data["module_id"] == MODULE_ID
+            and event.data["subject_id"] == SUBJECT_ID
+            for event in events
+        )
+    assert await other_subscription.get(timeout=0.01) is None
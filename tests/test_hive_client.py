@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from evaluer.common.clients.hive import HiveClient
+from evaluer.common.models.hive import AssignmentResponse, AssignmentResponseType
+
+ASSIGNMENT_ID = 100
+
+
+def build_response(response_id: int, user_id: int) -> AssignmentResponse:
+    return AssignmentResponse(
+        id=response_id,
+        user=user_id,
+        assignment_id=ASSIGNMENT_ID,
+        contents=[],
+        date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        response_type=AssignmentResponseType.REDO,
+    )
+
+
+class RecordingHiveClient(HiveClient):
+    def __init__(self, honours_filters: bool):
+        super().__init__("http://hive.invalid")
+        self.honours_filters = honours_filters
+        self.requests: List[Optional[Dict[str, Any]]] = []
+
+    def _fetch_assignment_responses(
+        self, assignment_id: int, params: Optional[Dict[str, Any]] = None
+    ) -> List[AssignmentResponse]:
+        self.requests.append(params)
+        responses = [build_response(1, 7), build_response(2, 8)]
+        if params and self.honours_filters:
+            responses = [
+                response
+                for response in responses
+                if response.user == params["user__id"]
+            ]
+        return responses
+
+
+def test_ignored_filters_fall_back_to_local_filtering():
+    hive_client = RecordingHiveClient(honours_filters=False)
+
+    first = hive_client.get_assignment_responses(ASSIGNMENT_ID, user_id=7)
+    second = hive_client.get_assignment_responses(ASSIGNMENT_ID, user_id=8)
+
+    assert [response.id for response in first] == [1]
+    assert [response.id for response in second] == [2]
+    assert hive_client.requests == [{"user__id": 7}, None]
+
+
+def test_fallback_does_not_leak_into_other_clients():
+    RecordingHiveClient(honours_filters=False).get_assignment_responses(
+        ASSIGNMENT_ID, user_id=7
+    )
+    hive_client = RecordingHiveClient(honours_filters=True)
+
+    responses = hive_client.get_assignment_responses(ASSIGNMENT_ID, user_id=8)
+
+    assert [response.id for response in responses] == [2]
+    assert hive_client.requests == [{"user__id": 8}]
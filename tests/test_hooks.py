@@ -0,0 +1,117 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from evaluer.common.models.hive import (
+    Assignment,
+    AssignmentResponse,
+    AssignmentResponseType,
+    Exercise,
+    Module,
+)
+from evaluer.common.repositories.grading import AssignmentGradeRepository
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.hooks import (
+    AutoGradeWorker,
+    sign_payload,
+    verify_signature,
+)
+from evaluer.common.services.weights import WeightsConfiguration, WeightsRegistry
+
+STUDENT_ID, SUBJECT_ID, MODULE_ID = 7, 1, 10
+ASSIGNMENT_IDS = (100, 101, 102, 103)
+HIVE_LATENCY_SECONDS = 0.05
+
+
+class SlowHiveClient:
+    def __init__(self):
+        self.calls = 0
+
+    def _wait(self):
+        self.calls += 1
+        time.sleep(HIVE_LATENCY_SECONDS)
+
+    def get_assignment_by_id(self, assignment_id: int) -> Assignment:
+        self._wait()
+        return Assignment(
+            id=assignment_id,
+            user=STUDENT_ID,
+            exercise=assignment_id,
+            total_check_count=1,
+        )
+
+    def get_exercise_by_id(self, exercise_id: int) -> Exercise:
+        self._wait()
+        return Exercise(id=exercise_id, name="Exercise", parent_module=MODULE_ID)
+
+    def get_module_by_id(self, module_id: int) -> Module:
+        self._wait()
+        return Module(id=module_id, name="Basics", parent_subject=SUBJECT_ID)
+
+    def get_assignment_responses(self, assignment_id: int, user_id: int, **_):
+        self._wait()
+        return [
+            AssignmentResponse(
+                id=assignment_id * 10,
+                user=user_id,
+                assignment_id=assignment_id,
+                contents=[],
+                date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                response_type=AssignmentResponseType.DONE,
+            )
+        ]
+
+
+def test_signature_round_trip():
+    body = b'{"event": "response.created"}'
+    signature = sign_payload("secret", body)
+
+    assert verify_signature("secret", body, signature)
+    assert not verify_signature("other", body, signature)
+    assert not verify_signature("secret", body, None)
+
+
+@pytest.mark.asyncio
+async def test_worker_keeps_the_event_loop_responsive(engine, db):
+    weights_registry = WeightsRegistry(None)
+    weights_registry.publish(WeightsConfiguration())
+    hive_client = SlowHiveClient()
+    worker = AutoGradeWorker(
+        session_factory=async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        ),
+        weights_registry=weights_registry,
+        grading_calculator=GradingCalculator(),
+        hive_client_factory=lambda: hive_client,
+    )
+
+    longest_stall = 0.0
+
+    async def watch_loop():
+        nonlocal longest_stall
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            longest_stall = max(longest_stall, time.perf_counter() - started)
+
+    watcher = asyncio.create_task(watch_loop())
+    try:
+        await worker.process(
+            [(STUDENT_ID, assignment_id) for assignment_id in ASSIGNMENT_IDS]
+        )
+    finally:
+        watcher.cancel()
+
+    assert hive_client.calls >= len(ASSIGNMENT_IDS) * 2
+    assert longest_stall < HIVE_LATENCY_SECONDS
+    assignment_grades = AssignmentGradeRepository(db)
+    for assignment_id in ASSIGNMENT_IDS:
+        assert (
+            await assignment_grades.get_grade(
+                student_id=STUDENT_ID, assignment_id=assignment_id
+            )
+            == 10.0
+        )
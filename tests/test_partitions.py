@@ -0,0 +1,71 @@
+import asyncio
+from datetime import date, datetime, time, timezone
+
+import pytest
+from sqlalchemy import text
+
+from evaluer.common.database.partitions import (
+    ensure_partitions,
+    list_partitions,
+    month_start,
+    monthly_partition_name,
+)
+
+
+async def count_rows(connection, table: str) -> int:
+    result = await connection.execute(text(f"SELECT count(*) FROM {table}"))
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_rows_written_past_the_horizon_move_into_their_month(engine):
+    today = date.today()
+    past_horizon = month_start(today, 3)
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "INSERT INTO grade_changes (level, student_id, grade, changed_at) "
+                "VALUES ('overall', 7, 9.0, :changed_at)"
+            ),
+            {
+                "changed_at": datetime.combine(
+                    past_horizon, time(12), tzinfo=timezone.utc
+                )
+            },
+        )
+        assert await count_rows(connection, "grade_changes_default") == 1
+
+    async with engine.begin() as connection:
+        created = await ensure_partitions(
+            connection, hash_partitions=4, months_ahead=3, today=today
+        )
+
+    month_partition = monthly_partition_name("grade_changes", past_horizon)
+    assert month_partition in created
+    async with engine.connect() as connection:
+        assert await count_rows(connection, "grade_changes_default") == 0
+        assert await count_rows(connection, month_partition) == 1
+        partitions = {
+            partition.name
+            for partition in await list_partitions(connection, "grade_changes")
+        }
+    assert "grade_changes_default" in partitions
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_create_each_partition_once(engine):
+    today = date.today()
+
+    async def ensure():
+        async with engine.begin() as connection:
+            return await ensure_partitions(
+                connection, hash_partitions=4, months_ahead=6, today=today
+            )
+
+    created = await asyncio.gather(*(ensure() for _ in range(4)))
+
+    new_partitions = [name for names in created for name in names]
+    assert len(new_partitions) == len(set(new_partitions))
+    assert monthly_partition_name("grade_changes", month_start(today, 6)) in (
+        new_partitions
+    )
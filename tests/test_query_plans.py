@@ -0,0 +1,285 @@
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+
+from evaluer.common.repositories.grading import (
+    AssignmentGradeRepository,
+    GradeListFilters,
+    ModuleGradeRepository,
+    OverallGradeRepository,
+    ResponseGradeRepository,
+    SubjectGradeRepository,
+)
+from evaluer.common.repositories.responses import HiveResponseRepository
+
+SEEDED_TABLES = (
+    "response_grades",
+    "assignment_grades",
+    "module_grades",
+    "subject_grades",
+    "overall_grades",
+    "hive_responses",
+)
+
+SEED_PARAMETERS = {
+    "students": 4000,
+    "subjects": 4,
+    "modules": 12,
+    "assignments": 40,
+    "responses_per_student": 80,
+}
+
+SEED_STATEMENTS = (
+    """
+    INSERT INTO overall_grades (student_id, grade)
+    SELECT student_id, random() * 10
+    FROM generate_series(1, :students) AS student_id
+    """,
+    """
+    INSERT INTO subject_grades (student_id, subject_id, grade)
+    SELECT student_id, subject_id, random() * 10
+    FROM generate_series(1, :students) AS student_id,
+         generate_series(1, :subjects) AS subject_id
+    """,
+    """
+    INSERT INTO module_grades (student_id, module_id, subject_id, grade)
+    SELECT student_id, module_id, (module_id - 1) % :subjects + 1, random() * 10
+    FROM generate_series(1, :students) AS student_id,
+         generate_series(1, :modules) AS module_id
+    """,
+    """
+    INSERT INTO assignment_grades (student_id, assignment_id, module_id, grade)
+    SELECT student_id, assignment_id, (assignment_id - 1) % :modules + 1,
+           random() * 10
+    FROM generate_series(1, :students) AS student_id,
+         generate_series(1, :assignments) AS assignment_id
+    """,
+    """
+    INSERT INTO response_grades (student_id, response_id, assignment_id, grade)
+    SELECT student_id,
+           (student_id - 1) * CAST(:responses_per_student AS integer)
+               + response_index,
+           (response_index - 1) % CAST(:assignments AS integer) + 1,
+           random() * 10
+    FROM generate_series(1, :students) AS student_id,
+         generate_series(1, :responses_per_student) AS response_index
+    """,
+    """
+    INSERT INTO hive_responses (
+        response_id, assignment_id, student_id, module_id, subject_id,
+        response_type, submitted_at, graded_at
+    )
+    SELECT response_grades.response_id + 1000000,
+           response_grades.assignment_id,
+           response_grades.student_id,
+           (response_grades.assignment_id - 1) % :modules + 1,
+           ((response_grades.assignment_id - 1) % :modules) % :subjects + 1,
+           CASE WHEN response_grades.response_id % 50 = 0
+                THEN 'Redo' ELSE 'Done' END,
+           now() - make_interval(mins => response_grades.response_id),
+           NULL
+    FROM response_grades
+    """,
+)
+
+STUDENT_ID, SUBJECT_ID, MODULE_ID, ASSIGNMENT_ID = 7, 2, 3, 5
+
+LOOKUPS = {
+    "response get_all_for_assignment": lambda db: ResponseGradeRepository(
+        db
+    ).get_all_for_assignment(ASSIGNMENT_ID, STUDENT_ID),
+    "response get_grade": lambda db: ResponseGradeRepository(db).get_grade(
+        student_id=STUDENT_ID, assignment_id=ASSIGNMENT_ID, response_id=5
+    ),
+    "assignment get_all_for_module": lambda db: AssignmentGradeRepository(
+        db
+    ).get_all_for_module(MODULE_ID, STUDENT_ID),
+    "assignment get_grade": lambda db: AssignmentGradeRepository(db).get_grade(
+        student_id=STUDENT_ID, assignment_id=ASSIGNMENT_ID
+    ),
+    "module get_all_for_subject": lambda db: ModuleGradeRepository(
+        db
+    ).get_all_for_subject(SUBJECT_ID, STUDENT_ID),
+    "module get_grade": lambda db: ModuleGradeRepository(db).get_grade(
+        student_id=STUDENT_ID, module_id=MODULE_ID
+    ),
+    "subject get_all_for_student": lambda db: SubjectGradeRepository(
+        db
+    ).get_all_for_student(STUDENT_ID),
+    "subject get_grade": lambda db: SubjectGradeRepository(db).get_grade(
+        student_id=STUDENT_ID, subject_id=SUBJECT_ID
+    ),
+    "overall get": lambda db: OverallGradeRepository(db).get(STUDENT_ID),
+    "response get_student_grades": lambda db: ResponseGradeRepository(
+        db
+    ).get_student_grades(STUDENT_ID),
+    "assignment get_student_grades": lambda db: AssignmentGradeRepository(
+        db
+    ).get_student_grades(STUDENT_ID),
+    "module get_student_grades": lambda db: ModuleGradeRepository(
+        db
+    ).get_student_grades(STUDENT_ID),
+    "subject get_student_grades": lambda db: SubjectGradeRepository(
+        db
+    ).get_student_grades(STUDENT_ID),
+    "overall get_student_grades": lambda db: OverallGradeRepository(
+        db
+    ).get_student_grades(STUDENT_ID),
+    "response get_top_grades": lambda db: ResponseGradeRepository(
+        db
+    ).get_top_grades(10, item_id=5),
+    "assignment get_top_grades": lambda db: AssignmentGradeRepository(
+        db
+    ).get_top_grades(10, item_id=ASSIGNMENT_ID),
+    "module get_top_grades": lambda db: ModuleGradeRepository(db).get_top_grades(
+        10, item_id=MODULE_ID
+    ),
+    "subject get_top_grades": lambda db: SubjectGradeRepository(
+        db
+    ).get_top_grades(10, item_id=SUBJECT_ID),
+    "overall get_top_grades": lambda db: OverallGradeRepository(
+        db
+    ).get_top_grades(10),
+}
+
+# These lookups return columns that no covering index carries, so they must
+# visit the heap. They still have to reach it through an index.
+HEAP_LOOKUPS = {
+    "response get_response": (
+        lambda db: ResponseGradeRepository(db).get_response(STUDENT_ID, 5),
+        "reads ordinal, which only the write path needs",
+    ),
+    "response get_last_response": (
+        lambda db: ResponseGradeRepository(db).get_last_response(
+            STUDENT_ID, ASSIGNMENT_ID
+        ),
+        "reads ordinal, which only the write path needs",
+    ),
+    "assignment get_updated_at": (
+        lambda db: AssignmentGradeRepository(db).get_updated_at(
+            student_id=STUDENT_ID, assignment_id=ASSIGNMENT_ID
+        ),
+        "updated_at changes on every write, covering it would defeat HOT updates",
+    ),
+    "overall get_updated_at": (
+        lambda db: OverallGradeRepository(db).get_updated_at(
+            student_id=STUDENT_ID
+        ),
+        "updated_at changes on every write, covering it would defeat HOT updates",
+    ),
+    "assignment list_page": (
+        lambda db: AssignmentGradeRepository(db).list_page(
+            GradeListFilters(equals={"module_id": MODULE_ID}), limit=50
+        ),
+        "returns every column of the row",
+    ),
+    "response list_page by student": (
+        lambda db: ResponseGradeRepository(db).list_page(
+            GradeListFilters(equals={"student_id": STUDENT_ID}),
+            limit=50,
+            after=(STUDENT_ID, 0),
+        ),
+        "returns every column of the row",
+    ),
+    "hive get_pending_redo": (
+        lambda db: HiveResponseRepository(db).get_pending_redo(limit=50),
+        "returns the mirrored response, the partial index only carries its key",
+    ),
+    "hive get_pending_redo by module": (
+        lambda db: HiveResponseRepository(db).get_pending_redo(
+            module_id=MODULE_ID, limit=50
+        ),
+        "returns the mirrored response, the partial index only carries its key",
+    ),
+}
+
+
+def iter_plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from iter_plan_nodes(child)
+
+
+@pytest_asyncio.fixture
+async def seeded_engine(engine):
+    async with engine.begin() as connection:
+        for statement in SEED_STATEMENTS:
+            await connection.execute(text(statement), SEED_PARAMETERS)
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        for table in SEEDED_TABLES:
+            await connection.execute(text(f"VACUUM ANALYZE {table}"))
+    return engine
+
+
+async def capture_selects(engine, db, lookup) -> List[Tuple[str, Any]]:
+    captured: List[Tuple[str, Any]] = []
+
+    def before_cursor_execute(
+        connection, cursor, statement, parameters, context, executemany
+    ):
+        if statement.lstrip().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await lookup(db)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+async def explain_scans(
+    engine, connection, db, lookup
+) -> List[List[Tuple[str, Optional[str]]]]:
+    plans = []
+    for statement, parameters in await capture_selects(engine, db, lookup):
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        explained = result.scalar_one()
+        if isinstance(explained, str):
+            explained = json.loads(explained)
+        plans.append(
+            [
+                (node["Node Type"], node.get("Index Name"))
+                for node in iter_plan_nodes(explained[0]["Plan"])
+                if "Scan" in node["Node Type"]
+            ]
+        )
+    return plans
+
+
+@pytest.mark.asyncio
+async def test_grade_lookups_use_index_only_scans(seeded_engine, db):
+    fallbacks = {}
+    async with seeded_engine.connect() as connection:
+        for label, lookup in LOOKUPS.items():
+            plans = await explain_scans(seeded_engine, connection, db, lookup)
+            assert plans, f"{label} issued no SELECT"
+            for scans in plans:
+                if not scans or any(
+                    node_type != "Index Only Scan" for node_type, _ in scans
+                ):
+                    fallbacks[label] = scans
+
+    assert not fallbacks
+
+
+@pytest.mark.asyncio
+async def test_heap_lookups_still_use_indexes(seeded_engine, db):
+    fallbacks = {}
+    async with seeded_engine.connect() as connection:
+        for label, (lookup, _reason) in HEAP_LOOKUPS.items():
+            plans = await explain_scans(seeded_engine, connection, db, lookup)
+            assert plans, f"{label} issued no SELECT"
+            for scans in plans:
+                if not scans or any(
+                    node_type == "Seq Scan" for node_type, _ in scans
+                ):
+                    fallbacks[label] = scans
+
+    assert not fallbacks
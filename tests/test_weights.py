@@ -0,0 +1,69 @@
+from evaluer.common.services import weights
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.weights import WeightProvider, WeightsConfiguration
+
+
+def build_provider() -> WeightProvider:
+    return WeightProvider(
+        WeightsConfiguration(
+            subjects={
+                1: {
+                    "name": "Python",
+                    "weight": 3.0,
+                    "modules": {
+                        10: {
+                            "name": "Basics",
+                            "weight": 2.0,
+                            "exercises": {
+                                100: {"name": "Loops", "weight": 4.0},
+                                101: {"name": "Functions", "weight": 1.0},
+                            },
+                        },
+                    },
+                },
+                2: {"name": "C", "weight": 1.0},
+            }
+        )
+    )
+
+
+def test_provider_keeps_configured_weights():
+    provider = build_provider()
+
+    assert dict(provider.get_subject_weights()) == {1: 3.0, 2: 1.0}
+    assert dict(provider.get_module_weights_for_subject(1)) == {10: 2.0}
+    assert dict(provider.get_exercise_weights_for_module(10)) == {
+        100: 4.0,
+        101: 1.0,
+    }
+
+
+def test_unconfigured_items_keep_their_default_pull():
+    provider = build_provider()
+    calculator = GradingCalculator()
+
+    grade = calculator.calculate_weighted_average(
+        {100: 10.0, 101: 5.0, 102: 0.0},
+        provider.get_exercise_weights_for_module(10),
+    )
+
+    assert grade == (10.0 * 4.0 + 5.0 * 1.0 + 0.0 * 1.0) / 6.0
+
+
+def test_snapshot_from_another_interpreter_is_rebuilt(tmp_path, monkeypatch):
+    config_path = tmp_path / "weights.yaml"
+    config_path.write_text("subjects:\n  1:\n    name: Python\n    weight: 2.0\n")
+    snapshot_file = WeightsConfiguration.compile_snapshot(config_path)
+    payload = snapshot_file.read_bytes()
+    monkeypatch.setattr(weights, "SNAPSHOT_INTERPRETER", b"\x02\x07\x01")
+    monkeypatch.setattr(weights.marshal, "loads", fail_on_foreign_snapshot)
+
+    configuration = WeightsConfiguration.from_yaml(str(config_path))
+
+    assert configuration.subjects[1].weight == 2.0
+    assert snapshot_file.read_bytes() != payload
+    assert b"\x02\x07\x01" in snapshot_file.read_bytes()
+
+
+def fail_on_foreign_snapshot(data):
+    raise AssertionError("a snapshot from another interpreter was unmarshalled")
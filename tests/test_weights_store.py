@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from evaluer.common.database.models import WeightsVersion
+from evaluer.common.services.calculator import GradingCalculator
+from evaluer.common.services.weights import WeightsConfiguration, WeightsRegistry
+from evaluer.common.services.weights_store import DatabaseWeightsStore
+
+
+def build_configuration(subject_weight: float, module_weight: float):
+    return WeightsConfiguration(
+        subjects={
+            1: {
+                "name": "Python",
+                "weight": subject_weight,
+                "modules": {10: {"name": "Basics", "weight": module_weight}},
+            },
+            2: {"name": "C", "weight": 1.0},
+        }
+    )
+
+
+@pytest.fixture
+def build_store(engine, tmp_path):
+    seed_config_path = tmp_path / "weights.yaml"
+    seed_config_path.write_text(
+        "subjects:\n"
+        "  1:\n    name: Python\n    weight: 1.0\n"
+        "    modules:\n      10:\n        name: Basics\n        weight: 1.0\n"
+        "  2:\n    name: C\n    weight: 1.0\n"
+    )
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    def build():
+        return DatabaseWeightsStore(
+            registry=WeightsRegistry(config_path=None),
+            session_factory=session_factory,
+            grading_calculator=GradingCalculator(),
+            seed_config_path=seed_config_path,
+        )
+
+    return build
+
+
+async def count_versions(db, pending_only: bool = False) -> int:
+    query = select(func.count()).select_from(WeightsVersion)
+    if pending_only:
+        query = query.where(WeightsVersion.recalculated_at.is_(None))
+    return (await db.execute(query)).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_seed_the_weights_once(build_store, db):
+    providers = await asyncio.gather(
+        *(build_store().load_latest() for _ in range(4))
+    )
+
+    assert {provider.version for provider in providers} == {1}
+    assert await count_versions(db) == 1
+    assert await count_versions(db, pending_only=True) == 0
+
+
+@pytest.mark.asyncio
+async def test_update_diffs_against_the_latest_stored_version(build_store):
+    first_worker, second_worker = build_store(), build_store()
+    await first_worker.load_latest()
+    await second_worker.load_latest()
+
+    await first_worker.update(build_configuration(1.0, 2.0))
+    version, changes = await second_worker.update(build_configuration(3.0, 2.0))
+
+    assert version == 3
+    assert changes.module_ids == set()
+    assert changes.subject_ids == set()
+    assert changes.subjects_changed
+
+
+@pytest.mark.asyncio
+async def test_recalculations_stay_pending_until_they_run(build_store, db):
+    store = build_store()
+    await store.load_latest()
+    await store.update(build_configuration(1.0, 2.0))
+    await store.update(build_configuration(3.0, 2.0))
+    assert await count_versions(db, pending_only=True) == 2
+
+    changes = await build_store().recalculate_pending()
+
+    assert changes.subject_ids == {1}
+    assert changes.subjects_changed
+    assert await count_versions(db, pending_only=True) == 0
+    assert not await build_store().recalculate_pending()